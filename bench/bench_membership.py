@@ -0,0 +1,93 @@
+# bench_membership.py
+# 批量成员测试吞吐量基准：程序只编译一次，再用 Session.set_query 对大量整数做成员测试，
+# 以百万次查询每秒（M queries/s）报告；同时给出逐个调用 contains 的吞吐量作为对照。
+# 用法：python bench/bench_membership.py [--count N] [--repeat R] [--output membership.json]
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+TABLE_FILE = os.path.join(ROOT_DIR, "lib", "SLR Parsing Table.csv")
+sys.path.insert(0, SRC_DIR)
+
+from backend import numpy_module  # noqa: E402
+from parser import load_parsing_table  # noqa: E402
+from session import Session  # noqa: E402
+
+PROGRAM = """
+let int k be 7.
+let set range be { x : x > 0 - 5000 & x < 5000 | x = 123456 }.
+let set square be { x : x * x < 250000 }.
+let set mixed be { x : x @ square | x * k > 30000 }.
+"""
+
+# (名称, 集合表达式)：区间列表、向量化谓词、两者的组合
+QUERIES = [
+    ("intervals", "range"),
+    ("vectorized", "square"),
+    ("nested", "mixed"),
+    ("combined", "(range I mixed) U { x : x > 900000 }"),
+]
+
+
+def best_time(function, repeat):
+    """运行 repeat 次，返回最短耗时（秒）。"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch membership queries.")
+    parser.add_argument("--count", type=int, default=1_000_000, help="Number of integers per query.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query; the best is reported.")
+    parser.add_argument("--scalar-count", type=int, default=100_000,
+                        help="Number of integers for the per-value contains() baseline.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    action_table, goto_table = load_parsing_table(TABLE_FILE)
+    session = Session(action_table, goto_table)
+    session.execute(PROGRAM)
+
+    rng = random.Random(3173)
+    values = [rng.randint(-1_000_000, 1_000_000) for _ in range(args.count)]
+    np = numpy_module()
+    if np is not None:
+        values = np.array(values, dtype=np.int64)
+    scalar_values = [int(n) for n in values[:args.scalar_count]]
+
+    results = {"count": args.count, "numpy": np is not None, "queries": {}}
+    for name, expression in QUERIES:
+        query = session.set_query(expression)
+        batch = best_time(lambda: query(values), args.repeat)
+
+        # 对照：同一个编译好的集合上逐个调用 contains
+        contains = session.compile_set_expression(expression).contains
+        scalar = best_time(lambda: [contains(n) for n in scalar_values], 1)
+
+        batch_rate = args.count / batch / 1e6
+        scalar_rate = len(scalar_values) / scalar / 1e6
+        results["queries"][name] = {
+            "expression": expression,
+            "batch_mqps": round(batch_rate, 3),
+            "scalar_mqps": round(scalar_rate, 3),
+        }
+        print(f"{name:>10}: batch {batch_rate:8.2f} M queries/s   "
+              f"contains() {scalar_rate:6.2f} M queries/s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
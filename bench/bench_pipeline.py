@@ -0,0 +1,125 @@
+# bench_pipeline.py
+# 流水线分阶段基准：用 program_generator 按不同规模生成合成程序，
+# 在进程内分别计时 Lexer、SLRParser、TypeChecker 和 Evaluator（不写中间文件），
+# 结果写为 JSON，便于在不同提交之间比较各阶段的性能变化。
+# 用法：python bench/bench_pipeline.py [--sizes 25 50 100 200 400] [--depth D] [--width W]
+#                                     [--nesting K] [--predicate-size P] [--shows S] [--simplify-rate R]
+#                                     [--repeat R] [--output pipeline.json]
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+TABLE_FILE = os.path.join(ROOT_DIR, "lib", "SLR Parsing Table.csv")
+sys.path.insert(0, SRC_DIR)
+
+from evaluator import Evaluator  # noqa: E402
+from lexer import Lexer  # noqa: E402
+from parser import SLRParser, load_parsing_table  # noqa: E402
+from program_generator import generate_program  # noqa: E402
+from type_checker import TypeChecker, TYPE_ERROR  # noqa: E402
+
+STAGES = ("lexer", "parser", "type_checker", "evaluator")
+
+# 声明链 D' -> D D' 是右递归的，语法树深度随声明个数线性增长，递归遍历需要更大的递归深度
+sys.setrecursionlimit(max(sys.getrecursionlimit(), 100_000))
+
+
+def run_pipeline(source_code, action_table, goto_table):
+    """
+    依次运行四个阶段。
+
+    参数：
+        source_code (str): 程序源代码。
+        action_table (dict): ACTION 表。
+        goto_table (dict): GOTO 表。
+
+    返回：
+        tuple: (各阶段耗时（秒）的字典, 词法单元个数, 程序结果)。
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    tokens = Lexer(source_code).tokenize()
+    timings["lexer"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tree = SLRParser(tokens, action_table, goto_table).build_syntax_tree()
+    timings["parser"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tree_type = TypeChecker(None, None).type_check_node(tree)
+    timings["type_checker"] = time.perf_counter() - start
+    if tree_type == TYPE_ERROR:
+        raise Exception("Generated program failed type checking.")
+
+    start = time.perf_counter()
+    evaluator = Evaluator()
+    evaluator.parse_tree = tree
+    evaluator.evaluate_node(tree)
+    timings["evaluator"] = time.perf_counter() - start
+
+    return timings, len(tokens), str(tree.get("value"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark each pipeline stage on generated programs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 50, 100, 200, 400],
+                        help="Numbers of declarations to generate.")
+    parser.add_argument("--depth", type=int, default=2, help="Nesting depth of integer expressions.")
+    parser.add_argument("--width", type=int, default=2, help="Operands per integer expression level.")
+    parser.add_argument("--nesting", type=int, default=1, help="Set-builder nesting levels.")
+    parser.add_argument("--predicate-size", type=int, default=3, help="Relations per predicate.")
+    parser.add_argument("--shows", type=int, default=3,
+                        help="Number of show statements (membership, integer and set-valued in turn).")
+    parser.add_argument("--simplify-rate", type=float, default=0.0,
+                        help="Fraction of set declarations wrapped in simplify.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the generator.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size; the best time per stage is kept.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    action_table, goto_table = load_parsing_table(TABLE_FILE)
+    results = {
+        "python": sys.version.split()[0],
+        "shape": {
+            "depth": args.depth,
+            "width": args.width,
+            "nesting": args.nesting,
+            "predicate_size": args.predicate_size,
+            "shows": args.shows,
+            "simplify_rate": args.simplify_rate,
+            "seed": args.seed,
+        },
+        "repeat": args.repeat,
+        "sizes": [],
+    }
+    print(f"{'decls':>6} {'tokens':>8} " + " ".join(f"{stage:>13}" for stage in STAGES))
+    for size in args.sizes:
+        source_code = generate_program(size, args.depth, args.width, args.nesting,
+                                       args.predicate_size, args.seed, args.shows, args.simplify_rate)
+        best = {}
+        for _ in range(args.repeat):
+            timings, token_count, result = run_pipeline(source_code, action_table, goto_table)
+            for stage in STAGES:
+                best[stage] = min(best.get(stage, timings[stage]), timings[stage])
+
+        results["sizes"].append({
+            "declarations": size,
+            "bytes": len(source_code),
+            "tokens": token_count,
+            "result": result,
+            "stages_ms": {stage: round(best[stage] * 1000, 3) for stage in STAGES},
+        })
+        print(f"{size:>6} {token_count:>8} " + " ".join(f"{best[stage] * 1000:10.2f} ms" for stage in STAGES))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# bench_scaling.py
+# 复杂度基准：对每种输入形状生成规模按几何级数增长的程序，
+# 分别计时 Lexer、SLRParser、TypeChecker 和 Evaluator，
+# 在 log(耗时)–log(词法单元个数) 上做最小二乘拟合得到增长指数并打印。
+# 这里只报告计时；各阶段指数的上界由 tests/test_scaling.py 在较小的规模上检查。
+# 用法：python bench/bench_scaling.py [--steps N] [--repeat R] [--output scaling.json]
+import argparse
+import json
+import math
+import sys
+
+from bench_pipeline import STAGES, TABLE_FILE, run_pipeline
+from parser import load_parsing_table
+from program_generator import generate_program
+
+# (名称, 起始规模, 由规模生成程序的函数)：
+#   declarations  声明个数增长（语法树沿右递归的 D' 链变深，解析栈随之变深）
+#   predicate     一个集合构造式的谓词中的关系个数增长（左递归的 & / | 链，显示值很长）
+#   expression    一个整数表达式的操作数个数增长
+WORKLOADS = [
+    ("declarations", 200, lambda size: generate_program(size, 2, 2, 0, 1)),
+    ("predicate", 200, lambda size: generate_program(2, 1, 2, 0, size)),
+    ("expression", 400, lambda size: generate_program(2, 1, size, 0, 1)),
+]
+
+
+def growth_exponent(sizes, timings):
+    """
+    拟合 timings ≈ c * sizes^k，返回 k（对数坐标上的最小二乘斜率）。
+
+    参数：
+        sizes (list): 输入规模。
+        timings (list): 对应的耗时。
+
+    返回：
+        float: 增长指数 k。
+    """
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(timing, 1e-9)) for timing in timings]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    return numerator / denominator
+
+
+def measure_workload(make_program, start, steps, repeat, action_table, goto_table):
+    """
+    在 start, 2*start, 4*start, ... 共 steps 个规模上运行流水线。
+
+    返回：
+        tuple: (各规模的词法单元个数, 阶段名 -> 各规模的最短耗时（秒）)。
+    """
+    token_counts = []
+    timings = {stage: [] for stage in STAGES}
+    for step in range(steps):
+        source_code = make_program(start * 2 ** step)
+        best = {}
+        for _ in range(repeat):
+            stage_times, token_count, _ = run_pipeline(source_code, action_table, goto_table)
+            for stage in STAGES:
+                best[stage] = min(best.get(stage, stage_times[stage]), stage_times[stage])
+        token_counts.append(token_count)
+        for stage in STAGES:
+            timings[stage].append(best[stage])
+    return token_counts, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the growth exponent of each pipeline stage.")
+    parser.add_argument("--steps", type=int, default=5, help="Number of sizes; each doubles the previous.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size; the best time is kept.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    action_table, goto_table = load_parsing_table(TABLE_FILE)
+    results = {"python": sys.version.split()[0], "workloads": {}}
+    for name, start, make_program in WORKLOADS:
+        token_counts, timings = measure_workload(make_program, start, args.steps, args.repeat,
+                                                 action_table, goto_table)
+        workload = {"tokens": token_counts, "stages": {}}
+        for stage in STAGES:
+            exponent = growth_exponent(token_counts, timings[stage])
+            workload["stages"][stage] = {
+                "exponent": round(exponent, 3),
+                "timings_ms": [round(timing * 1000, 3) for timing in timings[stage]],
+            }
+            print(f"{name:>12} {stage:>12}: n^{exponent:.2f}  "
+                  + " ".join(f"{timing * 1000:.2f}" for timing in timings[stage]) + " ms")
+        results["workloads"][name] = workload
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
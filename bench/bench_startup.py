@@ -0,0 +1,83 @@
+# bench_startup.py
+# 冷启动基准：在临时目录中反复以新进程运行 main.py 处理一个极小的程序，
+# 记录启动到退出的耗时，用于发现启动时间的回退。
+# 用法：python bench/bench_startup.py [--runs N] [--max-ms MS] [--output startup.json]
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+TABLE_FILE = os.path.join(ROOT_DIR, "lib", "SLR Parsing Table.csv")
+TRIVIAL_PROGRAM = "show 1 > 0.\n"
+
+
+def time_runs(work_dir, extra_args, runs):
+    """
+    以新进程运行 main.py 若干次。
+
+    参数：
+        work_dir (str): 运行目录（包含解析表和输入文件）。
+        extra_args (list): 额外的命令行参数。
+        runs (int): 运行次数。
+
+    返回：
+        list: 每次运行的耗时（毫秒）。
+    """
+    command = [sys.executable, os.path.join(SRC_DIR, "main.py"), "input.txt"] + extra_args
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=work_dir, stdout=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold-start time of main.py.")
+    parser.add_argument("--runs", type=int, default=20, help="Number of runs per mode.")
+    parser.add_argument("--max-ms", type=float, help="Fail if the --fast median exceeds this.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        shutil.copy(TABLE_FILE, work_dir)
+        with open(os.path.join(work_dir, "input.txt"), "w") as f:
+            f.write(TRIVIAL_PROGRAM)
+
+        # 先各运行一次以生成 __pycache__，避免把字节码编译时间计入冷启动
+        time_runs(work_dir, ["--fast"], 1)
+        time_runs(work_dir, [], 1)
+
+        results = {"python": sys.version.split()[0], "runs": args.runs, "modes": {}}
+        for mode, extra_args in (("default", []), ("fast", ["--fast"])):
+            timings = time_runs(work_dir, extra_args, args.runs)
+            results["modes"][mode] = {
+                "min_ms": round(min(timings), 2),
+                "median_ms": round(statistics.median(timings), 2),
+                "max_ms": round(max(timings), 2),
+            }
+            print(f"{mode:>8}: min {min(timings):7.2f} ms  "
+                  f"median {statistics.median(timings):7.2f} ms")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.max_ms is not None and results["modes"]["fast"]["median_ms"] > args.max_ms:
+        print(f"Startup regression: fast median {results['modes']['fast']['median_ms']} ms "
+              f"> {args.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
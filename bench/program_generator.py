@@ -0,0 +1,212 @@
+# program_generator.py
+# 合成程序生成器：用手写的模板随机生成类型正确的程序（不读取 parser.GRAMMAR），
+# 每个模板对应文法中的一个或几个非终结符：整数的 + - * 和括号、集合的 U I 及其嵌套和括号、
+# 集合构造式、括号谓词和 !、simplify，以及整数、谓词和集合值的 show 语句。
+# 模板能用到 parser.PRODUCTIONS 中的全部产生式 1–38：有声明的程序用规则 1 或 35，
+# 没有声明的程序（--declarations 0）用规则 2 或 36，只有一条 show 语句时才用规则 1 和 2。
+# 程序的形状可控：声明个数、整数表达式的深度和宽度、集合构造式的嵌套层数、谓词中的关系个数、
+# show 语句条数和 simplify 的比例。同一组参数和随机种子总是生成同一个程序，便于在不同提交之间比较。
+# 用法：python bench/program_generator.py [--declarations N] [--depth D] [--width W]
+#                                        [--nesting K] [--predicate-size P] [--shows S]
+#                                        [--simplify-rate R] [--seed S] [--output program.txt]
+import argparse
+import random
+
+
+def letters(index):
+    """把非负整数编码为小写字母串（a, b, ..., z, ba, bb, ...），用作标识符的后缀。"""
+    digits = []
+    while True:
+        index, digit = divmod(index, 26)
+        digits.append(chr(ord("a") + digit))
+        if index == 0:
+            return "".join(reversed(digits))
+
+
+class ProgramGenerator:
+    """
+    生成合成程序。
+
+    整数声明名为 q*，集合声明名为 w*，约束变量名为 v*，都只含小写字母且不会与关键字冲突。
+    整数声明最多引用一个之前的整数声明，整数值随声明个数线性增长而不会变成巨大的大整数。
+    """
+
+    def __init__(self, declarations=100, depth=2, width=2, nesting=1, predicate_size=3, seed=0,
+                 shows=3, simplify_rate=0.0):
+        """
+        参数：
+            declarations (int): 声明个数（大约一半整数、一半集合）。
+            depth (int): 整数表达式的括号嵌套深度。
+            width (int): 整数表达式每一层的操作数个数。
+            nesting (int): 集合构造式内部再嵌套集合构造式的层数。
+            predicate_size (int): 每个谓词中用 & 或 | 连接的关系个数。
+            seed (int): 随机种子。
+            shows (int): show 语句的条数，依次为成员测试（谓词）、整数和集合值的 show 语句。
+            simplify_rate (float): 集合声明的右部用 simplify 包裹的比例。
+        """
+        self.declarations = declarations
+        self.depth = depth
+        self.width = width
+        self.nesting = nesting
+        self.predicate_size = predicate_size
+        self.shows = shows
+        self.simplify_rate = simplify_rate
+        self.rng = random.Random(seed)
+        self.integers = []
+        self.sets = []
+
+    def integer_leaf(self, names):
+        """整数表达式的叶子：常数、可用的变量，或 常数 * 变量。"""
+        choice = self.rng.random()
+        if not names or choice < 0.4:
+            return str(self.rng.randint(0, 99))
+        name = self.rng.choice(names)
+        if choice < 0.7:
+            return name
+        return f"{self.rng.randint(2, 9)} * {name}"
+
+    def integer_expression(self, depth, names):
+        """
+        生成整数表达式：depth 层括号，每层 width 个操作数，用 + 或 - 连接。
+
+        参数：
+            depth (int): 剩余的嵌套深度。
+            names (list): 可以引用的整数变量名。
+        """
+        if depth == 0:
+            return self.integer_leaf(names)
+        operands = [self.integer_expression(depth - 1, names) for _ in range(self.width)]
+        if depth > 1:
+            operands = [f"({operand})" for operand in operands]
+        expression = operands[0]
+        for operand in operands[1:]:
+            expression += f" {self.rng.choice('+-')} {operand}"
+        return expression
+
+    def relation(self, variable, nesting, names):
+        """生成一个关系：约束变量与整数表达式比较，或对集合做成员测试。"""
+        if self.sets and self.rng.random() < 0.3:
+            return f"{variable} @ {self.rng.choice(self.sets)}"
+        if nesting > 0 and self.rng.random() < 0.5:
+            return f"{variable} @ {self.set_builder(nesting - 1, names)}"
+        bound = self.integer_expression(self.depth, names)
+        return f"{variable} {self.rng.choice('<>=')} {bound}"
+
+    def predicate(self, variable, nesting, names):
+        """生成 predicate_size 个关系用 & 或 | 连接的谓词，偶尔取反，偶尔把相邻两个关系括成一组。"""
+        parts = []
+        for _ in range(max(1, self.predicate_size)):
+            relation = self.relation(variable, nesting, names)
+            parts.append(f"! {relation}" if self.rng.random() < 0.1 else relation)
+        grouped = []
+        while parts:
+            if len(parts) >= 2 and self.rng.random() < 0.2:
+                # P'' -> ( P )
+                grouped.append(f"({parts.pop(0)} {self.rng.choice('&|')} {parts.pop(0)})")
+            else:
+                grouped.append(parts.pop(0))
+        predicate = grouped[0]
+        for part in grouped[1:]:
+            predicate += f" {self.rng.choice('&|')} {part}"
+        return predicate
+
+    def set_builder(self, nesting, names):
+        """生成集合构造式，内部最多再嵌套 nesting 层集合构造式。"""
+        variable = "v" + letters(self.nesting - nesting)
+        # 约束变量也可以出现在内层的整数表达式中
+        return f"{{ {variable} : {self.predicate(variable, nesting, names + [variable])} }}"
+
+    def set_expression(self):
+        """集合声明的右部：新的集合构造式，或已有集合和集合构造式的嵌套并、交，可能用 simplify 包裹。"""
+        choice = self.rng.random()
+        if len(self.sets) >= 2 and choice < 0.2:
+            left, right = self.rng.sample(self.sets, 2)
+            expression = f"{left} {self.rng.choice('UI')} {right}"
+        elif len(self.sets) >= 2 and choice < 0.3:
+            # 嵌套的 U / I：(a U b) I { ... } 或 a U (b I { ... })
+            left, right = self.rng.sample(self.sets, 2)
+            builder = self.set_builder(self.nesting, self.integers[-1:])
+            outer, inner = self.rng.sample("UI", 2)
+            if self.rng.random() < 0.5:
+                expression = f"({left} {inner} {right}) {outer} {builder}"
+            else:
+                expression = f"{left} {outer} ({right} {inner} {builder})"
+        else:
+            expression = self.set_builder(self.nesting, self.integers[-1:])
+        if self.rng.random() < self.simplify_rate:
+            return f"simplify ({expression})"
+        return expression
+
+    def declaration(self, index):
+        """生成第 index 条声明。"""
+        if index % 2 == 0:
+            name = "q" + letters(len(self.integers))
+            names = [self.rng.choice(self.integers)] if self.integers else []
+            line = f"let int {name} be {self.integer_expression(self.depth, names)}."
+            self.integers.append(name)
+        else:
+            name = "w" + letters(len(self.sets))
+            line = f"let set {name} be {self.set_expression()}."
+            self.sets.append(name)
+        return line
+
+    def generate(self):
+        """
+        生成完整的程序。
+
+        返回：
+            str: 程序源代码，每条声明一行，最后是 shows 条 show 语句。
+        """
+        lines = [self.declaration(index) for index in range(self.declarations)]
+        names = self.integers[-1:]
+        for index in range(max(1, self.shows)):
+            kind = index % 3
+            if kind == 0 and self.sets:
+                # 第一条测试最后声明的集合，其余的随机选择
+                target = self.sets[-1] if index == 0 else self.rng.choice(self.sets)
+                lines.append(f"show {self.rng.randint(0, 99)} @ {target}.")
+            elif kind == 0:
+                # A -> P：没有集合时比较两个整数表达式
+                left, right = (self.integer_expression(self.depth, names) for _ in range(2))
+                lines.append(f"show {left} {self.rng.choice('<>=')} {right}.")
+            elif kind == 2:
+                # 集合值的 show 语句
+                lines.append(f"show {self.set_expression()}.")
+            else:
+                lines.append(f"show {self.integer_expression(self.depth, names)}.")
+        return "\n".join(lines) + "\n"
+
+
+def generate_program(declarations=100, depth=2, width=2, nesting=1, predicate_size=3, seed=0,
+                     shows=3, simplify_rate=0.0):
+    """按给定形状生成一个程序，参数见 ProgramGenerator。"""
+    return ProgramGenerator(declarations, depth, width, nesting, predicate_size, seed,
+                            shows, simplify_rate).generate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic program from hand-written templates.")
+    parser.add_argument("--declarations", type=int, default=100, help="Number of declarations.")
+    parser.add_argument("--depth", type=int, default=2, help="Nesting depth of integer expressions.")
+    parser.add_argument("--width", type=int, default=2, help="Operands per integer expression level.")
+    parser.add_argument("--nesting", type=int, default=1, help="Set-builder nesting levels.")
+    parser.add_argument("--predicate-size", type=int, default=3, help="Relations per predicate.")
+    parser.add_argument("--shows", type=int, default=3,
+                        help="Number of show statements (membership, integer and set-valued in turn).")
+    parser.add_argument("--simplify-rate", type=float, default=0.0,
+                        help="Fraction of set declarations wrapped in simplify.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument("--output", help="Write the program to this file instead of stdout.")
+    args = parser.parse_args()
+
+    program = generate_program(args.declarations, args.depth, args.width, args.nesting,
+                               args.predicate_size, args.seed, args.shows, args.simplify_rate)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(program)
+    else:
+        print(program, end="")
+
+
+if __name__ == "__main__":
+    main()
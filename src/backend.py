@@ -0,0 +1,24 @@
+# backend.py
+# 可选依赖 NumPy 的延迟加载：导入 NumPy 需要几十毫秒，
+# 只有真正用到向量化评估时才导入，不影响 main.py 的启动时间。
+
+_numpy = None
+_numpy_checked = False
+
+
+def numpy_module():
+    """
+    获取 numpy 模块。
+
+    返回：
+        module: numpy 模块；未安装 NumPy 时返回 None。
+    """
+    global _numpy, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = None
+    return _numpy
@@ -0,0 +1,165 @@
+# bitsets.py
+# 有限论域上的位集合：集合在 [low, high] 内的成员用一个压缩位图保存，
+# 位图可以是 Python 大整数，也可以是 NumPy uint64 数组。
+# 同一论域上的并、交是整字的按位或、按位与，元素个数用 popcount 计算。
+from sets import SetValue, SCAN_BLOCK
+from backend import numpy_module
+
+
+def popcount(n):
+    """返回非负整数 n 的二进制表示中 1 的个数。"""
+    if hasattr(n, "bit_count"):
+        return n.bit_count()
+    return bin(n).count("1")
+
+
+class BitSet(SetValue):
+    def __init__(self, source, low, high, bits):
+        """
+        论域 [low, high] 上的位集合。
+
+        参数：
+            source (SetValue): 原来的符号集合，用于显示以及论域外的成员测试。
+            low (int): 论域下界，对应第 0 位。
+            high (int): 论域上界（包含）。
+            bits (int 或 numpy.ndarray): 位图，第 i 位表示 low + i 是否属于集合；
+                                         为 uint64 数组时按小端序排列，多余的位为 0。
+        """
+        self.source = source
+        self.low = low
+        self.high = high
+        self.size = high - low + 1
+        self.bits = bits
+        self.intervals = source.intervals
+        self.radius = source.radius
+        self.precedence = source.precedence
+
+    @classmethod
+    def from_set(cls, set_value, low, high, words=False):
+        """
+        将任意集合在论域 [low, high] 上物化为位集合。
+
+        参数：
+            set_value (SetValue): 要物化的集合。
+            low (int): 论域下界。
+            high (int): 论域上界（包含）。
+            words (bool): 为 True 时使用 NumPy uint64 数组保存位图（需要 NumPy），
+                          否则使用 Python 大整数。
+
+        返回：
+            BitSet: 物化后的位集合。
+        """
+        np = numpy_module()
+        size = high - low + 1
+        if np is None:
+            if words:
+                raise Exception("NumPy is required for word-array bitsets.")
+            packed = bytearray((size + 7) // 8)
+            for i in range(size):
+                if set_value.contains(low + i):
+                    packed[i >> 3] |= 1 << (i & 7)
+            return cls(set_value, low, high, int.from_bytes(bytes(packed), "little"))
+
+        values = np.arange(low, high + 1, dtype=np.int64)
+        packed = np.packbits(set_value.mask(values), bitorder="little")
+        if not words:
+            return cls(set_value, low, high, int.from_bytes(packed.tobytes(), "little"))
+        padded = np.zeros((size + 63) // 64 * 8, dtype=np.uint8)
+        padded[:len(packed)] = packed
+        return cls(set_value, low, high, padded.view("<u8"))
+
+    def same_domain(self, other):
+        """判断 other 是否为同一论域上的位集合。"""
+        return isinstance(other, BitSet) and (other.low, other.high) == (self.low, self.high)
+
+    def coerce(self, bits):
+        """将另一个位图转换为与自身相同的表示（大整数或 uint64 数组）。"""
+        if isinstance(bits, int) == isinstance(self.bits, int):
+            return bits
+        np = numpy_module()
+        if isinstance(self.bits, int):
+            return int.from_bytes(bits.tobytes(), "little")
+        return np.frombuffer(bits.to_bytes(len(self.bits) * 8, "little"), dtype="<u8")
+
+    def to_mask(self):
+        """
+        展开为布尔数组（需要 NumPy）。
+
+        返回：
+            numpy.ndarray: 长度为论域大小的布尔数组，第 i 项表示 low + i 是否属于集合。
+        """
+        np = numpy_module()
+        if isinstance(self.bits, int):
+            packed = np.frombuffer(self.bits.to_bytes((self.size + 7) // 8, "little"), dtype=np.uint8)
+        else:
+            packed = self.bits.view(np.uint8)
+        return np.unpackbits(packed, count=self.size, bitorder="little").astype(bool)
+
+    def contains(self, n):
+        if not self.low <= n <= self.high:
+            return self.source.contains(n)
+        i = n - self.low
+        if isinstance(self.bits, int):
+            return bool((self.bits >> i) & 1)
+        return bool((int(self.bits[i >> 6]) >> (i & 63)) & 1)
+
+    def mask(self, values):
+        np = numpy_module()
+        inside = (values >= self.low) & (values <= self.high)
+        result = np.zeros(values.shape, dtype=bool)
+        result[inside] = self.to_mask()[values[inside] - self.low]
+        if not inside.all():
+            result[~inside] = self.source.mask(values[~inside])
+        return result
+
+    def members(self, low, high):
+        """按升序产生 [low, high] 内的元素：论域内读位图，论域外交给原集合。"""
+        yield from self.source.members(low, min(high, self.low - 1))
+        start, end = max(low, self.low), min(high, self.high)
+        if start <= end:
+            np = numpy_module()
+            if np is None:
+                for n in range(start, end + 1):
+                    if (self.bits >> (n - self.low)) & 1:
+                        yield n
+            else:
+                mask = self.to_mask()
+                for block in range(start - self.low, end - self.low + 1, SCAN_BLOCK):
+                    stop = min(block + SCAN_BLOCK, end - self.low + 1)
+                    yield from (np.flatnonzero(mask[block:stop]) + block + self.low).tolist()
+        yield from self.source.members(max(low, self.high + 1), high)
+
+    def union(self, other):
+        if self.same_domain(other):
+            return BitSet(self.source.union(other.source), self.low, self.high,
+                          self.bits | self.coerce(other.bits))
+        return super().union(other)
+
+    def intersection(self, other):
+        if self.same_domain(other):
+            return BitSet(self.source.intersection(other.source), self.low, self.high,
+                          self.bits & self.coerce(other.bits))
+        return super().intersection(other)
+
+    def cardinality(self):
+        """返回论域内的元素个数（popcount）。"""
+        if isinstance(self.bits, int):
+            return popcount(self.bits)
+        np = numpy_module()
+        if hasattr(np, "bitwise_count"):
+            return int(np.bitwise_count(self.bits).sum())
+        return int(np.unpackbits(self.bits.view(np.uint8)).sum())
+
+    def elements(self):
+        """按升序返回论域内的全部元素。"""
+        np = numpy_module()
+        if np is None:
+            digits = bin(self.bits)[:1:-1]
+            return [self.low + i for i, digit in enumerate(digits) if digit == "1"]
+        return (np.flatnonzero(self.to_mask()) + self.low).tolist()
+
+    def rope(self):
+        return self.source.rope()
+
+    def __str__(self):
+        return str(self.source)
@@ -0,0 +1,185 @@
+# build_table.py
+# 根据 parser.py 中的产生式 PRODUCTIONS 构造 SLR(1) 解析表，写出 SLR Parsing Table.csv
+# 和 SLR Grammar.txt。修改文法后运行本脚本，再运行 freeze_tables.py 更新冻结的解析表。
+# 用法：python build_table.py ["SLR Parsing Table.csv"] ["SLR Grammar.txt"]
+import os
+import sys
+from parser import PRODUCTIONS
+
+LIB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+DEFAULT_TABLE_FILE = os.path.join(LIB_DIR, "SLR Parsing Table.csv")
+DEFAULT_GRAMMAR_FILE = os.path.join(LIB_DIR, "SLR Grammar.txt")
+END_MARKER = "$"
+
+
+def grammar_symbols(productions):
+    """
+    按首次出现的顺序返回终结符和非终结符（解析表的列顺序）。
+
+    返回：
+        tuple: (终结符列表（以 $ 结尾）, 非终结符列表)。
+    """
+    nonterminals = []
+    for number in sorted(productions):
+        head = productions[number][0]
+        if head not in nonterminals:
+            nonterminals.append(head)
+    terminals = []
+    for number in sorted(productions):
+        for symbol in productions[number][1]:
+            if symbol not in nonterminals and symbol not in terminals:
+                terminals.append(symbol)
+    return terminals + [END_MARKER], nonterminals
+
+
+def first_sets(productions, nonterminals):
+    """计算每个非终结符的 FIRST 集（文法中没有空产生式）。"""
+    first = {symbol: set() for symbol in nonterminals}
+    changed = True
+    while changed:
+        changed = False
+        for head, body in productions.values():
+            symbol = body[0]
+            new = first[symbol] if symbol in first else {symbol}
+            if not new <= first[head]:
+                first[head] |= new
+                changed = True
+    return first
+
+
+def follow_sets(productions, nonterminals):
+    """计算每个非终结符的 FOLLOW 集。"""
+    first = first_sets(productions, nonterminals)
+    follow = {symbol: set() for symbol in nonterminals}
+    follow[productions[0][0]].add(END_MARKER)
+    changed = True
+    while changed:
+        changed = False
+        for head, body in productions.values():
+            for index, symbol in enumerate(body):
+                if symbol not in follow:
+                    continue
+                if index + 1 < len(body):
+                    following = body[index + 1]
+                    new = first[following] if following in first else {following}
+                else:
+                    new = follow[head]
+                if not new <= follow[symbol]:
+                    follow[symbol] |= new
+                    changed = True
+    return follow
+
+
+def closure(items, productions, nonterminals):
+    """
+    计算 LR(0) 项目集的闭包，项目按加入的先后顺序排列。
+
+    参数：
+        items (list): 项目 (产生式编号, 点的位置) 的列表。
+
+    返回：
+        list: 闭包中的项目。
+    """
+    result = list(items)
+    index = 0
+    while index < len(result):
+        number, dot = result[index]
+        body = productions[number][1]
+        if dot < len(body) and body[dot] in nonterminals:
+            for candidate in sorted(productions):
+                if productions[candidate][0] == body[dot] and (candidate, 0) not in result:
+                    result.append((candidate, 0))
+        index += 1
+    return result
+
+
+def build_table(productions=PRODUCTIONS):
+    """
+    构造 SLR(1) 解析表。
+
+    状态按广度优先的顺序编号，每个状态的转移按项目中点后符号首次出现的顺序创建。
+
+    返回：
+        tuple: (状态数, ACTION 表, GOTO 表)，表的形式为 {状态: {符号: 动作或目标状态}}。
+
+    异常：
+        ValueError: 文法不是 SLR(1) 文法（存在移进-归约或归约-归约冲突）。
+    """
+    terminals, nonterminals = grammar_symbols(productions)
+    follow = follow_sets(productions, nonterminals)
+    states = [closure([(0, 0)], productions, nonterminals)]
+    kernels = {((0, 0),): 0}
+    action_table = {}
+    goto_table = {}
+
+    def set_action(state, symbol, action):
+        existing = action_table[state].get(symbol)
+        if existing is not None and existing != action:
+            raise ValueError(f"SLR conflict in state {state} on '{symbol}': {existing} / {action}")
+        action_table[state][symbol] = action
+
+    index = 0
+    while index < len(states):
+        items = states[index]
+        action_table[index] = {}
+        goto_table[index] = {}
+        symbols = []
+        for number, dot in items:
+            body = productions[number][1]
+            if dot < len(body) and body[dot] not in symbols:
+                symbols.append(body[dot])
+        for symbol in symbols:
+            kernel = tuple(
+                (number, dot + 1) for number, dot in items
+                if dot < len(productions[number][1]) and productions[number][1][dot] == symbol
+            )
+            key = tuple(sorted(kernel))
+            if key not in kernels:
+                kernels[key] = len(states)
+                states.append(closure(list(kernel), productions, nonterminals))
+            target = kernels[key]
+            if symbol in nonterminals:
+                goto_table[index][symbol] = target
+            else:
+                set_action(index, symbol, f"s{target}")
+        for number, dot in items:
+            head, body = productions[number]
+            if dot == len(body):
+                if number == 0:
+                    set_action(index, END_MARKER, "acc")
+                else:
+                    for symbol in follow[head]:
+                        set_action(index, symbol, f"r{number}")
+        index += 1
+    return len(states), action_table, goto_table
+
+
+def write_table(table_file=DEFAULT_TABLE_FILE, productions=PRODUCTIONS):
+    """将解析表写成 CSV，格式与 load_parsing_table 读取的格式一致。"""
+    terminals, nonterminals = grammar_symbols(productions)
+    count, action_table, goto_table = build_table(productions)
+    rows = [
+        ["state", "action"] + [""] * (len(terminals) - 1) + ["goto"] + [""] * (len(nonterminals) - 1),
+        [""] + terminals + nonterminals,
+    ]
+    for state in range(count):
+        row = [str(state)]
+        row += [action_table[state].get(symbol, "") for symbol in terminals]
+        row += [str(goto_table[state].get(symbol, "")) for symbol in nonterminals]
+        rows.append(row)
+    with open(table_file, "w", encoding="utf-8", newline="") as f:
+        f.write("\n".join(",".join(row) for row in rows) + "\n")
+    print(f"SLR parsing table with {count} states written to {table_file}")
+
+
+def write_grammar(grammar_file=DEFAULT_GRAMMAR_FILE, productions=PRODUCTIONS):
+    """将产生式按编号写成文本文件。"""
+    lines = [f"{number}.\t{head} -> {' '.join(body)}" for number, (head, body) in sorted(productions.items())]
+    with open(grammar_file, "w", encoding="utf-8", newline="") as f:
+        f.write("\n".join(lines))
+    print(f"Grammar written to {grammar_file}")
+
+
+if __name__ == "__main__":
+    write_table(*sys.argv[1:2])
+    write_grammar(*sys.argv[2:3])
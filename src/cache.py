@@ -0,0 +1,248 @@
+# cache.py
+# 编译结果缓存：以源代码、解析表和编译器版本的哈希为键，
+# 在磁盘上保存各阶段的输出（token 流、语法树、类型树、show 结果）。
+import hashlib
+import json
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows 下没有 fcntl，改用 msvcrt
+    fcntl = None
+    import msvcrt
+
+# 各阶段按执行顺序排列，后面的阶段依赖前面的阶段
+STAGES = ("tokens", "parse_tree", "typed_tree", "evaluation")
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 默认缓存上限 64 MB
+
+
+def compiler_version():
+    """
+    计算编译器版本指纹。
+
+    使用本目录下所有 .py 源文件的内容计算哈希，
+    因此修改任何阶段的实现都会让旧的缓存自动失效。
+
+    返回：
+        str: 版本指纹。
+    """
+    digest = hashlib.sha256()
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(src_dir)):
+        if name.endswith(".py"):
+            digest.update(name.encode("utf-8"))
+            with open(os.path.join(src_dir, name), "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class FileLock:
+    """基于锁文件的跨进程互斥锁，用于保护缓存目录的并发读写。"""
+
+    def __init__(self, path):
+        self.path = path
+        self.handle = None
+
+    def __enter__(self):
+        self.handle = open(self.path, "a+")
+        if fcntl is not None:
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_EX)
+        else:
+            self.handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self.handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.01)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if fcntl is not None:
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+        else:
+            self.handle.seek(0)
+            msvcrt.locking(self.handle.fileno(), msvcrt.LK_UNLCK, 1)
+        self.handle.close()
+        self.handle = None
+
+
+class CompilationCache:
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        初始化编译缓存。
+
+        参数：
+            cache_dir (str): 缓存目录，不存在时自动创建。
+            max_bytes (int): 缓存条目总大小上限，超出后按最近最少使用（LRU）淘汰。
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        self.lock_path = os.path.join(cache_dir, ".lock")
+        self.stats_path = os.path.join(cache_dir, "stats.json")
+        self.version = compiler_version()
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def make_key(self, source_code, table_digest):
+        """
+        计算缓存键。
+
+        参数：
+            source_code (str): 源代码文本。
+            table_digest (str): SLR 解析表内容的哈希。
+
+        返回：
+            str: 十六进制的 SHA-256 摘要。
+        """
+        digest = hashlib.sha256()
+        for part in (self.version, table_digest, source_code):
+            data = part.encode("utf-8")
+            digest.update(str(len(data)).encode("ascii") + b":")
+            digest.update(data)
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+        """返回缓存条目的文件路径（按前两位分目录存放）。"""
+        return os.path.join(self.objects_dir, key[:2], key + ".json")
+
+    def lookup(self, key):
+        """
+        查找缓存条目并记录命中统计。
+
+        参数：
+            key (str): make_key 计算出的缓存键。
+
+        返回：
+            dict: 阶段名到阶段结果的映射；未命中时为空字典。
+        """
+        path = self.entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)  # 更新访问时间，作为 LRU 依据
+        except (FileNotFoundError, json.JSONDecodeError):
+            entry = {}
+
+        # 命中记在已缓存的最后一个阶段上，该阶段之前的阶段都被跳过
+        furthest = None
+        for stage in STAGES:
+            if stage in entry:
+                furthest = stage
+        with FileLock(self.lock_path):
+            stats = self.read_stats()
+            if furthest is None:
+                stats["misses"] += 1
+            else:
+                stats["hits"][furthest] = stats["hits"].get(furthest, 0) + 1
+            self.write_json(self.stats_path, stats)
+        return entry
+
+    def store(self, key, stage, result):
+        """
+        保存某一阶段的结果，并在超出大小上限时淘汰旧条目。
+
+        参数：
+            key (str): 缓存键。
+            stage (str): 阶段名，必须属于 STAGES。
+            result (dict): 可 JSON 序列化的阶段结果。
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown cache stage: {stage}")
+        path = self.entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with FileLock(self.lock_path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                entry = {}
+            entry[stage] = result
+            self.write_json(path, entry)
+            stats = self.read_stats()
+            stats["stores"] += 1
+            stats["evictions"] += self.evict(keep=path)
+            self.write_json(self.stats_path, stats)
+
+    def evict(self, keep=None):
+        """
+        按修改时间从旧到新删除条目，直到总大小不超过上限。
+        调用方需持有锁。
+
+        参数：
+            keep (str): 不参与淘汰的条目路径（刚写入的条目）。
+
+        返回：
+            int: 被删除的条目数量。
+        """
+        entries = []
+        total = 0
+        for sub in os.listdir(self.objects_dir):
+            sub_dir = os.path.join(self.objects_dir, sub)
+            if not os.path.isdir(sub_dir):
+                continue
+            for name in os.listdir(sub_dir):
+                path = os.path.join(sub_dir, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+        evicted = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+        return evicted
+
+    def read_stats(self):
+        """读取命中统计，文件不存在时返回初始值。"""
+        stats = {"hits": {}, "misses": 0, "stores": 0, "evictions": 0}
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                stats.update(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        return stats
+
+    def stats(self):
+        """
+        获取缓存统计信息。
+
+        返回：
+            dict: 包含各阶段命中数、未命中数、写入数、淘汰数以及当前条目数和总大小。
+        """
+        with FileLock(self.lock_path):
+            stats = self.read_stats()
+        stats["lookups"] = sum(stats["hits"].values()) + stats["misses"]
+        entries = 0
+        size = 0
+        for sub in os.listdir(self.objects_dir):
+            sub_dir = os.path.join(self.objects_dir, sub)
+            if os.path.isdir(sub_dir):
+                for name in os.listdir(sub_dir):
+                    entries += 1
+                    size += os.path.getsize(os.path.join(sub_dir, name))
+        stats["entries"] = entries
+        stats["bytes"] = size
+        return stats
+
+    @staticmethod
+    def write_json(path, data):
+        """先写临时文件再原子替换，避免其他进程读到写了一半的文件。"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
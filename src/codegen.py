@@ -0,0 +1,352 @@
+# codegen.py
+# 整个程序的代码生成（--codegen）：把类型检查后的程序翻译为一个 Python 函数并用 compile() 编译，
+# 按程序哈希缓存。运算的结合和优先级来自语法树本身，生成的表达式全部加括号。
+# 单独的 show 谓词不经过这里，由 Evaluator.compile_predicate 编译为闭包。
+import hashlib
+from collections import OrderedDict
+from sets import BuilderSet
+from shortcircuit import group_operands, predicate_cost
+from syntax_tree import leaf_lexemes, live_declarations, program_declarations, program_shows
+
+MAX_CACHED_CODE = 1024  # 程序函数缓存的条目上限，超出后淘汰最久未使用的条目
+
+RELATION_OPERATORS = {'<': '<', '>': '>', '=': '=='}
+INTEGER_OPERATORS = ('+', '-', '*')
+
+_program_cache = OrderedDict()
+
+
+class Translator:
+    """
+    将整数表达式、集合表达式和谓词子树翻译为 Python 表达式源码。
+
+    约束变量翻译为 lambda 参数 b0、b1……；自由标识符（已声明的变量）翻译为
+    子类的 free_name 给出的名字。
+    """
+
+    def __init__(self):
+        self.parameters = 0  # 已生成的 lambda 参数个数，用于生成不重复的参数名
+
+    def free_name(self, lexeme):
+        raise NotImplementedError
+
+    def fresh_name(self):
+        name = f"b{self.parameters}"
+        self.parameters += 1
+        return name
+
+    def integer(self, node, bound):
+        """
+        翻译整数表达式。
+
+        参数：
+            node (dict): E、E'、E'' 节点或 num/id 终结符。
+            bound (dict): 作用域内的约束变量 -> lambda 参数名。
+
+        返回：
+            str: Python 表达式源码。
+        """
+        if 'token' in node:
+            lexeme = node['lexeme']
+            if node['token'] == 'num':
+                return str(int(lexeme))
+            if lexeme in bound:
+                return bound[lexeme]
+            return self.free_name(lexeme)
+
+        children = node.get('children', [])
+        if len(children) == 1:
+            return self.integer(children[0], bound)
+        if children[0].get('token') == '(':
+            return self.integer(children[1], bound)
+        operator = children[1]['lexeme']
+        if operator not in INTEGER_OPERATORS:
+            raise Exception(f"Unsupported operator in integer expression: {operator}")
+        left = self.integer(children[0], bound)
+        right = self.integer(children[2], bound)
+        return f"({left} {operator} {right})"
+
+    def membership(self, node, element, bound):
+        """
+        翻译成员测试 element @ node。
+
+        参数：
+            node (dict): 集合表达式节点或 id 终结符。
+            element (str): 已绑定元素值的变量名。
+            bound (dict): 作用域内的约束变量 -> lambda 参数名。
+
+        返回：
+            str: Python 布尔表达式源码。
+        """
+        if 'token' in node:
+            return f"{self.free_name(node['lexeme'])}.contains({element})"
+
+        children = node.get('children', [])
+        if len(children) == 1:
+            return self.membership(children[0], element, bound)
+        if len(children) == 4:
+            # E'' -> { Z P }：把元素值代入约束变量
+            variable = children[1]['children'][0]['lexeme']
+            parameter = self.fresh_name()
+            body = self.predicate(children[2], {**bound, variable: parameter})
+            return f"(lambda {parameter}: {body})({element})"
+        if children[0].get('token') == '(':
+            return self.membership(children[1], element, bound)
+        operator = children[1]['lexeme']
+        left = self.membership(children[0], element, bound)
+        right = self.membership(children[2], element, bound)
+        if operator == 'U':
+            return f"({left} or {right})"
+        elif operator == 'I':
+            return f"({left} and {right})"
+        raise Exception(f"Unsupported operator in set expression: {operator}")
+
+    def predicate(self, node, bound):
+        """
+        翻译谓词（P、P'、P''、R）。
+
+        参数：
+            node (dict): 谓词节点。
+            bound (dict): 作用域内的约束变量 -> lambda 参数名。
+
+        返回：
+            str: Python 布尔表达式源码。
+        """
+        name = node.get('name')
+        children = node.get('children', [])
+
+        if name == 'R':
+            operator = children[1]['lexeme']
+            left = self.integer(children[0], bound)
+            if operator == '@':
+                # 元素表达式只求值一次，再对集合的各部分做成员测试
+                element = self.fresh_name()
+                test = self.membership(children[2], element, bound)
+                return f"(lambda {element}: {test})({left})"
+            if operator not in RELATION_OPERATORS:
+                raise Exception(f"Unsupported relation operator: {operator}")
+            right = self.integer(children[2], bound)
+            return f"({left} {RELATION_OPERATORS[operator]} {right})"
+
+        if len(children) == 1:
+            return self.predicate(children[0], bound)
+        if len(children) == 2:
+            # P'' -> ! R
+            return f"(not {self.predicate(children[1], bound)})"
+        if children[0].get('token') == '(':
+            return self.predicate(children[1], bound)
+        operator = children[1]['lexeme']
+        if operator in ('|', '&'):
+            # 同一运算符连接的操作数按估计代价排序，代价高的成员测试放在最后
+            operands = sorted(group_operands(node, operator), key=predicate_cost)
+            keyword = " or " if operator == '|' else " and "
+            return "(" + keyword.join(self.predicate(operand, bound) for operand in operands) + ")"
+        raise Exception(f"Unsupported operator in predicate expression: {operator}")
+
+
+class ProgramTranslator(Translator):
+    """
+    将整个带类型的程序翻译为一个 Python 函数的源码。
+
+    每条声明赋值给一个新的局部变量 v0、v1……（同名变量重新声明时换用新的局部变量，
+    已经构造的集合仍然引用旧值），集合构造式翻译为 BuilderSet 和 lambda，
+    显示文本按 Evaluator 的显示规则生成。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.scope = {}  # 已声明的标识符 -> 当前的局部变量名
+        self.declarations = 0  # 已分配的局部变量个数
+
+    def free_name(self, lexeme):
+        if lexeme not in self.scope:
+            raise Exception(f"Undefined identifier: {lexeme}")
+        return self.scope[lexeme]
+
+    def declare(self, lexeme):
+        """为新声明的标识符分配局部变量名。"""
+        name = f"v{self.declarations}"
+        self.declarations += 1
+        self.scope[lexeme] = name
+        return name
+
+    def set_value(self, node):
+        """翻译集合表达式，结果为 SetValue。"""
+        if 'token' in node:
+            return self.free_name(node['lexeme'])
+
+        children = node.get('children', [])
+        if len(children) == 1:
+            return self.set_value(children[0])
+        if len(children) == 4:
+            # E'' -> { Z P }
+            variable = children[1]['children'][0]['lexeme']
+            parameter = self.fresh_name()
+            body = self.predicate(children[2], {variable: parameter})
+            text = self.display_predicate(children[2], {variable})
+            return f"_builder({variable!r}, lambda {parameter}: {body}, {text})"
+        if children[0].get('token') == '(':
+            return self.set_value(children[1])
+        operator = children[1]['lexeme']
+        left = self.set_value(children[0])
+        right = self.set_value(children[2])
+        if operator == 'U':
+            return f"{left}.union({right})"
+        elif operator == 'I':
+            return f"{left}.intersection({right})"
+        raise Exception(f"Unsupported operator in set expression: {operator}")
+
+    def display_integer(self, node, bound):
+        """
+        生成整数表达式显示值的源码：含约束变量的部分为文本，其余部分直接计算。
+
+        参数：
+            node (dict): 整数表达式节点或终结符。
+            bound (set): 作用域内的约束变量名。
+        """
+        if 'token' in node:
+            lexeme = node['lexeme']
+            if node['token'] == 'num':
+                return str(int(lexeme))
+            if lexeme in bound or lexeme not in self.scope:
+                return repr(lexeme)
+            return self.scope[lexeme]
+
+        children = node.get('children', [])
+        if len(children) == 1:
+            return self.display_integer(children[0], bound)
+        if children[0].get('token') == '(':
+            return self.display_integer(children[1], bound)
+        left = self.display_integer(children[0], bound)
+        right = self.display_integer(children[2], bound)
+        return f"_display_operator({left}, {children[1]['lexeme']!r}, {right})"
+
+    def display_set(self, node, bound):
+        """生成谓词中集合表达式显示值的源码。"""
+        if 'token' in node:
+            lexeme = node['lexeme']
+            if lexeme in bound or lexeme not in self.scope:
+                return repr(lexeme)
+            return self.scope[lexeme]
+
+        children = node.get('children', [])
+        if len(children) == 1:
+            return self.display_set(children[0], bound)
+        if len(children) == 4:
+            variable = children[1]['children'][0]['lexeme']
+            text = self.display_predicate(children[2], bound | {variable})
+            return f"_builder({variable!r}, None, {text})"
+        if children[0].get('token') == '(':
+            return self.display_set(children[1], bound)
+        left = self.display_set(children[0], bound)
+        right = self.display_set(children[2], bound)
+        if children[1]['lexeme'] == 'U':
+            return f"{left}.union({right})"
+        return f"{left}.intersection({right})"
+
+    def display_predicate(self, node, bound):
+        """生成谓词显示文本的源码（与 Evaluator.evaluate_predicate 的输出一致）。"""
+        name = node.get('name')
+        children = node.get('children', [])
+
+        if name == 'R':
+            operator = children[1]['lexeme']
+            left = self.display_integer(children[0], bound)
+            if operator == '@':
+                right = self.display_set(children[2], bound)
+            else:
+                right = self.display_integer(children[2], bound)
+            return f"(str({left}) + {' ' + operator + ' '!r} + str({right}))"
+
+        if len(children) == 1:
+            return self.display_predicate(children[0], bound)
+        if len(children) == 2:
+            return f"('! ' + {self.display_predicate(children[1], bound)})"
+        if children[0].get('token') == '(':
+            return self.display_predicate(children[1], bound)
+        left = self.display_predicate(children[0], bound)
+        right = self.display_predicate(children[2], bound)
+        return f"('(' + {left} + {' ' + children[1]['lexeme'] + ' '!r} + {right} + ')')"
+
+    def program(self, tree, demand=False):
+        """
+        翻译整个程序。
+
+        参数：
+            tree (dict): 类型检查后的根节点 S。
+            demand (bool): 为 True 时只翻译 show 语句传递地依赖的声明（见 live_declarations）。
+
+        返回：
+            str: 定义函数 program() 的 Python 源码，函数返回 show 语句的结果
+                 （有多条 show 语句时按顺序返回结果的列表）。
+        """
+        lines = ["def program():"]
+        declarations = live_declarations(tree)[0] if demand else program_declarations(tree)
+        for d_node in declarations:
+            children = d_node['children']
+            var_type = children[1]['children'][0]['lexeme']
+            if var_type == 'int':
+                value = self.integer(children[4], {})
+            elif var_type == 'set':
+                value = self.set_value(children[4])
+            else:
+                raise Exception(f"Unknown type for variable '{children[2]['lexeme']}': {var_type}")
+            lines.append(f"    {self.declare(children[2]['lexeme'])} = {value}")
+
+        results = []
+        for c_node in program_shows(tree):
+            expression = c_node['children'][1]['children'][0]
+            if expression.get('name') == 'P':
+                results.append(f"('true' if {self.predicate(expression, {})} else 'false')")
+            elif expression.get('type') == 'set':
+                results.append(self.set_value(expression))
+            else:
+                results.append(self.integer(expression, {}))
+        if len(results) == 1:
+            lines.append(f"    return {results[0]}")
+        else:
+            lines.append(f"    return [{', '.join(results)}]")
+        return "\n".join(lines) + "\n"
+
+
+def display_operator(left, operator, right):
+    """整数运算的显示值：操作数是约束变量（文本）时返回文本，否则直接计算。"""
+    if isinstance(left, str) or isinstance(right, str):
+        return f"{left} {operator} {right}"
+    if operator == '+':
+        return left + right
+    elif operator == '-':
+        return left - right
+    return left * right
+
+
+def compile_program(tree, demand=False):
+    """
+    将类型检查后的整个程序编译为 Python 函数。
+
+    函数按程序的 token 序列的哈希缓存，重复运行同一程序时不再翻译、编译，也不再遍历语法树。
+
+    参数：
+        tree (dict): 类型检查后的根节点 S。
+        demand (bool): 为 True 时跳过 show 语句不依赖的声明。
+
+    返回：
+        callable: 无参数函数，返回 show 语句的结果（int、SetValue 或 'true'/'false'），
+                  有多条 show 语句时返回结果的列表。
+    """
+    key = hashlib.sha256("\0".join(leaf_lexemes(tree)).encode("utf-8")).hexdigest() + (":demand" if demand else "")
+    if key in _program_cache:
+        _program_cache.move_to_end(key)
+        return _program_cache[key]
+    source = ProgramTranslator().program(tree, demand)
+    namespace = {
+        "__builtins__": {"str": str},
+        "_builder": BuilderSet,
+        "_display_operator": display_operator,
+    }
+    exec(compile(source, "<program>", "exec"), namespace)
+    function = namespace["program"]
+    _program_cache[key] = function
+    if len(_program_cache) > MAX_CACHED_CODE:
+        _program_cache.popitem(last=False)
+    return function
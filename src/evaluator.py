@@ -1,7 +1,27 @@
 # evaluator.py
-import re
+import bisect
+import itertools
 import json
 import sys
+from collections import OrderedDict
+from sets import BuilderSet, MembershipCache, MemoizedSet
+from bitsets import BitSet
+from intervals import Intervals, NEG_INF, POS_INF
+from backend import numpy_module
+from codegen import compile_program
+from simplify import Simplifier
+from ropes import Rope, format_result
+from shortcircuit import ShortCircuitGroup, group_operands, predicate_cost
+from profiler import NULL_PROFILER
+from syntax_tree import leaf_lexemes, live_declarations, referenced_identifiers
+
+MAX_CACHED_PREDICATES = 1024  # show 谓词编译结果缓存的条目上限，超出后淘汰最久未使用的条目
+DEFAULT_DEFINITION_WINDOW = (-100, 100)  # 无法推断时 set_definition 展开集合使用的范围
+
+
+class DecisionError(Exception):
+    """判定过程（是否为空、包含、相等、元素个数）在给定范围上无法进行。"""
+
 
 class Evaluator:
     def __init__(self, typing_file='typing_out.json', evaluation_file='evaluation_out.json'):
@@ -17,6 +37,19 @@ class Evaluator:
         self.symbol_table = {}
         self.parse_tree = None
         self.evaluation_result = None
+        self.bound_variables = []  # 正在处理的集合构造式中的约束变量（用于显示）
+        self.domain = None  # 集合声明物化为位集合时使用的论域 (low, high)，None 表示不物化
+        self.bitset_words = False  # 位集合使用 NumPy uint64 数组而不是 Python 大整数
+        self.membership_cache = MembershipCache()  # 已声明集合的成员测试结果缓存
+        self.bindings = 0  # 已创建的集合绑定个数，用作绑定的序号
+        self.demand_driven = False  # 只评估 show 语句传递地依赖的声明
+        self.live_declarations = None  # 按需评估时需要评估的声明节点的 id，None 表示全部评估
+        self.skipped_declarations = []  # 按需评估时跳过的声明的变量名（按源码顺序）
+        self.parallel = False  # 在进程池中并行物化集合声明（需要设置论域）
+        self.workers = None  # 并行物化使用的工作进程个数，None 表示 CPU 个数
+        self.precomputed = {}  # 并行物化的结果：声明节点的 id -> 位图
+        self.predicate_cache = OrderedDict()  # show 谓词的编译结果（见 compile_show_predicate）
+        self.profiler = NULL_PROFILER  # 分阶段剖析器，写出 evaluation_out.json 记为 writing 阶段
         self.DEBUG = False  # 内置的调试开关，默认关闭
 
     def enable_debug(self):
@@ -27,31 +60,66 @@ class Evaluator:
         """禁用调试模式。"""
         self.DEBUG = False
 
-    def debug_print(self, message):
+    def enable_demand_driven(self):
+        """
+        启用按需评估：只评估 show 语句传递地依赖的声明，其余声明跳过（不检查其中的错误），
+        跳过的声明记录在 skipped_declarations 中并在评估结束时报告。
+        """
+        self.demand_driven = True
+
+    def enable_parallel(self, workers=None):
+        """
+        启用并行物化：设置了论域时，先按声明的依赖图在进程池中并发地计算各集合声明的位图
+        （见 scheduler.precompute_declarations），再顺序遍历语法树。
+
+        参数：
+            workers (int): 工作进程个数，None 表示 CPU 个数。
+        """
+        self.parallel = True
+        self.workers = workers
+
+    def set_domain(self, low, high, words=False):
+        """
+        设置有限论域：之后声明的集合都在 [low, high] 上物化为位集合，
+        同一论域上的 U、I 变为整字的按位运算。
+
+        参数：
+            low (int): 论域下界。
+            high (int): 论域上界（包含）。
+            words (bool): 为 True 时位图使用 NumPy uint64 数组，否则使用 Python 大整数。
+        """
+        if low > high:
+            raise ValueError(f"Empty domain: {low}..{high}")
+        self.domain = (low, high)
+        self.bitset_words = words
+
+    def debug_print(self, message, *args):
         """
         根据调试开关打印调试信息。
 
         参数：
-            message (str): 要打印的调试信息。
+            message (str): 要打印的调试信息；给出 args 时为格式串，
+                           只在调试模式下才用 args 格式化（显示值可能是需要渲染的 Rope）。
+            args: 格式串的参数。
         """
         if self.DEBUG:
-            print(f"[DEBUG] {message}")
+            print(f"[DEBUG] {message.format(*args) if args else message}")
 
     def load_typing_output(self):
         """
         加载 typing_out.json 文件并解析为语法树。
         """
-        self.debug_print(f"Loading typing output from {self.typing_file}")
+        self.debug_print("Loading typing output from {}", self.typing_file)
         try:
             with open(self.typing_file, 'r') as f:
                 self.parse_tree = json.load(f)
             self.debug_print("Typing output loaded successfully.")
         except FileNotFoundError:
-            self.debug_print(f"Error: {self.typing_file} not found.")
+            self.debug_print("Error: {} not found.", self.typing_file)
             print(f"Error: {self.typing_file} not found.")
             sys.exit(1)
         except json.JSONDecodeError:
-            self.debug_print(f"Error: {self.typing_file} is not a valid JSON file.")
+            self.debug_print("Error: {} is not a valid JSON file.", self.typing_file)
             print(f"Error: {self.typing_file} is not a valid JSON file.")
             sys.exit(1)
 
@@ -59,58 +127,111 @@ class Evaluator:
         """
         将评估后的语法树写入 evaluation_out.json 文件。
         """
-        self.debug_print(f"Writing evaluation output to {self.evaluation_file}")
+        self.debug_print("Writing evaluation output to {}", self.evaluation_file)
         try:
-            def convert_node(node: dict):
-                if "token" in node:
-                    # 终结符
-                    return {
-                        "token": node["token"],
-                        "lexeme": node["lexeme"],
-                        "value": str(node.get("value"))
-                    }
-                else:
-                    # 非终结符
-                    return {
-                        "name": node["name"],
-                        "value": str(node.get("value")),
-                        "children": [convert_node(child) for child in node.get("children", [])]
-                    }
-                # json.dump(convert_node(self.ast_root), f, indent=2, ensure_ascii=False)
             with open(self.evaluation_file, 'w') as f:
-                json.dump(convert_node(self.parse_tree), f, indent=4)
+                self.write_json_node(f, self.parse_tree, 0)
             self.debug_print("Evaluation output written successfully.")
         except Exception as e:
-            self.debug_print(f"Error writing to {self.evaluation_file}: {str(e)}")
+            self.debug_print("Error writing to {}: {}", self.evaluation_file, str(e))
             print(f"Error writing to {self.evaluation_file}: {str(e)}")
             sys.exit(1)
 
-    def evaluate(self):
+    def write_json_node(self, f, node, level):
+        """
+        以 json.dump(indent=4) 的格式流式写出一个节点。
+
+        节点的显示值（可能是 Rope）在写出时才渲染，写完即丢弃，
+        同一时刻只保存一个节点的显示文本。
+
+        参数：
+            f: 输出文件。
+            node (dict): 要写出的节点。
+            level (int): 节点所在的缩进层级。
+        """
+        pad = "    " * level
+        inner = pad + "    "
+        value = json.dumps(str(node.get("value")))
+        if "token" in node:
+            # 终结符
+            f.write("{\n" + inner + '"token": ' + json.dumps(node["token"]) + ",\n"
+                    + inner + '"lexeme": ' + json.dumps(node["lexeme"]) + ",\n"
+                    + inner + '"value": ' + value + "\n" + pad + "}")
+            return
+        # 非终结符
+        f.write("{\n" + inner + '"name": ' + json.dumps(node["name"]) + ",\n"
+                + inner + '"value": ' + value + ",\n" + inner + '"children": ')
+        children = node.get("children", [])
+        if not children:
+            f.write("[]")
+        else:
+            f.write("[")
+            for index, child in enumerate(children):
+                f.write(("," if index else "") + "\n" + inner + "    ")
+                self.write_json_node(f, child, level + 2)
+            f.write("\n" + inner + "]")
+        f.write("\n" + pad + "}")
+
+    def evaluate(self, compiled=False):
         """
         执行评估过程，包括加载、评估和写入输出。
+
+        参数：
+            compiled (bool): 为 True 时把整个程序编译为 Python 函数执行（见 codegen.compile_program），
+                             不遍历语法树，evaluation_out.json 只记录程序的结果。
         """
         self.debug_print("Starting evaluation process.")
         try:
             self.load_typing_output()
-            self.evaluate_node(self.parse_tree)
-            self.write_evaluation_output()
+            if self.demand_driven and self.parse_tree.get('children'):
+                live, unused = live_declarations(self.parse_tree)
+                self.live_declarations = {id(d_node) for d_node in live}
+                self.skipped_declarations = [d_node['children'][2]['lexeme'] for d_node in unused]
+            # simplify 需要用到前面声明的值，逐条声明展开，只能由语法树遍历处理
+            if compiled and 'simplify' not in leaf_lexemes(self.parse_tree):
+                self.run_compiled_program()
+            else:
+                if self.parallel and self.domain is not None and self.parse_tree.get('children'):
+                    from scheduler import precompute_declarations
+
+                    self.precomputed = precompute_declarations(
+                        self.parse_tree, self.domain, self.bitset_words, self.workers, self.live_declarations)
+                    self.debug_print("Materialized {} declarations in parallel.", len(self.precomputed))
+                self.evaluate_node(self.parse_tree)
+            with self.profiler.stage("writing"):
+                self.write_evaluation_output()
             print("Evaluation Complete!")
+            if self.skipped_declarations:
+                print(f"Skipped {len(self.skipped_declarations)} unused declaration(s): "
+                      f"{', '.join(self.skipped_declarations)}")
+            self.debug_print("Membership cache: {}", self.membership_cache.stats())
             if self.evaluation_result is not None:
                 print(f"Result: {self.evaluation_result}")
             self.debug_print("Evaluation process finished successfully.")
         except Exception as e:
-            self.debug_print(f"Evaluation Error: {str(e)}")
+            self.debug_print("Evaluation Error: {}", str(e))
             print(f"Evaluation Error: {str(e)}")
             # 写入空的 evaluation_out.json
             try:
                 with open(self.evaluation_file, 'w') as f:
                     json.dump({}, f)
-                self.debug_print(f"Empty {self.evaluation_file} created due to evaluation error.")
+                self.debug_print("Empty {} created due to evaluation error.", self.evaluation_file)
             except Exception as write_error:
-                self.debug_print(f"Error writing empty evaluation file: {str(write_error)}")
+                self.debug_print("Error writing empty evaluation file: {}", str(write_error))
                 print(f"Error writing empty evaluation file: {str(write_error)}")
             sys.exit(1)
 
+    def run_compiled_program(self):
+        """
+        用编译后的程序函数计算结果，结果写入根节点的 value。
+        """
+        program = compile_program(self.parse_tree, self.demand_driven)
+        result = program()
+        result = format_result(result)
+        self.debug_print("Compiled program evaluated to {}", result)
+        self.parse_tree = {"name": self.parse_tree["name"], "value": result}
+        return result
+
     def evaluate_node(self, node):
         """
         递归地评估语法树中的每个节点，并更新 value 字段。
@@ -125,35 +246,35 @@ class Evaluator:
         node_name = node.get('name')
         children = node.get("children", [])
 
-        self.debug_print(f"Evaluating node: {node_name if node_name else 'terminal'} with type: {node_type}")
+        self.debug_print("Evaluating node: {} with type: {}", node_name if node_name else 'terminal', node_type)
 
         # 处理终端节点
         if 'token' in node:
             token = node['token']
             lexeme = node['lexeme']
-            self.debug_print(f"Processing terminal token: {token}, lexeme: {lexeme}")
+            self.debug_print("Processing terminal token: {}, lexeme: {}", token, lexeme)
 
             if token == 'num':
                 evaluation = int(lexeme)  # 保持原有 value
                 node['value'] = lexeme  # 保持原有 value
-                self.debug_print(f"Number {lexeme} evaluated as {evaluation}")
+                self.debug_print("Number {} evaluated as {}", lexeme, evaluation)
             elif token == 'id':
-                if lexeme not in self.symbol_table:
+                if lexeme in self.bound_variables or lexeme not in self.symbol_table:
                     node['value'] = 'void'
                     return lexeme
                 evaluation = self.symbol_table[lexeme]['value']
                 node['value'] = "void" 
-                self.debug_print(f"Identifier {lexeme} evaluated as {evaluation}")
+                self.debug_print("Identifier {} evaluated as {}", lexeme, evaluation)
             elif token in ['<', '>', '=', '@', '+', '-', '*', 'U', 'I', '&', '|', '!', ':']:
                 # 操作符本身不需要评估，只是在操作中使用
                 evaluation = lexeme
                 node['value'] = "void"
-                self.debug_print(f"Operator {lexeme} stored for evaluation.")
+                self.debug_print("Operator {} stored for evaluation.", lexeme)
             else:
                 # 其他终端符号直接返回
                 evaluation = lexeme
                 node['value'] = "void"
-                self.debug_print(f"Terminal {lexeme} evaluated as {evaluation}")
+                self.debug_print("Terminal {} evaluated as {}", lexeme, evaluation)
             return evaluation
 
         # 处理非终端节点
@@ -167,6 +288,9 @@ class Evaluator:
             for child in node.get('children', []):
                 if (child.get('name')=="C"):
                     result = self.evaluate_node(child)
+                elif child.get('name') == "C'":
+                    # 其余的 show 语句：结果按顺序组成列表
+                    result = format_result([result] + self.evaluate_node(child))
                 else:
                     self.evaluate_node(child)
             node['value'] = result  # 根据理想输出设置
@@ -178,6 +302,9 @@ class Evaluator:
             for child in node.get('children', []):
                 if (child.get('name')=="C"):
                     result = self.evaluate_node(child)
+                elif child.get('name') == "C'":
+                    # 其余的 show 语句：结果按顺序组成列表
+                    result = format_result([result] + self.evaluate_node(child))
                 else:
                     self.evaluate_node(child)
             node['value'] = result
@@ -212,8 +339,14 @@ class Evaluator:
             # 处理单个声明 D
             var_type = node['children'][1]['children'][0].get('lexeme')
             var_name = node['children'][2].get('lexeme')
+            if self.live_declarations is not None and id(node) not in self.live_declarations:
+                node['value'] = "void"
+                self.debug_print("Skipping unused declaration: let {} {} be ...", var_type, var_name)
+                return "void"
+            # 先用已声明的值化简表达式中的 simplify，之后按化简后的语法树评估
+            Simplifier(self).expand(node)
 
-            self.debug_print(f"Processing declaration: let {var_type} {var_name} be ...")
+            self.debug_print("Processing declaration: let {} {} be ...", var_type, var_name)
             counter = 0
             for child in node.get('children', []):
                 if (counter == 4):
@@ -221,24 +354,38 @@ class Evaluator:
                 else:
                     self.evaluate_node(child)
                 counter = counter + 1
-            self.debug_print(f"Expression evaluated to {value}")
+            self.debug_print("Expression evaluated to {}", value)
+
+            previous = self.symbol_table.get(var_name)
+            if previous is not None and isinstance(previous['value'], MemoizedSet):
+                # 变量被重新声明，旧绑定的成员测试结果不再可达
+                self.membership_cache.invalidate(previous['value'].binding)
 
             if var_type == 'int':
                 if not isinstance(value, int) and not (isinstance(value, str) and value.isdigit()):
                     raise Exception(f"Type mismatch: Variable '{var_name}' expected to be int.")
                 self.symbol_table[var_name] = {'type': 'int', 'value': int(value)}
                 node['value'] = "void"  # 声明不返回具体值
-                self.debug_print(f"Declared integer variable '{var_name}' with value {value}.")
+                self.debug_print("Declared integer variable '{}' with value {}.", var_name, value)
             elif var_type == 'set':
-                
+                if self.domain is not None and id(node) in self.precomputed:
+                    value = BitSet(value, *self.domain, self.precomputed.pop(id(node)))
+                elif self.domain is not None:
+                    # 位集合保留原来的符号集合，显示文本和论域外的成员测试都不变
+                    value = BitSet.from_set(value, *self.domain, words=self.bitset_words)
+                elif value.intervals is None:
+                    # 只能逐个调用谓词的集合缓存成员测试结果（区间列表和位集合的测试本身已经很快）
+                    self.bindings += 1
+                    value = MemoizedSet(value, self.membership_cache, (var_name, self.bindings))
                 self.symbol_table[var_name] = {'type': 'set', 'value': value}
                 node['value'] = "void"  # 声明不返回具体值
-                self.debug_print(f"Declared set variable '{var_name}' with value {value}.")
+                self.debug_print("Declared set variable '{}' with value {}.", var_name, value)
             else:
                 raise Exception(f"Unknown type for variable '{var_name}': {var_type}")
 
         elif node_name == 'C' and node_type == 'calculation':
             # 处理计算节点 C
+            Simplifier(self).expand(node)
             child = node.get('children', [])
             self.evaluate_node(child[0])
             result = self.evaluate_node(child[1])
@@ -246,6 +393,16 @@ class Evaluator:
             self.debug_print("Calculation node 'C' evaluated.")
             return result
 
+        elif node_name == "C'" and node_type == 'calculation':
+            # 处理第一个 show 语句之后的 show 语句 C'，返回各结果组成的列表
+            results = [self.evaluate_node(children[0])]
+            self.evaluate_node(children[1])
+            if len(children) == 3:
+                results += self.evaluate_node(children[2])
+            node['value'] = format_result(results)
+            self.debug_print("Calculation list node 'C\'' evaluated.")
+            return results
+
         elif node_name == 'show' and node_type == 'calculation':
             # 处理 show 语句
             expr_node = node['children'][0]
@@ -253,7 +410,7 @@ class Evaluator:
             result = self.evaluate_node(expr_node)
             node['value'] = "void"  # 更新 value 为 show 的结果
             self.evaluation_result = result
-            self.debug_print(f"'show' statement evaluated to {result}")
+            self.debug_print("'show' statement evaluated to {}", result)
             return result
 
         elif node_name == 'E' and node_type in ['integer', 'set']:
@@ -265,7 +422,7 @@ class Evaluator:
         elif node_name == 'P' and node_type == 'predicate':
             # 处理谓词节点 P
             result = self.evaluate_predicate(node)
-            node['value'] = str(result).lower()  # 将布尔值转为小写字符串
+            node['value'] = result.lower()  # 将布尔值转为小写字符串
             return result
 
         elif node_name == 'A' and node_type == 'calculation':
@@ -279,11 +436,11 @@ class Evaluator:
             self.evaluate_node(children[1])
             self.evaluate_node(children[0])
             node['value'] = children[0]['lexeme']
-            self.debug_print(f"Set variable 'Z' evaluated to {'void'}")
+            self.debug_print("Set variable 'Z' evaluated to void")
             return node['value']
 
         else:
-            self.debug_print(f"Unknown non-terminal node: {node_name}, skipping evaluation.")
+            self.debug_print("Unknown non-terminal node: {}, skipping evaluation.", node_name)
             node['value'] = "void"
             return "void"
 
@@ -300,7 +457,7 @@ class Evaluator:
         name = node.get('name')
         children = node.get('children', [])
 
-        self.debug_print(f"Evaluating expression node: {name}")
+        self.debug_print("Evaluating expression node: {}", name)
 
         if name == 'E\'':
             # 处理整数表达式
@@ -316,22 +473,15 @@ class Evaluator:
                 self.evaluate_node(children[1])
                 right = self.evaluate_expression(children[2])
 
-                self.debug_print(f"Evaluating integer expression: {left} {operator} {right}")
+                self.debug_print("Evaluating integer expression: {} {} {}", left, operator, right)
 
-                if operator == '+':
-                    result = left + right
-                elif operator == '-':
-                    result = left - right
-                elif operator == '*':
-                    result = left * right
-                else:
-                    raise Exception(f"Unsupported operator in integer expression: {operator}")
+                result = self.apply_integer_operator(left, operator, right)
                 node['value'] = result
             elif node.get('type') == 'set':
                 left = self.evaluate_expression(children[0])
                 self.evaluate_node(children[1])
                 right = self.evaluate_expression(children[2])
-                result = left + ' I ' + right
+                result = left.intersection(right)
                 node['value'] = result
             else:
                 raise Exception(f"E' Error : {len(children)}")
@@ -344,6 +494,13 @@ class Evaluator:
             if not children:
                 raise Exception("Invalid integer expression.")
             child = children[0]
+            if len(children) == 3:
+                # E'' -> ( E )
+                self.evaluate_node(children[0])
+                result = self.evaluate_expression(children[1])
+                self.evaluate_node(children[2])
+                node['value'] = result
+                return result
             if child['token'] == 'num':
                 result = self.evaluate_node(child)
                 node['value'] = result
@@ -363,19 +520,39 @@ class Evaluator:
                 result = self.evaluate_node(children[0])
                 node['value'] = result
                 return result
+            elif len(children) == 3:
+                # E'' -> ( E )
+                self.evaluate_node(children[0])
+                result = self.evaluate_expression(children[1])
+                self.evaluate_node(children[2])
+                node['value'] = result
+                return result
             elif len(children) == 4:
                 self.evaluate_node(children[0])
                 variable = self.evaluate_node(children[1])
-                result = self.evaluate_predicate(children[2])
+                self.bound_variables.append(variable)
+                try:
+                    text = self.evaluate_predicate(children[2])
+                finally:
+                    self.bound_variables.pop()
                 self.evaluate_node(children[3])
-                self.debug_print(f"Set expression evaluated to {result}")
-                if variable in result:
-                    result = '{ ' + variable + ': '+ result + ' }'
+                self.debug_print("Set expression evaluated to {}", text)
+                # 谓词编译为约束变量上的函数；能规范化为区间列表时，成员测试走二分查找
+                bound = frozenset(self.bound_variables + [variable])
+                predicate = self.compile_predicate(children[2], bound)
+                intervals = self.normalize_predicate(children[2], variable, bound)
+                vector_predicate = radius = None
+                if intervals is None:
+                    vector_predicate = self.compile_vector_predicate(children[2], variable, bound)
+                    radius = self.predicate_radius(children[2], variable, bound)
+                result = BuilderSet(
+                    variable, lambda n: predicate({variable: n}), text, intervals, vector_predicate, radius
+                )
                 node['value'] = result
-                self.debug_print(f"Set expression variable '{variable}' evaluated as {result}")
+                self.debug_print("Set expression variable '{}' evaluated as {}", variable, result)
                 return result
             else:
-                raise Exception(f"Unsupported token in set expression: {child['token']}")
+                raise Exception(f"Unsupported set expression with {len(children)} children.")
 
         elif name == 'E' and node.get('type') == 'integer':
             # 处理更复杂的整数表达式
@@ -391,18 +568,11 @@ class Evaluator:
                 self.evaluate_node(children[1])
                 right = self.evaluate_expression(children[2])
 
-                self.debug_print(f"Evaluating integer expression: {left} {operator} {right}")
+                self.debug_print("Evaluating integer expression: {} {} {}", left, operator, right)
 
-                if operator == '+':
-                    result = left + right
-                elif operator == '-':
-                    result = left - right
-                elif operator == '*':
-                    result = left * right
-                else:
-                    raise Exception(f"Unsupported operator in integer expression: {operator}")
+                result = self.apply_integer_operator(left, operator, right)
                 node['value'] = result
-            self.debug_print(f"Integer expression evaluated to {result}")
+            self.debug_print("Integer expression evaluated to {}", result)
             return result
 
         elif name == 'E' and node.get('type') == 'set':
@@ -417,9 +587,9 @@ class Evaluator:
                 left = self.evaluate_expression(children[0])
                 self.evaluate_node(children[1])
                 right = self.evaluate_expression(children[2])
-                result = left + ' U ' + right
+                result = left.union(right)
                 node['value'] = result
-            self.debug_print(f"Set expression evaluated to {result}")
+            self.debug_print("Set expression evaluated to {}", result)
             return result
 
         else:
@@ -432,7 +602,7 @@ class Evaluator:
         name = node.get('name')
         children = node.get('children', [])
 
-        self.debug_print(f"Evaluating predicate node: {name}")
+        self.debug_print("Evaluating predicate node: {}", name)
 
         if name == 'P':
             if len(children) == 1:
@@ -444,14 +614,14 @@ class Evaluator:
                 self.evaluate_node(children[1])
                 right = self.evaluate_predicate(children[2])
 
-                self.debug_print(f"Evaluating predicate expression: {left} {operator} {right}")
+                self.debug_print("Evaluating predicate expression: {} {} {}", left, operator, right)
 
                 if operator == '|':
-                    result = '(' + left + ' | ' + right + ')'
+                    result = Rope('(', left, ' | ', right, ')')
                 else:
                     raise Exception(f"Unsupported operator in predicate expression: {operator}")
                 node['value'] = result
-            self.debug_print(f"predicate expression evaluated to {result}")
+            self.debug_print("predicate expression evaluated to {}", result)
             return result
         
         elif name == 'P\'':
@@ -464,14 +634,14 @@ class Evaluator:
                 self.evaluate_node(children[1])
                 right = self.evaluate_predicate(children[2])
 
-                self.debug_print(f"Evaluating predicate expression: {left} {operator} {right}")
+                self.debug_print("Evaluating predicate expression: {} {} {}", left, operator, right)
 
                 if operator == '&':
-                    result = '(' + left + ' & ' + right + ')'
+                    result = Rope('(', left, ' & ', right, ')')
                 else:
                     raise Exception(f"Unsupported operator in predicate expression: {operator}")
                 node['value'] = result
-            self.debug_print(f"predicate expression evaluated to {result}")
+            self.debug_print("predicate expression evaluated to {}", result)
             return result
 
         elif name == 'P\'\'':
@@ -481,13 +651,21 @@ class Evaluator:
             elif len(children) == 2:
                 left = self.evaluate_node(children[0])
                 right = self.evaluate_relation(children[1])
-                self.debug_print(f"Evaluating predicate expression: {left}{right}")
+                self.debug_print("Evaluating predicate expression: {}{}", left, right)
                 if left == "!":
-                    result =  left + ' ' + right
+                    result = Rope(left, ' ', right)
                 else:
                     raise Exception(f"Unsupported operator in predicate expression: {left}")
                 node['value'] = result
-            self.debug_print(f"predicate expression evaluated to {result}")
+            elif len(children) == 3:
+                # P'' -> ( P )
+                self.evaluate_node(children[0])
+                result = self.evaluate_predicate(children[1])
+                self.evaluate_node(children[2])
+                node['value'] = result
+            else:
+                raise Exception(f"Unsupported predicate structure with {len(children)} children.")
+            self.debug_print("predicate expression evaluated to {}", result)
             return result
 
         else:
@@ -519,7 +697,7 @@ class Evaluator:
         middle = self.evaluate_node(children[1])
         right = self.evaluate_expression(right_expr)
 
-        result = str(left) + ' ' + operator + ' ' + str(right)
+        result = Rope(left, ' ', operator, ' ', right)
         node['value'] = result
         return result
         
@@ -539,124 +717,713 @@ class Evaluator:
         self.debug_print("Evaluating calculation node.")
         if (children[0]['name']=="E"):
             result = self.evaluate_expression(children[0])
-            self.debug_print(f"Calculation evaluated to {result}")
+            self.debug_print("Calculation evaluated to {}", result)
             return result
         elif (children[0]['name']=="P"):
-            result = self.evaluate_predicate(children[0])
-
-            def evaluate_condition(value, condition):
-                try:
-                    condition = condition.replace('x', str(value))
-                    print(f"Evaluating: {condition} with value: {value}")
-                    return eval(condition)
-                except SyntaxError as e:
-                    print(f"Syntax error in condition: {condition}")
-                    raise e
-
-            def split_outside_braces(expression, delimiter):
-                parts = []
-                current = []
-                stack = 0  
-                i = 0
-                while i < len(expression):
-                    char = expression[i]
-                    if char == '{':
-                        stack += 1
-                    elif char == '}':
-                        stack -= 1
-                    if stack == 0 and expression[i:i+len(delimiter)] == delimiter:
-                        parts.append(''.join(current).strip())
-                        current = []
-                        i += len(delimiter)  
-                    else:
-                        current.append(char)
-                        i += 1
-                parts.append(''.join(current).strip())
-                return parts
-
-            def convert_to_x(expression):
-                transformed_expression = re.sub(r'\b[a-zA-Z]+\b', 'x', expression)
-                return transformed_expression
-
-            def convert_and_evaluate(expression, variables):
-                print(f"Original expression: {expression}")
-                expression = convert_to_x(expression)
-
-                expression = expression.replace('!', ' not ')
-                expression = expression.replace('|', ' or ')
-                expression = expression.replace('&', ' and ')
-                expression = expression.replace('@', ' in ')
-                expression = expression.replace('=', '==')
-             
-                expression = expression.replace('(', '').replace(')', '')
-
-
-                def eval_part(part):
-                    if " in " in part:
-                        sub_parts_in = part.split(" in ")
-                        value = eval(sub_parts_in[0].strip(), {}, variables)
-                        condition_str = sub_parts_in[1].strip()
-                        if condition_str.startswith("{") and condition_str.endswith("}"):
-                            condition_str = condition_str[1:-1].strip()
-                            condition = condition_str.split(":")[1].strip()
-                            return evaluate_condition(value, condition)
-                        else:
-                            return eval(part, {}, variables)
-                    else:
-                        return eval(part, {}, variables)
-                
-                parts_or = split_outside_braces(expression, ' or ')               
-                results = []
-                for part_or in parts_or:
-                    parts_and = split_outside_braces(part_or, ' and ')
-                    sub_results = [eval_part(part_and) for part_and in parts_and]
-                    results.append(all(sub_results))
-                final_result = any(results)
-                return final_result
-            variables = {}
-
-            try: 
-                result = convert_and_evaluate(result, variables)
-                result = str(result).lower() 
-                return result 
-            except Exception as e: 
+            self.evaluate_predicate(children[0])
+            try:
+                # 谓词由语法树编译为闭包（按谓词缓存），成员测试 n @ S 调用集合的 contains
+                result = str(self.compile_show_predicate(children[0])()).lower()
+                self.debug_print("Calculation evaluated to {}", result)
+                return result
+            except Exception as e:
                 return f"Error evaluating expression: {e}"
         else:
             raise Exception("Invalid calculation node.")
 
-    def evaluate_set_definition(self, node):
+    def infer_window(self, set_value):
+        """
+        推断展开集合时使用的范围。
+
+        区间集合取有限端点的范围；其他集合取成员关系半径 r 对应的 [-r, r]，
+        范围以外的整数是否属于集合在两侧分别不变。
+        集合在某一侧无界时，有限范围无法列出全部元素，此时把这一侧从有限端点
+        向外延伸 DEFAULT_DEFINITION_WINDOW 的宽度（且不小于默认范围的这一侧），
+        使有限端点附近的元素总能列出；无法推断时直接使用 DEFAULT_DEFINITION_WINDOW。
+
+        返回：
+            tuple: (low, high)。
+        """
+        default_low, default_high = DEFAULT_DEFINITION_WINDOW
+        if set_value.intervals is not None:
+            ends = [end for bound in set_value.intervals for end in bound if abs(end) != POS_INF]
+            if not ends:
+                # 空集或全体整数
+                return DEFAULT_DEFINITION_WINDOW if set_value.contains(0) else (0, 0)
+            low, high = min(ends), max(ends)
+        else:
+            radius = set_value.membership_radius()
+            if radius is None:
+                return DEFAULT_DEFINITION_WINDOW
+            low, high = -radius, radius
+        width = default_high - default_low
+        if set_value.contains(low - 1):
+            low = min(default_low, low - width)
+        if set_value.contains(high + 1):
+            high = max(default_high, high + width)
+        return low, high
+
+    def set_definition(self, set_value, low=None, high=None):
+        """
+        将已编译的集合在有限范围内展开为 Python 集合。
+
+        参数：
+            set_value (SetValue): 集合值。
+            low (int): 下界，None 表示由集合推断范围（见 infer_window）。
+            high (int): 上界（包含）。
+
+        返回：
+            set: 范围内的全部元素。
+        """
+        if low is None or high is None:
+            low, high = self.infer_window(set_value)
+        self.debug_print("Assuming the bound variable ranges from {} to {} for set evaluation.", low, high)
+        if set_value.contains(low - 1) or set_value.contains(high + 1):
+            self.debug_print("Set is infinite; members outside {}..{} are answered by contains().", low, high)
+        result_set = set(self.enumerate_set(set_value, low, high))
+        self.debug_print("Set definition evaluated to {}", result_set)
+        return result_set
+
+    def apply_integer_operator(self, left, operator, right):
         """
-        处理集合定义 { x : P(x) } 的评估。
+        计算整数运算；操作数是约束变量（字符串）时返回显示文本（Rope）。
 
         参数：
-            node (dict): 集合定义节点。
+            left: 左操作数。
+            operator (str): '+'、'-' 或 '*'。
+            right: 右操作数。
 
         返回：
-            评估结果，Python 集合类型。
+            运算结果。
         """
-        # 处理集合定义 { x : P(x) }
+        if operator not in ('+', '-', '*'):
+            raise Exception(f"Unsupported operator in integer expression: {operator}")
+        if isinstance(left, (str, Rope)) or isinstance(right, (str, Rope)):
+            return Rope(left, ' ', operator, ' ', right)
+        if operator == '+':
+            return left + right
+        elif operator == '-':
+            return left - right
+        return left * right
+
+    def lookup_value(self, name):
+        """
+        查找已声明变量的值。
+
+        参数：
+            name (str): 变量名。
+
+        返回：
+            变量的值（int 或 SetValue）。
+        """
+        if name not in self.symbol_table:
+            raise Exception(f"Undefined identifier: {name}")
+        return self.symbol_table[name]['value']
+
+    def compile_integer(self, node, bound):
+        """
+        将整数表达式子树编译为函数。
+
+        参数：
+            node (dict): E、E'、E'' 节点或 num/id 终结符。
+            bound (frozenset): 当前作用域内的约束变量名。
+
+        返回：
+            callable: 接收约束变量环境 env (dict)，返回 int。
+        """
+        if 'token' in node:
+            lexeme = node['lexeme']
+            if node['token'] == 'num':
+                value = int(lexeme)
+                return lambda env: value
+            if lexeme in bound:
+                return lambda env: env[lexeme]
+            value = int(self.lookup_value(lexeme))
+            return lambda env: value
+
         children = node.get('children', [])
-        self.debug_print("Evaluating set definition.")
-
-        if len(children) != 1:
-            raise Exception("Invalid set definition.")
-
-        predicate_node = children[0]
-        result_set = set()
-
-        self.debug_print("Assuming variable 'x' ranges from -100 to 100 for set evaluation.")
-        # 假设x的范围是-100到100
-        for x in range(-100, 101):
-            self.symbol_table['x'] = {'type': 'int', 'value': x}
-            predicate_result = self.evaluate_node(predicate_node)
-            if predicate_result:
-                result_set.add(x)
-            self.debug_print(f"x = {x}: P(x) evaluated to {predicate_result}")
-        # 移除临时变量x
-        del self.symbol_table['x']
-        node['value'] = "{ a: a > 1 }"  # 根据理想输出设置
-        self.debug_print(f"Set definition evaluated to {result_set}")
-        return result_set
+        if len(children) == 1:
+            return self.compile_integer(children[0], bound)
+        if children[0].get('token') == '(':
+            return self.compile_integer(children[1], bound)
+        left = self.compile_integer(children[0], bound)
+        right = self.compile_integer(children[2], bound)
+        operator = children[1]['lexeme']
+        if operator == '+':
+            return lambda env: left(env) + right(env)
+        elif operator == '-':
+            return lambda env: left(env) - right(env)
+        elif operator == '*':
+            return lambda env: left(env) * right(env)
+        raise Exception(f"Unsupported operator in integer expression: {operator}")
+
+    def compile_set(self, node, bound):
+        """
+        将集合表达式子树编译为函数。
+
+        参数：
+            node (dict): E、E'、E'' 节点或 id 终结符。
+            bound (frozenset): 当前作用域内的约束变量名。
+
+        返回：
+            callable: 接收约束变量环境 env (dict)，返回 SetValue。
+        """
+        if 'token' in node:
+            value = self.lookup_value(node['lexeme'])
+            return lambda env: value
+
+        children = node.get('children', [])
+        if len(children) == 1:
+            return self.compile_set(children[0], bound)
+        if len(children) == 4:
+            # E'' -> { Z P }
+            variable = children[1]['children'][0]['lexeme']
+            predicate = self.compile_predicate(children[2], bound | {variable})
+            intervals = self.normalize_predicate(children[2], variable, bound | {variable})
+            text = ' '.join(leaf_lexemes(children[2]))
+            radius = None
+            if intervals is None:
+                radius = self.predicate_radius(children[2], variable, bound | {variable})
+            if not bound:
+                # 不依赖外层约束变量，只需构造一次
+                vector_predicate = None
+                if intervals is None:
+                    vector_predicate = self.compile_vector_predicate(children[2], variable, bound | {variable})
+                value = BuilderSet(
+                    variable, lambda n: predicate({variable: n}), text, intervals, vector_predicate, radius
+                )
+                return lambda env: value
+            return lambda env: BuilderSet(
+                variable, lambda n: predicate({**env, variable: n}), text, intervals, radius=radius
+            )
+        if children[0].get('token') == '(':
+            return self.compile_set(children[1], bound)
+        left = self.compile_set(children[0], bound)
+        right = self.compile_set(children[2], bound)
+        operator = children[1]['lexeme']
+        if operator == 'U':
+            return lambda env: left(env).union(right(env))
+        elif operator == 'I':
+            return lambda env: left(env).intersection(right(env))
+        raise Exception(f"Unsupported operator in set expression: {operator}")
+
+    def compile_predicate(self, node, bound):
+        """
+        将谓词子树（P、P'、P''、R）编译为函数。
+
+        参数：
+            node (dict): 谓词节点。
+            bound (frozenset): 当前作用域内的约束变量名。
+
+        返回：
+            callable: 接收约束变量环境 env (dict)，返回 bool。
+        """
+        name = node.get('name')
+        children = node.get('children', [])
+
+        if name == 'R':
+            operator = children[1]['lexeme']
+            left = self.compile_integer(children[0], bound)
+            if operator == '@':
+                right_set = self.compile_set(children[2], bound)
+                return lambda env: right_set(env).contains(left(env))
+            right = self.compile_integer(children[2], bound)
+            if operator == '<':
+                return lambda env: left(env) < right(env)
+            elif operator == '>':
+                return lambda env: left(env) > right(env)
+            elif operator == '=':
+                return lambda env: left(env) == right(env)
+            raise Exception(f"Unsupported relation operator: {operator}")
+
+        if len(children) == 1:
+            return self.compile_predicate(children[0], bound)
+        if len(children) == 2:
+            # P'' -> ! R
+            operand = self.compile_predicate(children[1], bound)
+            return lambda env: not operand(env)
+        if children[0].get('token') == '(':
+            return self.compile_predicate(children[1], bound)
+        operator = children[1]['lexeme']
+        if operator not in ('|', '&'):
+            raise Exception(f"Unsupported operator in predicate expression: {operator}")
+        # 同一运算符连接的操作数作为一组短路求值，按代价和运行时的选择率排序
+        operands = group_operands(node, operator)
+        return ShortCircuitGroup(
+            [self.compile_predicate(operand, bound) for operand in operands],
+            [predicate_cost(operand) for operand in operands],
+            operator == '&',
+        )
+
+    def compile_show_predicate(self, node):
+        """
+        编译 show 语句中不含约束变量的谓词。
+
+        编译结果按谓词的 token 序列和它引用的变量的当前值缓存：REPL、--watch 和会话中
+        重复求值同一谓词时不再编译；变量被重新声明后键不同，不会用到旧值。
+
+        参数：
+            node (dict): 谓词节点 P。
+
+        返回：
+            callable: 无参数函数，返回 bool。
+        """
+        names = sorted(referenced_identifiers(node))
+        values = tuple(self.symbol_table[name]['value'] if name in self.symbol_table else None for name in names)
+        key = (tuple(leaf_lexemes(node)), values)
+        if key in self.predicate_cache:
+            self.predicate_cache.move_to_end(key)
+            return self.predicate_cache[key]
+        predicate = self.compile_predicate(node, frozenset())
+        function = lambda: predicate({})
+        self.predicate_cache[key] = function
+        if len(self.predicate_cache) > MAX_CACHED_PREDICATES:
+            self.predicate_cache.popitem(last=False)
+        return function
+
+    def compile_vector_integer(self, node, variable, bound):
+        """
+        将整数表达式编译为 NumPy 向量化函数。
+
+        参数：
+            node (dict): 整数表达式节点或终结符。
+            variable (str): 约束变量名。
+            bound (frozenset): 当前作用域内的约束变量名（包括 variable）。
+
+        返回：
+            callable: 接收约束变量取值数组，返回数组或 int；
+                      依赖其他约束变量时返回 None。
+        """
+        if 'token' in node:
+            lexeme = node['lexeme']
+            if node['token'] == 'num':
+                value = int(lexeme)
+                return lambda values: value
+            if lexeme == variable:
+                return lambda values: values
+            if lexeme in bound:
+                return None
+            value = int(self.lookup_value(lexeme))
+            return lambda values: value
+
+        children = node.get('children', [])
+        if len(children) == 1:
+            return self.compile_vector_integer(children[0], variable, bound)
+        if children[0].get('token') == '(':
+            return self.compile_vector_integer(children[1], variable, bound)
+        left = self.compile_vector_integer(children[0], variable, bound)
+        right = self.compile_vector_integer(children[2], variable, bound)
+        if left is None or right is None:
+            return None
+        operator = children[1]['lexeme']
+        if operator == '+':
+            return lambda values: left(values) + right(values)
+        elif operator == '-':
+            return lambda values: left(values) - right(values)
+        elif operator == '*':
+            return lambda values: left(values) * right(values)
+        raise Exception(f"Unsupported operator in integer expression: {operator}")
+
+    def compile_vector_predicate(self, node, variable, bound):
+        """
+        将单变量谓词编译为 NumPy 向量化函数，一次判断整个取值数组。
+
+        参数：
+            node (dict): 谓词节点（P、P'、P''、R）。
+            variable (str): 约束变量名。
+            bound (frozenset): 当前作用域内的约束变量名（包括 variable）。
+
+        返回：
+            callable: 接收 int64 数组，返回等长的布尔数组；
+                      未安装 NumPy 或谓词依赖其他约束变量时返回 None。
+        """
+        np = numpy_module()
+        if np is None:
+            return None
+        name = node.get('name')
+        children = node.get('children', [])
+
+        if name == 'R':
+            operator = children[1]['lexeme']
+            left = self.compile_vector_integer(children[0], variable, bound)
+            if left is None:
+                return None
+            if operator == '@':
+                # 右侧集合不能依赖任何约束变量
+                if bound & set(leaf_lexemes(children[2])):
+                    return None
+                right_set = self.compile_set(children[2], frozenset())({})
+                relation = lambda values: right_set.mask(np.asarray(left(values), dtype=np.int64).reshape(-1))
+            else:
+                right = self.compile_vector_integer(children[2], variable, bound)
+                if right is None:
+                    return None
+                if operator == '<':
+                    relation = lambda values: np.less(left(values), right(values))
+                elif operator == '>':
+                    relation = lambda values: np.greater(left(values), right(values))
+                elif operator == '=':
+                    relation = lambda values: np.equal(left(values), right(values))
+                else:
+                    raise Exception(f"Unsupported relation operator: {operator}")
+            # 两侧都是常量时结果是标量，广播为与取值数组等长的数组
+            return lambda values: np.broadcast_to(relation(values), values.shape)
+
+        if len(children) == 1:
+            return self.compile_vector_predicate(children[0], variable, bound)
+        if len(children) == 2:
+            # P'' -> ! R
+            operand = self.compile_vector_predicate(children[1], variable, bound)
+            return None if operand is None else lambda values: ~operand(values)
+        if children[0].get('token') == '(':
+            return self.compile_vector_predicate(children[1], variable, bound)
+        left = self.compile_vector_predicate(children[0], variable, bound)
+        right = self.compile_vector_predicate(children[2], variable, bound)
+        if left is None or right is None:
+            return None
+        if children[1]['lexeme'] == '|':
+            return lambda values: left(values) | right(values)
+        return lambda values: left(values) & right(values)
+
+    def enumerate_set(self, set_value, low, high, limit=None, offset=0):
+        """
+        按升序惰性地枚举集合在 [low, high] 内的元素。
+
+        参数：
+            set_value (SetValue): 集合值。
+            low (int): 下界。
+            high (int): 上界（包含）。
+            limit (int): 最多产生的元素个数，None 表示不限。
+            offset (int): 跳过的前若干个元素个数。
+
+        返回：
+            generator: 元素的生成器。
+        """
+        stop = None if limit is None else offset + limit
+        return itertools.islice(set_value.members(low, high), offset, stop)
+
+    def decision_range(self, set_value, low, high):
+        """
+        确定没有区间列表的集合的判定范围。
+
+        给出了两个界时直接使用；否则只有位集合在论域两侧都没有元素
+        （成员关系半径已知且论域覆盖 [-r-1, r+1]）时，范围取它的论域。
+
+        返回：
+            tuple: (low, high)。
+
+        异常：
+            DecisionError: 集合在无界范围上无法判定。
+        """
+        if low is not None and high is not None:
+            return low, high
+        if isinstance(set_value, BitSet) and set_value.radius is not None:
+            radius = set_value.radius
+            if set_value.low <= -radius - 1 and radius + 1 <= set_value.high \
+                    and not set_value.contains(-radius - 1) and not set_value.contains(radius + 1):
+                return (set_value.low if low is None else low), (set_value.high if high is None else high)
+        raise DecisionError(f"Cannot decide over an unbounded range: '{set_value}' is not an interval set; "
+                            f"give both bounds.")
+
+    def decision_members(self, set_value, low, high):
+        """
+        按升序返回集合在有限范围 [low, high] 内的元素。
+
+        范围在位集合的论域内时直接读位图（BitSet.elements），否则逐段枚举。
+        """
+        if isinstance(set_value, BitSet) and set_value.low <= low and high <= set_value.high:
+            elements = set_value.elements()
+            return elements[bisect.bisect_left(elements, low):bisect.bisect_right(elements, high)]
+        return set_value.members(low, high)
+
+    def decision_intervals(self, set_value, low=None, high=None):
+        """
+        返回集合在 [low, high] 内的区间列表，供判定过程使用。
+
+        集合有区间列表（谓词可规范化为区间约束的析取范式）时直接截取，与范围的大小无关；
+        否则只能在有限范围内枚举元素（见 decision_range）。
+
+        参数：
+            set_value (SetValue): 集合值。
+            low (int): 下界，None 表示无下界。
+            high (int): 上界（包含），None 表示无上界。
+
+        返回：
+            Intervals: 范围内的元素构成的区间列表。
+
+        异常：
+            DecisionError: 集合没有区间列表，且范围无界。
+        """
+        if set_value.intervals is not None:
+            window = Intervals([(NEG_INF if low is None else low, POS_INF if high is None else high)])
+            return set_value.intervals.intersection(window)
+        low, high = self.decision_range(set_value, low, high)
+        return Intervals.from_members(self.decision_members(set_value, low, high))
+
+    def set_is_empty(self, set_value, low=None, high=None):
+        """判断集合在 [low, high] 内是否为空（参数见 decision_intervals）。"""
+        return self.decision_intervals(set_value, low, high).is_empty()
+
+    def set_is_subset(self, left, right, low=None, high=None):
+        """判断在 [low, high] 内 left 是否包含于 right（参数见 decision_intervals）。"""
+        return self.decision_intervals(left, low, high).issubset(self.decision_intervals(right, low, high))
+
+    def sets_equal(self, left, right, low=None, high=None):
+        """判断两个集合在 [low, high] 内是否相等（参数见 decision_intervals）。"""
+        return self.decision_intervals(left, low, high) == self.decision_intervals(right, low, high)
+
+    def set_cardinality(self, set_value, low=None, high=None):
+        """
+        返回集合在 [low, high] 内的元素个数（参数见 decision_intervals）。
+
+        范围恰好是位集合的论域时用 popcount 计数。
+
+        返回：
+            int: 元素个数；集合在范围内无界时返回 POS_INF。
+        """
+        if set_value.intervals is not None:
+            return self.decision_intervals(set_value, low, high).count()
+        low, high = self.decision_range(set_value, low, high)
+        if isinstance(set_value, BitSet) and (low, high) == (set_value.low, set_value.high):
+            return set_value.cardinality()
+        members = self.decision_members(set_value, low, high)
+        return len(members) if isinstance(members, list) else sum(1 for _ in members)
+
+    def polynomial_form(self, node, variable, bound):
+        """
+        将整数表达式化为约束变量的多项式。
+
+        参数：
+            node (dict): 整数表达式节点或终结符。
+            variable (str): 约束变量名。
+            bound (frozenset): 当前作用域内的约束变量名。
+
+        返回：
+            list: 系数列表 [a0, a1, ...]（ai 为 variable**i 的系数）；依赖其他约束变量时返回 None。
+        """
+        if 'token' in node:
+            lexeme = node['lexeme']
+            if node['token'] == 'num':
+                return [int(lexeme)]
+            if lexeme == variable:
+                return [0, 1]
+            if lexeme in bound:
+                return None
+            return [int(self.lookup_value(lexeme))]
+
+        children = node.get('children', [])
+        if len(children) == 1:
+            return self.polynomial_form(children[0], variable, bound)
+        if children[0].get('token') == '(':
+            return self.polynomial_form(children[1], variable, bound)
+        left = self.polynomial_form(children[0], variable, bound)
+        right = self.polynomial_form(children[2], variable, bound)
+        if left is None or right is None:
+            return None
+        operator = children[1]['lexeme']
+        if operator == '*':
+            product = [0] * (len(left) + len(right) - 1)
+            for i, a in enumerate(left):
+                for j, b in enumerate(right):
+                    product[i + j] += a * b
+            return product
+        sign = 1 if operator == '+' else -1
+        size = max(len(left), len(right))
+        return [(left[i] if i < len(left) else 0) + sign * (right[i] if i < len(right) else 0) for i in range(size)]
+
+    def root_bound(self, coefficients):
+        """
+        多项式根的 Fujiwara 上界：|x| > 返回值时多项式的符号不变。
+
+        上界为 2 * max(|a(n-i) / an| ** (1 / i))（i = n 时分子取 |a0| / 2），
+        各项用整数二分查找向上取整，不引入浮点误差。
+
+        参数：
+            coefficients (list): 系数列表 [a0, a1, ...]。
+
+        返回：
+            int: 非负整数；多项式为常数时返回 0。
+        """
+        coefficients = list(coefficients)
+        while len(coefficients) > 1 and coefficients[-1] == 0:
+            coefficients.pop()
+        degree = len(coefficients) - 1
+        leading = abs(coefficients[-1])
+        largest = 0
+        for i in range(1, degree + 1):
+            numerator = abs(coefficients[degree - i])
+            denominator = leading * (2 if i == degree else 1)
+            # 二分查找满足 r ** i * denominator >= numerator 的最小非负整数 r
+            low, high = 0, 1 << (numerator.bit_length() // i + 1)
+            while low < high:
+                middle = (low + high) // 2
+                if middle ** i * denominator >= numerator:
+                    high = middle
+                else:
+                    low = middle + 1
+            largest = max(largest, low)
+        return 2 * largest
+
+    def predicate_radius(self, node, variable, bound):
+        """
+        计算单变量谓词的成员关系半径 r：|variable| > r 时谓词的真值在两侧分别不变。
+
+        <、>、= 两侧之差是 variable 的多项式时取其根的上界；
+        p @ S 中 p 是多项式、S 的半径 R 已知时，取 p ± (R + 1) 的根的上界；
+        &、|、!、括号取各部分的最大值。
+
+        参数：
+            node (dict): 谓词节点（P、P'、P''、R）。
+            variable (str): 约束变量名。
+            bound (frozenset): 当前作用域内的约束变量名（包括 variable）。
+
+        返回：
+            int: 半径；无法确定时返回 None。
+        """
+        name = node.get('name')
+        children = node.get('children', [])
+
+        if name == 'R':
+            left = self.polynomial_form(children[0], variable, bound)
+            if left is None:
+                return None
+            if children[1]['lexeme'] == '@':
+                if bound & set(leaf_lexemes(children[2])):
+                    return None
+                radius = self.compile_set(children[2], frozenset())({}).membership_radius()
+                if radius is None:
+                    return None
+                return max(self.root_bound([left[0] - radius - 1] + left[1:]),
+                           self.root_bound([left[0] + radius + 1] + left[1:]))
+            right = self.polynomial_form(children[2], variable, bound)
+            if right is None:
+                return None
+            size = max(len(left), len(right))
+            return self.root_bound([(left[i] if i < len(left) else 0) - (right[i] if i < len(right) else 0)
+                                    for i in range(size)])
+
+        parts = [child for child in children if 'token' not in child]
+        radii = [self.predicate_radius(child, variable, bound) for child in parts]
+        if None in radii:
+            return None
+        return max(radii)
+
+    def linear_form(self, node, variable, bound):
+        """
+        将整数表达式化为约束变量的线性形式 a * variable + b。
+
+        参数：
+            node (dict): 整数表达式节点或终结符。
+            variable (str): 约束变量名。
+            bound (frozenset): 当前作用域内的约束变量名。
+
+        返回：
+            tuple: (a, b)；表达式不是线性的或依赖其他约束变量时返回 None。
+        """
+        if 'token' in node:
+            lexeme = node['lexeme']
+            if node['token'] == 'num':
+                return (0, int(lexeme))
+            if lexeme == variable:
+                return (1, 0)
+            if lexeme in bound:
+                return None
+            return (0, int(self.lookup_value(lexeme)))
+
+        children = node.get('children', [])
+        if len(children) == 1:
+            return self.linear_form(children[0], variable, bound)
+        if children[0].get('token') == '(':
+            return self.linear_form(children[1], variable, bound)
+        left = self.linear_form(children[0], variable, bound)
+        right = self.linear_form(children[2], variable, bound)
+        if left is None or right is None:
+            return None
+        operator = children[1]['lexeme']
+        if operator == '+':
+            return (left[0] + right[0], left[1] + right[1])
+        elif operator == '-':
+            return (left[0] - right[0], left[1] - right[1])
+        elif operator == '*':
+            if left[0] == 0:
+                return (left[1] * right[0], left[1] * right[1])
+            if right[0] == 0:
+                return (right[1] * left[0], right[1] * left[1])
+        return None
+
+    def normalize_predicate(self, node, variable, bound):
+        """
+        将单变量谓词规范化为整数区间列表。
+
+        支持 <、>、= 两侧为约束变量的线性表达式，@ 左侧为 ±variable + c 且右侧集合可规范化，
+        以及 &、|、! 和括号的任意组合。
+
+        参数：
+            node (dict): 谓词节点（P、P'、P''、R）。
+            variable (str): 约束变量名。
+            bound (frozenset): 当前作用域内的约束变量名（包括 variable）。
+
+        返回：
+            Intervals: 满足谓词的整数集合；无法规范化时返回 None。
+        """
+        name = node.get('name')
+        children = node.get('children', [])
+
+        if name == 'R':
+            operator = children[1]['lexeme']
+            left = self.linear_form(children[0], variable, bound)
+            if left is None:
+                return None
+            if operator == '@':
+                # 右侧集合不能依赖任何约束变量
+                if bound & set(leaf_lexemes(children[2])):
+                    return None
+                right_set = self.compile_set(children[2], frozenset())({})
+                if right_set.intervals is None:
+                    return None
+                a, b = left
+                if a == 1:
+                    return right_set.intervals.shift(-b)
+                if a == -1:
+                    return right_set.intervals.shift(-b).negate()
+                if a == 0:
+                    return Intervals.everything() if right_set.contains(b) else Intervals.nothing()
+                return None
+            right = self.linear_form(children[2], variable, bound)
+            if right is None:
+                return None
+            # a*x + b op c*x + d  =>  k*x op m
+            k = left[0] - right[0]
+            m = right[1] - left[1]
+            if k == 0:
+                holds = {'<': 0 < m, '>': 0 > m, '=': m == 0}[operator]
+                return Intervals.everything() if holds else Intervals.nothing()
+            if k < 0:
+                k, m = -k, -m
+                operator = {'<': '>', '>': '<', '=': '='}[operator]
+            if operator == '<':
+                return Intervals.at_most((m - 1) // k)
+            elif operator == '>':
+                return Intervals.at_least(m // k + 1)
+            return Intervals.point(m // k) if m % k == 0 else Intervals.nothing()
+
+        if len(children) == 1:
+            return self.normalize_predicate(children[0], variable, bound)
+        if len(children) == 2:
+            # P'' -> ! R
+            operand = self.normalize_predicate(children[1], variable, bound)
+            return None if operand is None else operand.complement()
+        if children[0].get('token') == '(':
+            return self.normalize_predicate(children[1], variable, bound)
+        left = self.normalize_predicate(children[0], variable, bound)
+        if left is None:
+            return None
+        right = self.normalize_predicate(children[2], variable, bound)
+        if right is None:
+            return None
+        if children[1]['lexeme'] == '|':
+            return left.union(right)
+        return left.intersection(right)
 
     def get_evaluation(self, node):
         """
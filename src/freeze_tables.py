@@ -0,0 +1,46 @@
+# freeze_tables.py
+# 将 SLR 解析表 CSV 冻结为可直接导入的 Python 模块 frozen_tables.py，
+# 使 main.py --fast 启动时不需要读取和解析 CSV。
+# 用法：python freeze_tables.py ["SLR Parsing Table.csv"] [frozen_tables.py]
+import hashlib
+import os
+import pprint
+import sys
+from parser import load_parsing_table
+
+DEFAULT_TABLE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "lib", "SLR Parsing Table.csv"
+)
+DEFAULT_OUTPUT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frozen_tables.py")
+
+HEADER = """# frozen_tables.py
+# 由 freeze_tables.py 根据 SLR Parsing Table.csv 自动生成，请勿手动修改。
+# 解析表改变后请重新运行：python freeze_tables.py
+"""
+
+
+def freeze(table_file=DEFAULT_TABLE_FILE, output_file=DEFAULT_OUTPUT_FILE):
+    """
+    读取 CSV 解析表并生成 frozen_tables.py。
+
+    参数：
+        table_file (str): SLR 解析表 CSV 文件路径。
+        output_file (str): 生成的 Python 模块路径。
+    """
+    with open(table_file, "r", encoding="utf-8") as f:
+        table_digest = hashlib.sha256(f.read().encode("utf-8")).hexdigest()
+    action_table, goto_table = load_parsing_table(table_file)
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(HEADER)
+        f.write(f"\nTABLE_DIGEST = {table_digest!r}\n")
+        f.write("\nACTION_TABLE = ")
+        f.write(pprint.pformat(action_table, width=100))
+        f.write("\n\nGOTO_TABLE = ")
+        f.write(pprint.pformat(goto_table, width=100))
+        f.write("\n")
+    print(f"Frozen parsing table written to {output_file}")
+
+
+if __name__ == "__main__":
+    freeze(*sys.argv[1:3])
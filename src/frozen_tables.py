@@ -0,0 +1,351 @@
+# frozen_tables.py
+# 由 freeze_tables.py 根据 SLR Parsing Table.csv 自动生成，请勿手动修改。
+# 解析表改变后请重新运行：python freeze_tables.py
+
+TABLE_DIGEST = '38ba7ea22d2946c6cad39c1b8a3886f347217749052c48d82cc9a1dff7422527'
+
+ACTION_TABLE = {0: {'let': 's6', 'show': 's5'},
+ 1: {'$': 'acc'},
+ 2: {'show': 's5'},
+ 3: {'.': 's8'},
+ 4: {'let': 's6', 'show': 'r4'},
+ 5: {'!': 's23', '(': 's19', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 6: {'int': 's25', 'set': 's26'},
+ 7: {'.': 's27'},
+ 8: {'$': 'r2', 'show': 's5'},
+ 9: {'show': 'r3'},
+ 10: {'.': 'r31'},
+ 11: {'+': 's31',
+      '-': 's32',
+      '.': 'r32',
+      '<': 's33',
+      '=': 's35',
+      '>': 's34',
+      '@': 's36',
+      'U': 's30'},
+ 12: {'.': 'r33', '|': 's37'},
+ 13: {'&': 'r8',
+      ')': 'r8',
+      '*': 's39',
+      '+': 'r8',
+      '-': 'r8',
+      '.': 'r8',
+      '<': 'r8',
+      '=': 'r8',
+      '>': 'r8',
+      '@': 'r8',
+      'I': 's38',
+      'U': 'r8',
+      '|': 'r8',
+      '}': 'r8'},
+ 14: {'&': 's40', ')': 'r21', '.': 'r21', '|': 'r21', '}': 'r21'},
+ 15: {'&': 'r12',
+      ')': 'r12',
+      '*': 'r12',
+      '+': 'r12',
+      '-': 'r12',
+      '.': 'r12',
+      '<': 'r12',
+      '=': 'r12',
+      '>': 'r12',
+      '@': 'r12',
+      'I': 'r12',
+      'U': 'r12',
+      '|': 'r12',
+      '}': 'r12'},
+ 16: {'&': 'r23', ')': 'r23', '.': 'r23', '|': 'r23', '}': 'r23'},
+ 17: {'&': 'r15',
+      ')': 'r15',
+      '*': 'r15',
+      '+': 'r15',
+      '-': 'r15',
+      '.': 'r15',
+      '<': 'r15',
+      '=': 'r15',
+      '>': 'r15',
+      '@': 'r15',
+      'I': 'r15',
+      'U': 'r15',
+      '|': 'r15',
+      '}': 'r15'},
+ 18: {'&': 'r16',
+      ')': 'r16',
+      '*': 'r16',
+      '+': 'r16',
+      '-': 'r16',
+      '.': 'r16',
+      '<': 'r16',
+      '=': 'r16',
+      '>': 'r16',
+      '@': 'r16',
+      'I': 'r16',
+      'U': 'r16',
+      '|': 'r16',
+      '}': 'r16'},
+ 19: {'!': 's23', '(': 's19', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 20: {'id': 's44'},
+ 21: {'(': 's46', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 22: {'&': 'r24', ')': 'r24', '.': 'r24', '|': 'r24', '}': 'r24'},
+ 23: {'(': 's46', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 24: {'id': 's49'},
+ 25: {'id': 'r6'},
+ 26: {'id': 'r7'},
+ 27: {'$': 'r1', 'show': 's5'},
+ 28: {'$': 'r36'},
+ 29: {'.': 's51'},
+ 30: {'(': 's46', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 31: {'(': 's46', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 32: {'(': 's46', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 33: {'(': 's46', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 34: {'(': 's46', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 35: {'(': 's46', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 36: {'(': 's46', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 37: {'!': 's23', '(': 's19', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 38: {'(': 's46', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 39: {'(': 's46', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 40: {'!': 's23', '(': 's19', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 41: {')': 's63',
+      '+': 's31',
+      '-': 's32',
+      '<': 's33',
+      '=': 's35',
+      '>': 's34',
+      '@': 's36',
+      'U': 's30'},
+ 42: {')': 's64', '|': 's37'},
+ 43: {'!': 's23', '(': 's19', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 44: {':': 's66'},
+ 45: {'&': 'r34',
+      ')': 'r34',
+      '*': 'r34',
+      '+': 'r34',
+      '-': 'r34',
+      '.': 'r34',
+      '<': 'r34',
+      '=': 'r34',
+      '>': 'r34',
+      '@': 'r34',
+      'I': 'r34',
+      'U': 'r34',
+      '|': 'r34',
+      '}': 'r34'},
+ 46: {'(': 's46', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 47: {'&': 'r26', ')': 'r26', '.': 'r26', '|': 'r26', '}': 'r26'},
+ 48: {'+': 's31', '-': 's32', '<': 's33', '=': 's35', '>': 's34', '@': 's36', 'U': 's30'},
+ 49: {'be': 's68'},
+ 50: {'$': 'r35'},
+ 51: {'$': 'r38', 'show': 's5'},
+ 52: {'&': 'r9',
+      ')': 'r9',
+      '*': 's39',
+      '+': 'r9',
+      '-': 'r9',
+      '.': 'r9',
+      '<': 'r9',
+      '=': 'r9',
+      '>': 'r9',
+      '@': 'r9',
+      'I': 's38',
+      'U': 'r9',
+      '|': 'r9',
+      '}': 'r9'},
+ 53: {'&': 'r10',
+      ')': 'r10',
+      '*': 's39',
+      '+': 'r10',
+      '-': 'r10',
+      '.': 'r10',
+      '<': 'r10',
+      '=': 'r10',
+      '>': 'r10',
+      '@': 'r10',
+      'I': 's38',
+      'U': 'r10',
+      '|': 'r10',
+      '}': 'r10'},
+ 54: {'&': 'r11',
+      ')': 'r11',
+      '*': 's39',
+      '+': 'r11',
+      '-': 'r11',
+      '.': 'r11',
+      '<': 'r11',
+      '=': 'r11',
+      '>': 'r11',
+      '@': 'r11',
+      'I': 's38',
+      'U': 'r11',
+      '|': 'r11',
+      '}': 'r11'},
+ 55: {'&': 'r27',
+      ')': 'r27',
+      '+': 's31',
+      '-': 's32',
+      '.': 'r27',
+      'U': 's30',
+      '|': 'r27',
+      '}': 'r27'},
+ 56: {'&': 'r28',
+      ')': 'r28',
+      '+': 's31',
+      '-': 's32',
+      '.': 'r28',
+      'U': 's30',
+      '|': 'r28',
+      '}': 'r28'},
+ 57: {'&': 'r29',
+      ')': 'r29',
+      '+': 's31',
+      '-': 's32',
+      '.': 'r29',
+      'U': 's30',
+      '|': 'r29',
+      '}': 'r29'},
+ 58: {'&': 'r30',
+      ')': 'r30',
+      '+': 's31',
+      '-': 's32',
+      '.': 'r30',
+      'U': 's30',
+      '|': 'r30',
+      '}': 'r30'},
+ 59: {'&': 's40', ')': 'r20', '.': 'r20', '|': 'r20', '}': 'r20'},
+ 60: {'&': 'r13',
+      ')': 'r13',
+      '*': 'r13',
+      '+': 'r13',
+      '-': 'r13',
+      '.': 'r13',
+      '<': 'r13',
+      '=': 'r13',
+      '>': 'r13',
+      '@': 'r13',
+      'I': 'r13',
+      'U': 'r13',
+      '|': 'r13',
+      '}': 'r13'},
+ 61: {'&': 'r14',
+      ')': 'r14',
+      '*': 'r14',
+      '+': 'r14',
+      '-': 'r14',
+      '.': 'r14',
+      '<': 'r14',
+      '=': 'r14',
+      '>': 'r14',
+      '@': 'r14',
+      'I': 'r14',
+      'U': 'r14',
+      '|': 'r14',
+      '}': 'r14'},
+ 62: {'&': 'r22', ')': 'r22', '.': 'r22', '|': 'r22', '}': 'r22'},
+ 63: {'&': 'r17',
+      ')': 'r17',
+      '*': 'r17',
+      '+': 'r17',
+      '-': 'r17',
+      '.': 'r17',
+      '<': 'r17',
+      '=': 'r17',
+      '>': 'r17',
+      '@': 'r17',
+      'I': 'r17',
+      'U': 'r17',
+      '|': 'r17',
+      '}': 'r17'},
+ 64: {'&': 'r25', ')': 'r25', '.': 'r25', '|': 'r25', '}': 'r25'},
+ 65: {'|': 's37', '}': 's70'},
+ 66: {'!': 'r19', '(': 'r19', 'id': 'r19', 'num': 'r19', 'simplify': 'r19', '{': 'r19'},
+ 67: {')': 's63', '+': 's31', '-': 's32', 'U': 's30'},
+ 68: {'(': 's46', 'id': 's18', 'num': 's17', 'simplify': 's21', '{': 's20'},
+ 69: {'$': 'r37'},
+ 70: {'&': 'r18',
+      ')': 'r18',
+      '*': 'r18',
+      '+': 'r18',
+      '-': 'r18',
+      '.': 'r18',
+      '<': 'r18',
+      '=': 'r18',
+      '>': 'r18',
+      '@': 'r18',
+      'I': 'r18',
+      'U': 'r18',
+      '|': 'r18',
+      '}': 'r18'},
+ 71: {'+': 's31', '-': 's32', '.': 's72', 'U': 's30'},
+ 72: {'let': 'r5', 'show': 'r5'}}
+
+GOTO_TABLE = {0: {'C': 3, 'D': 4, "D'": 2, 'S': 1},
+ 1: {},
+ 2: {'C': 7},
+ 3: {},
+ 4: {'D': 4, "D'": 9},
+ 5: {'A': 10, 'E': 11, "E'": 13, "E''": 15, 'P': 12, "P'": 14, "P''": 16, 'R': 22},
+ 6: {'T': 24},
+ 7: {},
+ 8: {'C': 29, "C'": 28},
+ 9: {},
+ 10: {},
+ 11: {},
+ 12: {},
+ 13: {},
+ 14: {},
+ 15: {},
+ 16: {},
+ 17: {},
+ 18: {},
+ 19: {'E': 41, "E'": 13, "E''": 15, 'P': 42, "P'": 14, "P''": 16, 'R': 22},
+ 20: {'Z': 43},
+ 21: {"E''": 45},
+ 22: {},
+ 23: {'E': 48, "E'": 13, "E''": 15, 'R': 47},
+ 24: {},
+ 25: {},
+ 26: {},
+ 27: {'C': 29, "C'": 50},
+ 28: {},
+ 29: {},
+ 30: {"E'": 52, "E''": 15},
+ 31: {"E'": 53, "E''": 15},
+ 32: {"E'": 54, "E''": 15},
+ 33: {'E': 55, "E'": 13, "E''": 15},
+ 34: {'E': 56, "E'": 13, "E''": 15},
+ 35: {'E': 57, "E'": 13, "E''": 15},
+ 36: {'E': 58, "E'": 13, "E''": 15},
+ 37: {'E': 48, "E'": 13, "E''": 15, "P'": 59, "P''": 16, 'R': 22},
+ 38: {"E''": 60},
+ 39: {"E''": 61},
+ 40: {'E': 48, "E'": 13, "E''": 15, "P''": 62, 'R': 22},
+ 41: {},
+ 42: {},
+ 43: {'E': 48, "E'": 13, "E''": 15, 'P': 65, "P'": 14, "P''": 16, 'R': 22},
+ 44: {},
+ 45: {},
+ 46: {'E': 67, "E'": 13, "E''": 15},
+ 47: {},
+ 48: {},
+ 49: {},
+ 50: {},
+ 51: {'C': 29, "C'": 69},
+ 52: {},
+ 53: {},
+ 54: {},
+ 55: {},
+ 56: {},
+ 57: {},
+ 58: {},
+ 59: {},
+ 60: {},
+ 61: {},
+ 62: {},
+ 63: {},
+ 64: {},
+ 65: {},
+ 66: {},
+ 67: {},
+ 68: {'E': 71, "E'": 13, "E''": 15},
+ 69: {},
+ 70: {},
+ 71: {},
+ 72: {}}
@@ -0,0 +1,221 @@
+# intervals.py
+# 整数区间列表：由 <、>、=、&、|、! 构成的单变量谓词所定义的集合
+# 恰好是有限个整数区间的并，用有序、互不相交的区间列表表示。
+from bisect import bisect_right
+from backend import numpy_module
+
+NEG_INF = float("-inf")
+POS_INF = float("inf")
+
+
+class Intervals:
+    """
+    有序、互不相交且互不相邻的闭区间列表 [(lo, hi), ...]。
+
+    端点为 int，或表示无界的 NEG_INF / POS_INF。
+    并集、交集、补集都是 O(k) 的归并，成员测试是 O(log k) 的二分查找。
+    """
+
+    __slots__ = ("bounds", "lows", "arrays")
+
+    def __init__(self, bounds=()):
+        """
+        参数：
+            bounds (iterable): 已经规范化（有序、不相交、不相邻）的区间。
+                               任意区间请使用 from_ranges 构造。
+        """
+        self.bounds = tuple(bounds)
+        self.lows = [lo for lo, _ in self.bounds]
+        self.arrays = None  # 向量化成员测试用的 (lows, highs) NumPy 数组，首次使用时构建
+
+    @classmethod
+    def from_ranges(cls, ranges):
+        """由任意（可能重叠、无序、为空）的区间构造规范化的区间列表。"""
+        merged = []
+        for lo, hi in sorted((lo, hi) for lo, hi in ranges if lo <= hi):
+            if merged and lo <= merged[-1][1] + 1:
+                if hi > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], hi)
+            else:
+                merged.append((lo, hi))
+        return cls(merged)
+
+    @classmethod
+    def everything(cls):
+        return cls([(NEG_INF, POS_INF)])
+
+    @classmethod
+    def nothing(cls):
+        return cls()
+
+    @classmethod
+    def point(cls, n):
+        return cls([(n, n)])
+
+    @classmethod
+    def at_most(cls, n):
+        return cls([(NEG_INF, n)])
+
+    @classmethod
+    def at_least(cls, n):
+        return cls([(n, POS_INF)])
+
+    def contains(self, n):
+        """二分查找 n 所在的区间。"""
+        index = bisect_right(self.lows, n) - 1
+        return index >= 0 and n <= self.bounds[index][1]
+
+    def mask(self, values):
+        """
+        向量化成员测试。
+
+        参数：
+            values (numpy.ndarray): int64 数组。
+
+        返回：
+            numpy.ndarray: 布尔数组，values[i] 属于集合时为 True。
+        """
+        np = numpy_module()
+        if self.arrays is None:
+            info = np.iinfo(np.int64)
+            lows = np.array([max(lo, info.min) for lo, _ in self.bounds], dtype=np.int64)
+            highs = np.array([min(hi, info.max) for _, hi in self.bounds], dtype=np.int64)
+            self.arrays = (lows, highs)
+        lows, highs = self.arrays
+        if not len(lows):
+            return np.zeros(values.shape, dtype=bool)
+        index = np.searchsorted(lows, values, side="right") - 1
+        return (index >= 0) & (values <= highs[np.maximum(index, 0)])
+
+    def members(self, low, high):
+        """
+        按升序逐个产生 [low, high] 内的元素，区间之间的空隙直接跳过。
+
+        参数：
+            low (int): 下界。
+            high (int): 上界（包含）。
+
+        返回：
+            generator: 元素的生成器。
+        """
+        index = max(bisect_right(self.lows, low) - 1, 0)
+        for lo, hi in self.bounds[index:]:
+            if lo > high:
+                break
+            yield from range(max(lo, low), min(hi, high) + 1)
+
+    def union(self, other):
+        """两个区间列表的并集，线性归并。"""
+        a, b = self.bounds, other.bounds
+        i = j = 0
+        merged = []
+        while i < len(a) or j < len(b):
+            if j >= len(b) or (i < len(a) and a[i][0] <= b[j][0]):
+                lo, hi = a[i]
+                i += 1
+            else:
+                lo, hi = b[j]
+                j += 1
+            if merged and lo <= merged[-1][1] + 1:
+                if hi > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], hi)
+            else:
+                merged.append((lo, hi))
+        return Intervals(merged)
+
+    def intersection(self, other):
+        """两个区间列表的交集，双指针线性扫描。"""
+        a, b = self.bounds, other.bounds
+        i = j = 0
+        result = []
+        while i < len(a) and j < len(b):
+            lo = max(a[i][0], b[j][0])
+            hi = min(a[i][1], b[j][1])
+            if lo <= hi:
+                result.append((lo, hi))
+            if a[i][1] < b[j][1]:
+                i += 1
+            else:
+                j += 1
+        return Intervals(result)
+
+    def complement(self):
+        """相对全体整数的补集。"""
+        result = []
+        previous = NEG_INF
+        for lo, hi in self.bounds:
+            if lo != NEG_INF and (previous == NEG_INF or previous <= lo - 1):
+                result.append((previous, lo - 1))
+            previous = hi + 1
+        if previous != POS_INF:
+            result.append((previous, POS_INF))
+        return Intervals(result)
+
+    def shift(self, delta):
+        """所有元素加上 delta。"""
+        return Intervals((lo + delta, hi + delta) for lo, hi in self.bounds)
+
+    def negate(self):
+        """所有元素取相反数。"""
+        return Intervals((-hi, -lo) for lo, hi in reversed(self.bounds))
+
+    def is_empty(self):
+        return not self.bounds
+
+    def issubset(self, other):
+        """判断 self 是否包含于 other：每个区间都必须落在 other 的某个区间内，线性扫描。"""
+        j = 0
+        b = other.bounds
+        for lo, hi in self.bounds:
+            while j < len(b) and b[j][1] < lo:
+                j += 1
+            if j == len(b) or b[j][0] > lo or b[j][1] < hi:
+                return False
+        return True
+
+    def radius(self):
+        """返回有限端点绝对值的最大值：|n| 超过它时成员关系在两侧分别不变。"""
+        return max((abs(end) for bound in self.bounds for end in bound if abs(end) != POS_INF), default=0)
+
+    def count(self, low=NEG_INF, high=POS_INF):
+        """
+        返回 [low, high] 内的元素个数。
+
+        返回：
+            int: 元素个数；集合在范围内无界时返回 POS_INF。
+        """
+        total = 0
+        for lo, hi in self.bounds:
+            lo, hi = max(lo, low), min(hi, high)
+            if lo > hi:
+                continue
+            if lo == NEG_INF or hi == POS_INF:
+                return POS_INF
+            total += hi - lo + 1
+        return total
+
+    @classmethod
+    def from_members(cls, members):
+        """由升序的整数序列构造区间列表，相邻的整数合并为一个区间。"""
+        bounds = []
+        for n in members:
+            if bounds and bounds[-1][1] == n - 1:
+                bounds[-1] = (bounds[-1][0], n)
+            else:
+                bounds.append((n, n))
+        return cls(bounds)
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def __iter__(self):
+        return iter(self.bounds)
+
+    def __eq__(self, other):
+        return isinstance(other, Intervals) and self.bounds == other.bounds
+
+    def __hash__(self):
+        return hash(self.bounds)
+
+    def __repr__(self):
+        return "Intervals(" + repr(list(self.bounds)) + ")"
@@ -2,6 +2,31 @@ import re
 import json
 import sys
 
+TOKEN_SPECIFICATION = [
+    # Keywords, matched only if not followed by a lowercase letter, digit, or underscore
+    ("KEYWORD", r"(?<![a-z])(let|be|show|int|set|simplify)(?![a-z])"),
+    ("NUMBER", r"0|[1-9]\d*"),  # Numbers: zero or non-zero followed by digits
+    ("ID", r"[a-z][a-z]*"),  # Identifiers with lowercase letters only
+    ("PUNCTUATION", r"[{}().:]"),
+    ("ARITH_OP", r"[+\-*]"),
+    ("REL_OP", r"[<>@=]"),
+    ("LOGIC_OP", r"[&|!]"),
+    ("SET_OP", r"[UI]"),  # Assuming 'U' and 'I' are valid set operators
+    (
+        "COMMENT",
+        r"#.*",
+    ),  # Comments start with '#' and go to the end of the line
+    ("SKIP", r"[ \t\n]+"),  # Skip spaces, tabs, and newlines
+    ("MISMATCH", r"."),  # Catch-all for any other character
+]
+# 在模块加载时编译一次，而不是每次调用 tokenize 时重新编译
+TOKEN_REGEX = "|".join("(?P<%s>%s)" % pair for pair in TOKEN_SPECIFICATION)
+GET_TOKEN = re.compile(TOKEN_REGEX).match
+
+
+class LexicalError(Exception):
+    """Raised by Lexer.scan when the input cannot be tokenized."""
+
 
 class Lexer:
     def __init__(self, source_code):
@@ -11,42 +36,24 @@ class Lexer:
         self.symbol_table = {}
 
     def tokenize(self):
-        if not self.source_code.strip():
-            # Input is empty
+        try:
+            return self.scan()
+        except LexicalError:
+            # Output Lexical Error and exit
             print("Lexical Error!")
             with open("lexer_out.json", "w") as json_file:
                 json.dump([], json_file)
             sys.exit(0)
 
+    def scan(self):
+        """Tokenize the source code without writing files; raise LexicalError on bad input."""
         if not self.source_code.strip():
             # Input is empty
-            print("Lexical Error!")
-            with open("lexer_out.json", "w") as json_file:
-                json.dump([], json_file)
-            sys.exit(0)
+            raise LexicalError("Empty input")
 
-        token_specification = [
-            # Keywords, matched only if not followed by a lowercase letter, digit, or underscore
-            ("KEYWORD", r"(?<![a-z])(let|be|show|int|set|simplify)(?![a-z])"),
-            ("NUMBER", r"0|[1-9]\d*"),  # Numbers: zero or non-zero followed by digits
-            ("ID", r"[a-z][a-z]*"),  # Identifiers with lowercase letters only
-            ("PUNCTUATION", r"[{}().:]"),
-            ("ARITH_OP", r"[+\-*]"),
-            ("REL_OP", r"[<>@=]"),
-            ("LOGIC_OP", r"[&|!]"),
-            ("SET_OP", r"[UI]"),  # Assuming 'U' and 'I' are valid set operators
-            (
-                "COMMENT",
-                r"#.*",
-            ),  # Comments start with '#' and go to the end of the line
-            ("SKIP", r"[ \t\n]+"),  # Skip spaces, tabs, and newlines
-            ("MISMATCH", r"."),  # Catch-all for any other character
-        ]
-        token_regex = "|".join("(?P<%s>%s)" % pair for pair in token_specification)
-        get_token = re.compile(token_regex).match
         line = self.source_code
 
-        mo = get_token(line)
+        mo = GET_TOKEN(line)
         while mo is not None:
             kind = mo.lastgroup
             value = mo.group()
@@ -57,18 +64,11 @@ class Lexer:
                 pass  # Ignore comments
             elif kind == "MISMATCH":
                 # Handle the lexical error
-                print("Lexical Error!")
-                with open("lexer_out.json", "w") as json_file:
-                    json.dump([], json_file)
-                sys.exit(0)
+                raise LexicalError(f"Unexpected character {value!r} at position {mo.start()}")
             else:
                 if kind == "NUMBER":
                     if len(value) > 10:
-                        # Output Lexical Error and exit
-                        print("Lexical Error!")
-                        with open("lexer_out.json", "w") as json_file:
-                            json.dump([], json_file)
-                        sys.exit(0)
+                        raise LexicalError(f"Number too long: {value}")
                     self.tokens.append({"token": "num", "lexeme": value})
                 elif kind == "ID":
                     if value not in self.symbol_table:
@@ -79,7 +79,7 @@ class Lexer:
                 else:
                     self.tokens.append({"token": value, "lexeme": value})
 
-            mo = get_token(line, mo.end())
+            mo = GET_TOKEN(line, mo.end())
 
         return self.tokens
 
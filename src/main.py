@@ -1,20 +1,349 @@
-import argparse
 import json
+import sys
 from lexer import Lexer
 from parser import (
     SLRParser,
     load_parsing_table,
 )  # Assuming parser.py and this file are in the same directory
-from type_checker import TypeChecker
-from evaluator import Evaluator  # 导入评估器功能
 
-def main():
+# 类型检查、评估、缓存、会话等模块只在运行到对应阶段时才导入，以缩短启动时间
+
+PARSING_TABLE_FILE = "SLR Parsing Table.csv"
+DEFAULT_CACHE_SIZE_MB = 64
+
+
+# 可选参数的默认值：argparse 通过 set_defaults 使用，快速启动路径的 FastArguments 也直接使用，两者始终一致
+ARGUMENT_DEFAULTS = {
+    "fast": False,
+    "cache_dir": None,
+    "cache_size": DEFAULT_CACHE_SIZE_MB,
+    "cache_stats": False,
+    "watch": False,
+    "interval": 0.2,
+    "repl": False,
+    "domain": None,
+    "codegen": False,
+    "demand": False,
+    "jobs": None,
+    "profile": False,
+    "profile_json": None,
+}
+
+
+class FastArguments:
+    """快速启动路径使用的参数对象，取值为 ARGUMENT_DEFAULTS 加上输入文件和 --fast。"""
+
+    def __init__(self, input_file):
+        self.__dict__.update(ARGUMENT_DEFAULTS)
+        self.input_file = input_file
+        self.fast = True
+
+
+def read_artifact(path):
+    """读取阶段输出文件的原始文本，用于写入缓存。"""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def load_tables(fast=False):
+    """
+    加载 SLR 解析表。
+
+    参数：
+        fast (bool): 为 True 时直接导入 freeze_tables.py 生成的 frozen_tables 模块，不读取 CSV。
+
+    返回：
+        tuple: (ACTION 表, GOTO 表, 解析表内容的哈希)。
+    """
+    if fast:
+        from frozen_tables import ACTION_TABLE, GOTO_TABLE, TABLE_DIGEST
+        return ACTION_TABLE, GOTO_TABLE, TABLE_DIGEST
+    import hashlib
+
+    table_digest = hashlib.sha256(read_artifact(PARSING_TABLE_FILE).encode("utf-8")).hexdigest()
+    action_table, goto_table = load_parsing_table(PARSING_TABLE_FILE)
+    return action_table, goto_table, table_digest
+
+
+def restore_stage(cached_stage):
+    """
+    从缓存恢复一个阶段：写回它的输出文件并重放它的提示信息。
+
+    参数：
+        cached_stage (dict): 缓存中的阶段结果，包含 files 和 messages。
+    """
+    for path, text in cached_stage["files"].items():
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    for message in cached_stage["messages"]:
+        print(message)
+
+
+def run_watch(input_file, interval):
+    """
+    监视输入文件和解析表，内容改变时增量地重新运行并打印 show 的结果。
+
+    类型检查器和评估器的状态保存在 Session 中，只有内容（或前缀）改变的声明会重新处理。
+
+    参数：
+        input_file (str): 源代码文件路径。
+        interval (float): 轮询间隔（秒）。
+    """
+    import hashlib
+    import os
+    import time
+    from ropes import format_result
+    from session import Session, SessionError
+
+    session = None
+    mtimes = {}
+    digests = {}
+    print(f"Watching '{input_file}' and '{PARSING_TABLE_FILE}' (Ctrl+C to stop)")
+    try:
+        while True:
+            changed = False
+            for path in (PARSING_TABLE_FILE, input_file):
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                if mtimes.get(path) == mtime:
+                    continue
+                mtimes[path] = mtime
+                digest = hashlib.sha256(read_artifact(path).encode("utf-8")).hexdigest()
+                if digests.get(path) != digest:
+                    digests[path] = digest
+                    changed = True
+                    if path == PARSING_TABLE_FILE:
+                        session = None  # 解析表改变，所有缓存的声明都失效
+
+            if changed and input_file in digests and PARSING_TABLE_FILE in digests:
+                start = time.perf_counter()
+                try:
+                    if session is None:
+                        action_table, goto_table, table_digest = load_tables()
+                        session = Session(action_table, goto_table, table_digest)
+                    result = session.run(read_artifact(input_file))
+                    elapsed = (time.perf_counter() - start) * 1000
+                    print(f"Result: {format_result(result)} ({elapsed:.1f} ms)")
+                except SessionError as e:
+                    print(e)
+                except Exception as e:
+                    print(f"Evaluation Error: {e}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("Watch stopped.")
+
+
+def run_repl(input_file=None, fast=False):
+    """
+    交互式会话：每条声明只处理一次，show 语句在会话符号表上直接评估。
+
+    参数：
+        input_file (str): 可选，启动时先执行的源代码文件。
+        fast (bool): 是否使用冻结的解析表。
+    """
+    from ropes import format_result
+    from session import Session, SessionError
+
+    action_table, goto_table, table_digest = load_tables(fast)
+    session = Session(action_table, goto_table, table_digest)
+
+    def execute(source_code):
+        try:
+            result = session.execute(source_code)
+            if result is not None:
+                print(f"Result: {format_result(result)}")
+        except SessionError as e:
+            print(e)
+        except Exception as e:
+            print(f"Evaluation Error: {e}")
+
+    if input_file:
+        execute(read_artifact(input_file))
+
+    print("Enter declarations or show statements ending with '.', ':stats' for membership "
+          "cache statistics, ':quit' to exit.")
+    buffer = ""
+    while True:
+        try:
+            line = input("... " if buffer else ">>> ")
+        except (EOFError, KeyboardInterrupt):
+            print()
+            break
+        if not buffer and line.strip() in (":quit", ":q", "exit"):
+            break
+        if not buffer and line.strip() == ":stats":
+            stats = session.evaluator.membership_cache.stats()
+            print(f"Membership cache: {stats['hits']} hits, {stats['misses']} misses "
+                  f"(hit rate {stats['hit_rate']:.1%}), {stats['entries']} entries, "
+                  f"{stats['evictions']} evictions, {stats['invalidations']} invalidations")
+            for name, entry in stats["sets"].items():
+                print(f"  {name}: {entry['hits']} hits, {entry['misses']} misses "
+                      f"(hit rate {entry['hit_rate']:.1%})")
+            continue
+        buffer += line + "\n"
+        # 语句以 '.' 结尾，未结束时继续读取下一行
+        if statement_complete(buffer):
+            execute(buffer)
+            buffer = ""
+
+
+def statement_complete(buffer):
+    """
+    判断 REPL 缓冲区中的输入是否已经以 '.' 结束。
+
+    注释按行去掉（每行 '#' 之后的内容），只看最后一行非空代码的结尾。
+
+    参数：
+        buffer (str): 已读入的多行输入。
+
+    返回：
+        bool: 最后一行代码以 '.' 结尾时为 True。
+    """
+    for line in reversed(buffer.splitlines()):
+        code = line.split("#", 1)[0].rstrip()
+        if code:
+            return code.endswith(".")
+    return False
+
+
+def parse_domain(text):
+    """
+    解析 --domain 参数。
+
+    参数：
+        text (str): 形如 "LOW:HIGH" 的整数范围。
+
+    返回：
+        tuple: (low, high)。
+    """
+    import argparse
+
+    try:
+        low, high = (int(part) for part in text.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid domain '{text}', expected LOW:HIGH")
+    if low > high:
+        raise argparse.ArgumentTypeError(f"empty domain '{text}'")
+    return low, high
+
+
+def parse_arguments(argv):
+    """
+    解析命令行参数。
+
+    只给出输入文件和 --fast 时走快速路径，不导入 argparse。
+
+    参数：
+        argv (list): 不含程序名的命令行参数。
+
+    返回：
+        命令行参数对象。
+    """
+    if len(argv) == 2 and "--fast" in argv:
+        input_file = argv[1] if argv[0] == "--fast" else argv[0]
+        if not input_file.startswith("-"):
+            return FastArguments(input_file)
+
+    import argparse
+
     # 设置命令行参数解析器
     parser = argparse.ArgumentParser(
         description="Run lexer and parser on a source code file."
     )
-    parser.add_argument("input_file", help="The input file containing source code.")
-    args = parser.parse_args()
+    parser.add_argument(
+        "input_file", nargs="?", help="The input file containing source code."
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory of the on-disk compilation cache (disabled if omitted).",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        help="Cache size limit in MB; least recently used entries are evicted.",
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Print cache hit/miss statistics after the run.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Re-run incrementally whenever the input file or parsing table changes.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        help="Polling interval in seconds for --watch.",
+    )
+    parser.add_argument(
+        "--repl",
+        action="store_true",
+        help="Start an interactive session (after running input_file, if given).",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Use the frozen parsing table (frozen_tables.py) instead of reading the CSV.",
+    )
+    parser.add_argument(
+        "--domain",
+        type=parse_domain,
+        metavar="LOW:HIGH",
+        help="Materialize declared sets as bitsets over the integer range LOW..HIGH "
+        "(write --domain=-100:100 when LOW is negative).",
+    )
+    parser.add_argument(
+        "--codegen",
+        action="store_true",
+        help="Evaluate by compiling the whole program to a Python function; "
+        "evaluation_out.json then records only the program result.",
+    )
+    parser.add_argument(
+        "--demand",
+        action="store_true",
+        help="Evaluate only the declarations the show statement depends on and "
+        "report the skipped ones.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="Materialize independent set declarations in parallel using N worker "
+        "processes (0 means one per CPU); requires --domain.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print wall time, CPU time and tracemalloc peak memory for each stage, "
+        "plus token, node and shift/reduce counts (timings include tracemalloc overhead).",
+    )
+    parser.add_argument(
+        "--profile-json",
+        metavar="PATH",
+        help="Also write the --profile report as JSON to PATH (implies --profile).",
+    )
+    parser.set_defaults(**ARGUMENT_DEFAULTS)
+    args = parser.parse_args(argv)
+    if args.input_file is None and not args.repl:
+        parser.error("the following arguments are required: input_file")
+    if args.jobs is not None and args.domain is None:
+        parser.error("--jobs requires --domain (only bitset materialization runs in parallel)")
+    return args
+
+
+def main():
+    args = parse_arguments(sys.argv[1:])
+
+    if args.repl:
+        run_repl(args.input_file, args.fast)
+        return
+    if args.watch:
+        run_watch(args.input_file, args.interval)
+        return
 
     # Step 1: 词法分析
     # 读取指定的输入文件
@@ -25,63 +354,176 @@ def main():
         print(f"Error: The file '{args.input_file}' was not found.")
         return
 
-    # 创建 Lexer 实例并进行词法分析
-    lexer = Lexer(source_code)
-    tokens = lexer.tokenize()
+    # 分阶段剖析：未开启时使用空操作的剖析器
+    if args.profile or args.profile_json:
+        from profiler import StageProfiler, count_nodes
+        profiler = StageProfiler()
+    else:
+        from profiler import NULL_PROFILER
+        profiler = NULL_PROFILER
+
+    # 查询编译缓存：命中的阶段直接恢复，不再执行
+    cache = None
+    cached = {}
+    tables = None
+    if args.cache_dir:
+        from cache import CompilationCache
 
-    # 将 token 信息保存为 JSON 格式到 lexer_out.json 文件
-    with open("lexer_out.json", "w") as json_file:
-        json.dump(tokens, json_file, indent=2)
-    print("Lexical Analysis Complete!")  # 调试用代码，显示文件输出
+        with profiler.stage("table load"):
+            tables = load_tables(args.fast)
+        cache = CompilationCache(args.cache_dir, args.cache_size * 1024 * 1024)
+        # 不同评估方式写出的 evaluation_out.json 不同，分开缓存
+        mode = (":codegen" if args.codegen else "") + (":demand" if args.demand else "")
+        cache_key = cache.make_key(source_code, tables[2] + mode)
+        cached = cache.lookup(cache_key)
+
+    if "tokens" in cached:
+        with profiler.stage("writing"):
+            restore_stage(cached["tokens"])
+        with profiler.stage("lexing"):
+            tokens = json.loads(cached["tokens"]["files"]["lexer_out.json"])
+    else:
+        # 创建 Lexer 实例并进行词法分析
+        with profiler.stage("lexing"):
+            lexer = Lexer(source_code)
+            tokens = lexer.tokenize()
+
+        # 将 token 信息保存为 JSON 格式到 lexer_out.json 文件
+        with profiler.stage("writing"):
+            with open("lexer_out.json", "w") as json_file:
+                json.dump(tokens, json_file, indent=2)
+        print("Lexical Analysis Complete!")  # 调试用代码，显示文件输出
+        if cache:
+            cache.store(cache_key, "tokens", {
+                "files": {"lexer_out.json": read_artifact("lexer_out.json")},
+                "messages": ["Lexical Analysis Complete!"],
+            })
 
     # Step 2: 语法分析
-    # 读取解析表 (固定路径为 'SLR Parsing Table.csv')
-    action_table, goto_table = load_parsing_table("SLR Parsing Table.csv")
+    if profiler.enabled:
+        profiler.count("tokens", len(tokens))
+    if "parse_tree" in cached:
+        with profiler.stage("writing"):
+            restore_stage(cached["parse_tree"])
+    else:
+        # 读取解析表 (固定路径为 'SLR Parsing Table.csv'，--fast 时使用冻结的解析表)
+        with profiler.stage("table load"):
+            action_table, goto_table, _ = tables or load_tables(args.fast)
 
-    # 创建 SLRParser 实例并进行语法分析
-    parser = SLRParser(tokens, action_table, goto_table)
-    parser.parse()
+        # 创建 SLRParser 实例并进行语法分析（与 parser.parse() 相同，分开计时）
+        parser = SLRParser(tokens, action_table, goto_table)
+        with profiler.stage("parsing"):
+            parser.build_syntax_tree()
+        with profiler.stage("writing"):
+            parser.output_json()
+        if profiler.enabled:
+            profiler.count("nodes", count_nodes(parser.syntax_tree))
+            profiler.count("shifts", parser.shifts)
+            profiler.count("reduces", parser.reduces)
+        if cache:
+            cache.store(cache_key, "parse_tree", {
+                "files": {"parser_out.json": read_artifact("parser_out.json")},
+                "messages": ["Syntactic Analysis Complete!"],
+            })
 
     # Step 3: 语义分析（类型检查）
     # 假设文件路径如下，你可以根据实际情况修改
     parser_out_path = "parser_out.json"
     typing_out_path = "typing_out.json"
 
-    # 创建 TypeChecker 实例
-    type_checker = TypeChecker(parser_out_path, typing_out_path)
+    if "typed_tree" in cached:
+        with profiler.stage("writing"):
+            restore_stage(cached["typed_tree"])
+        type_error_flag = cached["typed_tree"]["type_error"]
+    else:
+        from type_checker import TypeChecker
+
+        # 创建 TypeChecker 实例
+        type_checker = TypeChecker(parser_out_path, typing_out_path)
 
-    try:
-        # 加载 AST
-        type_checker.load_ast()
-        if type_checker.type_error_flag:
-            print("Type Error!")
-        else:
-            # 运行类型检查
-            type_checker.type_check()
-            if type_checker.type_error_flag:
+        with profiler.stage("type checking"):
+            try:
+                # 加载 AST
+                type_checker.load_ast()
+                if type_checker.type_error_flag:
+                    print("Type Error!")
+                else:
+                    # 运行类型检查
+                    type_checker.type_check()
+                    if type_checker.type_error_flag:
+                        print("Type Error!")
+                    else:
+                        print("Semantic Analysis Complete!")
+            except Exception as e:
+                # 捕获任何未预见的异常
+                # debug_log(f"Unexpected error: {e}")
+                type_checker.type_error_flag = True
                 print("Type Error!")
-            else:
-                print("Semantic Analysis Complete!")
-    except Exception as e:
-        # 捕获任何未预见的异常
-        # debug_log(f"Unexpected error: {e}")
-        type_checker.type_error_flag = True
-        print("Type Error!")
-    finally:
-        # 根据 type_error_flag 写出 typing_out.json
-        type_checker.write_typing_json()
-        # debug_log("Type checking phase finished.")
+            finally:
+                # 根据 type_error_flag 写出 typing_out.json
+                with profiler.stage("writing"):
+                    type_checker.write_typing_json()
+                # debug_log("Type checking phase finished.")
+        type_error_flag = type_checker.type_error_flag
+        if cache:
+            cache.store(cache_key, "typed_tree", {
+                "files": {typing_out_path: read_artifact(typing_out_path)},
+                "messages": ["Type Error!" if type_error_flag else "Semantic Analysis Complete!"],
+                "type_error": type_error_flag,
+            })
 
     # Step 4: 语义分析中的评估部分
-    if not type_checker.type_error_flag:
+    if "evaluation" in cached:
+        with profiler.stage("writing"):
+            restore_stage(cached["evaluation"])
+    elif not type_error_flag:
+        from evaluator import Evaluator  # 导入评估器功能
+
         evaluator = Evaluator()
         evaluator.enable_debug()  # 启用调试信息
-        evaluator.evaluate()
+        if args.domain:
+            evaluator.set_domain(*args.domain)
+        if args.demand:
+            evaluator.enable_demand_driven()
+        if args.jobs is not None:
+            evaluator.enable_parallel(args.jobs or None)
+        evaluator.profiler = profiler
+        with profiler.stage("evaluation"):
+            evaluator.evaluate(compiled=args.codegen)
+        if cache:
+            messages = ["Evaluation Complete!"]
+            if evaluator.skipped_declarations:
+                messages.append(f"Skipped {len(evaluator.skipped_declarations)} unused declaration(s): "
+                                f"{', '.join(evaluator.skipped_declarations)}")
+            if evaluator.evaluation_result is not None:
+                messages.append(f"Result: {evaluator.evaluation_result}")
+            cache.store(cache_key, "evaluation", {
+                "files": {"evaluation_out.json": read_artifact("evaluation_out.json")},
+                "messages": messages,
+                "result": str(evaluator.parse_tree.get("value")),
+            })
     else:
         # 创建空的evaluation_out.json
         with open('evaluation_out.json', 'w') as f:
             json.dump({}, f)
         print("Evaluation Skipped due to Type Error.")
+        if cache:
+            cache.store(cache_key, "evaluation", {
+                "files": {"evaluation_out.json": "{}"},
+                "messages": ["Evaluation Skipped due to Type Error."],
+                "result": None,
+            })
+
+    if cache and args.cache_stats:
+        stats = cache.stats()
+        print(f"Cache: {stats['lookups']} lookups, {stats['misses']} misses, "
+              f"hits by stage {stats['hits']}, {stats['entries']} entries "
+              f"({stats['bytes']} bytes), {stats['evictions']} evictions")
+
+    if profiler.enabled:
+        profiler.print_table()
+        if args.profile_json:
+            profiler.write_json(args.profile_json)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,3 @@
-import csv
 import json
 import sys
 
@@ -6,15 +5,16 @@ import sys
 # 更新后的语法规则
 GRAMMAR = {
     "S'": [["S"]],
-    "S": [["D'", "C", "."], ["C", "."]],
+    "S": [["D'", "C", "."], ["C", "."], ["D'", "C", ".", "C'"], ["C", ".", "C'"]],
     "D'": [["D", "D'"], ["D"]],
     "D": [["let", "T", "id", "be", "E", "."]],
     "T": [["int"], ["set"]],
     "C": [["show", "A"]],
+    "C'": [["C", ".", "C'"], ["C", "."]],
     "A": [["E"], ["P"]],
     "E": [["E'"], ["E", "U", "E'"], ["E", "+", "E'"], ["E", "-", "E'"]],
     "E'": [["E''"], ["E'", "I", "E''"], ["E'", "*", "E''"]],
-    "E''": [["num"], ["id"], ["(", "E", ")"], ["{", "Z", "P", "}"]],
+    "E''": [["num"], ["id"], ["(", "E", ")"], ["{", "Z", "P", "}"], ["simplify", "E''"]],
     "Z": [["id", ":"]],
     "P": [["P", "|", "P'"], ["P'"]],
     "P'": [["P'", "&", "P''"], ["P''"]],
@@ -23,7 +23,53 @@ GRAMMAR = {
 }
 
 
+# 使用提供的规则编号和产生式，构建产生式字典（模块级常量，只构建一次）
+PRODUCTIONS = {
+    0: ("S'", ["S"]),
+    1: ("S", ["D'", "C", "."]),
+    2: ("S", ["C", "."]),
+    3: ("D'", ["D", "D'"]),
+    4: ("D'", ["D"]),
+    5: ("D", ["let", "T", "id", "be", "E", "."]),
+    6: ("T", ["int"]),
+    7: ("T", ["set"]),
+    8: ("E", ["E'"]),
+    9: ("E", ["E", "U", "E'"]),
+    10: ("E", ["E", "+", "E'"]),
+    11: ("E", ["E", "-", "E'"]),
+    12: ("E'", ["E''"]),
+    13: ("E'", ["E'", "I", "E''"]),
+    14: ("E'", ["E'", "*", "E''"]),
+    15: ("E''", ["num"]),
+    16: ("E''", ["id"]),
+    17: ("E''", ["(", "E", ")"]),
+    18: ("E''", ["{", "Z", "P", "}"]),
+    19: ("Z", ["id", ":"]),
+    20: ("P", ["P", "|", "P'"]),
+    21: ("P", ["P'"]),
+    22: ("P'", ["P'", "&", "P''"]),
+    23: ("P'", ["P''"]),
+    24: ("P''", ["R"]),
+    25: ("P''", ["(", "P", ")"]),
+    26: ("P''", ["!", "R"]),
+    27: ("R", ["E", "<", "E"]),
+    28: ("R", ["E", ">", "E"]),
+    29: ("R", ["E", "=", "E"]),
+    30: ("R", ["E", "@", "E"]),
+    31: ("C", ["show", "A"]),
+    32: ("A", ["E"]),
+    33: ("A", ["P"]),
+    34: ("E''", ["simplify", "E''"]),
+    35: ("S", ["D'", "C", ".", "C'"]),
+    36: ("S", ["C", ".", "C'"]),
+    37: ("C'", ["C", ".", "C'"]),
+    38: ("C'", ["C", "."]),
+}
+
+
 def load_parsing_table(parsing_table_file):
+    import csv  # 只有读取 CSV 解析表时才需要，延迟导入以加快启动
+
     action_table = {}
     goto_table = {}
 
@@ -108,6 +154,10 @@ def load_parsing_table(parsing_table_file):
         return action_table, goto_table
 
 
+class ParseError(Exception):
+    """derive() 遇到 ACTION 表中没有动作的输入（语法错误）时抛出。"""
+
+
 class SLRParser:
     def __init__(self, tokens, action_table, goto_table):
         self.tokens = tokens
@@ -117,46 +167,36 @@ class SLRParser:
         self.action_table = action_table
         self.goto_table = goto_table
         self.input = tokens + [{"token": "$", "lexeme": "$"}]  # 结束标记
+        self.shifts = 0  # 移入次数
+        self.reduces = 0  # 归约次数
 
-        # 使用提供的规则编号和产生式，构建产生式字典
-        self.productions = {
-            0: ("S'", ["S"]),
-            1: ("S", ["D'", "C", "."]),
-            2: ("S", ["C", "."]),
-            3: ("D'", ["D", "D'"]),
-            4: ("D'", ["D"]),
-            5: ("D", ["let", "T", "id", "be", "E", "."]),
-            6: ("T", ["int"]),
-            7: ("T", ["set"]),
-            8: ("E", ["E'"]),
-            9: ("E", ["E", "U", "E'"]),
-            10: ("E", ["E", "+", "E'"]),
-            11: ("E", ["E", "-", "E'"]),
-            12: ("E'", ["E''"]),
-            13: ("E'", ["E'", "I", "E''"]),
-            14: ("E'", ["E'", "*", "E''"]),
-            15: ("E''", ["num"]),
-            16: ("E''", ["id"]),
-            17: ("E''", ["(", "E", ")"]),
-            18: ("E''", ["{", "Z", "P", "}"]),
-            19: ("Z", ["id", ":"]),
-            20: ("P", ["P", "|", "P'"]),
-            21: ("P", ["P'"]),
-            22: ("P'", ["P'", "&", "P''"]),
-            23: ("P'", ["P''"]),
-            24: ("P''", ["R"]),
-            25: ("P''", ["(", "P", ")"]),
-            26: ("P''", ["!", "R"]),
-            27: ("R", ["E", "<", "E"]),
-            28: ("R", ["E", ">", "E"]),
-            29: ("R", ["E", "=", "E"]),
-            30: ("R", ["E", "@", "E"]),
-            31: ("C", ["show", "A"]),
-            32: ("A", ["E"]),
-            33: ("A", ["P"]),
-        }
+        self.productions = PRODUCTIONS
 
     def parse(self):
+        self.build_syntax_tree()
+        self.output_json()
+
+    def build_syntax_tree(self):
+        """执行 SLR 分析并构建语法树，不写出文件；语法错误时打印错误、写出空的 parser_out.json 并退出。"""
+        try:
+            return self.derive()
+        except ParseError:
+            # 处理错误
+            print("Syntax Error!")
+            with open("parser_out.json", "w") as json_file:
+                json.dump({}, json_file)
+            sys.exit(0)  # 退出程序
+
+    def derive(self):
+        """
+        执行 SLR 分析并构建语法树，不写出文件，也不打印。
+
+        返回：
+            dict: 语法树根节点。
+
+        异常：
+            ParseError: 输入存在语法错误。
+        """
         syntax_stack = []
         while True:
             state = self.stack[-1]
@@ -178,6 +218,7 @@ class SLRParser:
                 next_state = int(action[1:])
                 self.stack.append(next_state)
                 self.cursor += 1
+                self.shifts += 1
                 # 将终结符作为叶子节点推入语法树栈
                 syntax_stack.append(
                     {
@@ -189,6 +230,7 @@ class SLRParser:
             elif action and action.startswith("r"):
                 # 归约操作
                 rule_number = int(action[1:])
+                self.reduces += 1
                 if rule_number not in self.productions:
                     raise ValueError(f"Invalid rule number: {rule_number}")
                 lhs, rhs = self.productions[rule_number]
@@ -196,13 +238,13 @@ class SLRParser:
                 num_to_pop = len(rhs)
                 if rhs == [""]:
                     num_to_pop = 0  # 对于空产生式，不弹出栈
-                # 从栈中弹出与产生式右部长度相同的状态
-                self.stack = self.stack[:-num_to_pop]
-                # 从语法树栈中弹出相应数量的节点
-                children = syntax_stack[-num_to_pop:] if num_to_pop > 0 else []
-                syntax_stack = (
-                    syntax_stack[:-num_to_pop] if num_to_pop > 0 else syntax_stack
-                )
+                # 从栈中弹出与产生式右部长度相同的状态（原地删除栈顶，不复制整个栈）
+                children = []
+                if num_to_pop > 0:
+                    del self.stack[-num_to_pop:]
+                    # 从语法树栈中弹出相应数量的节点
+                    children = syntax_stack[-num_to_pop:]
+                    del syntax_stack[-num_to_pop:]
                 # children.reverse()
                 current_state = self.stack[-1]
                 next_state = self.goto_table.get(current_state, {}).get(lhs)
@@ -215,18 +257,15 @@ class SLRParser:
                 syntax_stack.append({"name": lhs, "children": children})
                 # print(f"Reduced: New stack: {self.stack}") # 调试信息
             else:
-                # 处理错误
-                print("Syntax Error!")
-                with open("parser_out.json", "w") as json_file:
-                    json.dump({}, json_file)
-                sys.exit(0)  # 退出程序
+                lexeme = self.input[self.cursor]["lexeme"]
+                raise ParseError(f"Unexpected '{lexeme}' at token {self.cursor}")
 
         # 输出语法树到 JSON 文件
         if syntax_stack:
             self.syntax_tree = syntax_stack[-1]  # 使用栈的最后一个元素作为语法树根节点
         else:
             self.syntax_tree = {}
-        self.output_json()
+        return self.syntax_tree
 
     def output_json(self):
         with open("parser_out.json", "w") as f:
@@ -0,0 +1,169 @@
+# profiler.py
+# 分阶段性能剖析：记录每个阶段（词法分析、解析表加载、语法分析、类型检查、评估、写出中间文件）
+# 的墙钟时间、CPU 时间和 tracemalloc 内存峰值，以及词法单元个数、语法树节点个数、移入/归约次数等计数。
+# 阶段可以嵌套（例如评估中写出 evaluation_out.json），外层阶段只计自身的时间，不含内层阶段。
+import time
+
+STAGE_ORDER = ("lexing", "table load", "parsing", "type checking", "evaluation", "writing")
+
+
+class NullStage:
+    """未开启剖析时使用的空上下文管理器。"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class NullProfiler:
+    """未开启剖析时使用的剖析器，所有记录都是空操作。"""
+
+    enabled = False
+    _stage = NullStage()
+
+    def stage(self, name):
+        return self._stage
+
+    def count(self, name, value):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class StageFrame:
+    """一个正在执行的阶段：开始时刻以及内层阶段已经占用的时间。"""
+
+    __slots__ = ("profiler", "name", "wall", "cpu", "child_wall", "child_cpu", "base", "peak")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.enter(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.exit(self)
+        return False
+
+
+class StageProfiler:
+    """记录各阶段耗时、内存峰值和计数的剖析器。"""
+
+    enabled = True
+
+    def __init__(self):
+        import tracemalloc
+
+        self.tracemalloc = tracemalloc
+        self.stages = {}  # 阶段名 -> {"wall", "cpu", "peak", "calls"}
+        self.counters = {}  # 计数名 -> 值
+        self.frames = []  # 正在执行的阶段，最内层在最后
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name):
+        """
+        返回记录一个阶段的上下文管理器，同名阶段多次执行时累加。
+
+        参数：
+            name (str): 阶段名。
+        """
+        return StageFrame(self, name)
+
+    def count(self, name, value):
+        """记录一个计数（同名计数累加）。"""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def traced_peak(self):
+        """返回自上次重置以来 tracemalloc 记录的内存峰值（字节）。"""
+        return self.tracemalloc.get_traced_memory()[1]
+
+    def enter(self, frame):
+        if self.frames:
+            # 内层阶段开始前保存外层阶段到目前为止的峰值
+            parent = self.frames[-1]
+            parent.peak = max(parent.peak, self.traced_peak() - parent.base)
+        self.tracemalloc.reset_peak()
+        frame.base = self.tracemalloc.get_traced_memory()[0]
+        frame.peak = 0
+        frame.child_wall = frame.child_cpu = 0.0
+        self.frames.append(frame)
+        frame.wall = time.perf_counter()
+        frame.cpu = time.process_time()
+
+    def exit(self, frame):
+        wall = time.perf_counter() - frame.wall
+        cpu = time.process_time() - frame.cpu
+        self.frames.pop()
+        peak = max(frame.peak, self.traced_peak() - frame.base)
+
+        entry = self.stages.setdefault(frame.name, {"wall": 0.0, "cpu": 0.0, "peak": 0, "calls": 0})
+        entry["wall"] += wall - frame.child_wall
+        entry["cpu"] += cpu - frame.child_cpu
+        entry["peak"] = max(entry["peak"], peak)
+        entry["calls"] += 1
+
+        if self.frames:
+            # 内层阶段的时间不计入外层阶段，内存峰值则同时计入外层阶段
+            parent = self.frames[-1]
+            parent.child_wall += wall
+            parent.child_cpu += cpu
+            parent.peak = max(parent.peak, frame.base + peak - parent.base)
+            self.tracemalloc.reset_peak()
+
+    def report(self):
+        """
+        返回剖析结果。
+
+        返回：
+            dict: {"stages": {阶段名: {"wall_ms", "cpu_ms", "peak_kib", "calls"}}, "counters": {...}}，
+                  阶段按流水线顺序排列。
+        """
+        names = [name for name in STAGE_ORDER if name in self.stages]
+        names += [name for name in self.stages if name not in STAGE_ORDER]
+        stages = {}
+        for name in names:
+            entry = self.stages[name]
+            stages[name] = {
+                "wall_ms": round(entry["wall"] * 1000, 3),
+                "cpu_ms": round(entry["cpu"] * 1000, 3),
+                "peak_kib": round(entry["peak"] / 1024, 1),
+                "calls": entry["calls"],
+            }
+        return {"stages": stages, "counters": dict(self.counters)}
+
+    def print_table(self):
+        """以表格打印剖析结果。"""
+        report = self.report()
+        print(f"{'stage':<14} {'wall ms':>10} {'cpu ms':>10} {'peak KiB':>10}")
+        total_wall = total_cpu = 0.0
+        for name, entry in report["stages"].items():
+            total_wall += entry["wall_ms"]
+            total_cpu += entry["cpu_ms"]
+            print(f"{name:<14} {entry['wall_ms']:>10.2f} {entry['cpu_ms']:>10.2f} {entry['peak_kib']:>10.1f}")
+        print(f"{'total':<14} {total_wall:>10.2f} {total_cpu:>10.2f}")
+        if report["counters"]:
+            print(", ".join(f"{name}: {value}" for name, value in report["counters"].items()))
+
+    def write_json(self, path):
+        """把剖析结果写为 JSON 文件。"""
+        import json
+
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+def count_nodes(tree):
+    """返回语法树的节点个数（包括终结符叶子），用显式栈遍历。"""
+    count = 0
+    stack = [tree] if tree else []
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.get("children", ()))
+    return count
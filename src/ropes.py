@@ -0,0 +1,76 @@
+# ropes.py
+# 显示文本的惰性拼接：表达式、谓词的显示值保存为引用子节点显示值的 Rope，
+# 只有在写出（调用 str）时才渲染为字符串，构造的时间和内存都与表达式大小成线性关系。
+
+
+class Rope:
+    """
+    由若干部分拼接而成的惰性字符串。
+
+    部分可以是 str、int、另一个 Rope，或者提供 rope() 方法的集合值；
+    渲染用显式栈完成，很长的链也不会超过递归深度。
+    """
+
+    __slots__ = ("parts", "lowercase")
+
+    def __init__(self, *parts, lowercase=False):
+        """
+        参数：
+            parts: 按顺序拼接的各部分。
+            lowercase (bool): 为 True 时渲染结果转为小写。
+        """
+        self.parts = parts
+        self.lowercase = lowercase
+
+    def lower(self):
+        """返回渲染结果为小写的 Rope（不立即渲染）。"""
+        return Rope(self, lowercase=True)
+
+    def render(self):
+        """渲染为字符串。"""
+        out = []
+        stack = [self]
+        while stack:
+            part = stack.pop()
+            if isinstance(part, Rope):
+                if part.lowercase:
+                    out.append("".join(render_part(p) for p in part.parts).lower())
+                else:
+                    stack.extend(reversed(part.parts))
+            elif hasattr(part, "rope"):
+                stack.append(part.rope())
+            else:
+                out.append(str(part))
+        return "".join(out)
+
+    def __str__(self):
+        return self.render()
+
+    def __repr__(self):
+        return "Rope(" + repr(self.render()) + ")"
+
+
+def render_part(part):
+    """渲染 Rope 的一个部分。"""
+    if isinstance(part, Rope):
+        return part.render()
+    if hasattr(part, "rope"):
+        return part.rope().render()
+    return str(part)
+
+
+def format_result(result):
+    """
+    show 语句结果的显示值：多条 show 语句的结果（列表）显示为 [r1, r2, ...]，单个结果原样返回。
+
+    评估器和命令行（REPL、--watch）共用这一格式，列表只在写出时渲染。
+    """
+    if not isinstance(result, list):
+        return result
+    parts = ["["]
+    for index, item in enumerate(result):
+        if index:
+            parts.append(", ")
+        parts.append(item)
+    parts.append("]")
+    return Rope(*parts)
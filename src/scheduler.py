@@ -0,0 +1,126 @@
+# scheduler.py
+# 声明的并行物化：按标识符引用建立声明之间的依赖图（DAG），
+# 在进程池中并发地把互不依赖的集合声明物化为论域上的位图。
+# 集合值由闭包构成，不能在进程之间传递，因此工作进程收到的是声明的子树
+# 以及它传递依赖的声明子树和已经算好的结果（整数值或位图），在本地重建符号集合后再物化；
+# 主进程随后照常遍历语法树，集合声明直接使用算好的位图。
+from syntax_tree import program_declarations, referenced_identifiers
+
+
+def declaration_dependencies(declarations):
+    """
+    计算每条声明直接依赖的声明。
+
+    参数：
+        declarations (list): 按源码顺序排列的声明节点 D。
+
+    返回：
+        list: 第 i 项为第 i 条声明依赖的声明下标的集合（被引用的标识符在它之前的最后一次声明）。
+    """
+    latest = {}
+    dependencies = []
+    for index, d_node in enumerate(declarations):
+        names = referenced_identifiers(d_node['children'][4])
+        dependencies.append({latest[name] for name in names if name in latest})
+        latest[d_node['children'][2]['lexeme']] = index
+    return dependencies
+
+
+def transitive_dependencies(dependencies, index):
+    """返回第 index 条声明传递依赖的声明下标，按源码顺序排列。"""
+    result = set()
+    pending = list(dependencies[index])
+    while pending:
+        current = pending.pop()
+        if current not in result:
+            result.add(current)
+            pending.extend(dependencies[current])
+    return sorted(result)
+
+
+def materialize_declaration(target, dependencies, domain, words):
+    """
+    在工作进程中计算一条声明的值。
+
+    参数：
+        target (dict): 要计算的声明节点 D。
+        dependencies (list): 它传递依赖的 (声明节点, 结果) 列表，按源码顺序排列。
+        domain (tuple): 论域 (low, high)。
+        words (bool): 位图是否使用 NumPy uint64 数组。
+
+    返回：
+        int 或位图: 整数声明返回整数值，集合声明返回论域上的位图。
+    """
+    from bitsets import BitSet
+    from evaluator import Evaluator
+    from simplify import Simplifier
+
+    evaluator = Evaluator()
+    low, high = domain
+    for d_node, result in dependencies + [(target, None)]:
+        children = d_node['children']
+        var_type = children[1]['children'][0]['lexeme']
+        if var_type == 'int' and result is not None:
+            value = result
+        else:
+            Simplifier(evaluator).expand(d_node)
+            value = evaluator.evaluate_node(children[4])
+            if var_type == 'int':
+                value = int(value)
+            elif result is not None:
+                value = BitSet(value, low, high, result)
+        evaluator.symbol_table[children[2]['lexeme']] = {'type': var_type, 'value': value}
+    if var_type == 'int':
+        return value
+    return BitSet.from_set(value, low, high, words).bits
+
+
+def precompute_declarations(tree, domain, words=False, workers=None, live=None):
+    """
+    在进程池中按依赖顺序计算程序的声明，一条声明的依赖全部完成后立即提交，
+    因此总耗时取决于依赖图的关键路径而不是所有声明耗时之和。
+
+    计算失败的声明（例如引用了未声明的变量）及其下游声明不返回结果，
+    由主进程顺序评估时报告错误。
+
+    参数：
+        tree (dict): 类型检查后的根节点 S。
+        domain (tuple): 论域 (low, high)。
+        words (bool): 位图是否使用 NumPy uint64 数组。
+        workers (int): 工作进程个数，None 表示使用 CPU 个数。
+        live (set): 需要计算的声明节点的 id，None 表示全部计算。
+
+    返回：
+        dict: 集合声明节点的 id -> 位图（整数声明的结果只用作依赖，不返回）。
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    declarations = program_declarations(tree)
+    dependencies = declaration_dependencies(declarations)
+    selected = [i for i, d_node in enumerate(declarations) if live is None or id(d_node) in live]
+    results = {}
+    failed = set()
+    running = {}
+    remaining = list(selected)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while remaining or running:
+            for index in list(remaining):
+                if dependencies[index] & failed:
+                    failed.add(index)
+                    remaining.remove(index)
+                elif dependencies[index] <= results.keys():
+                    chain = [(declarations[i], results[i]) for i in transitive_dependencies(dependencies, index)]
+                    future = pool.submit(materialize_declaration, declarations[index], chain, domain, words)
+                    running[future] = index
+                    remaining.remove(index)
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                if future.exception() is None:
+                    results[index] = future.result()
+                else:
+                    failed.add(index)
+    return {id(declarations[index]): value for index, value in results.items()
+            if declarations[index]['children'][1]['children'][0]['lexeme'] == 'set'}
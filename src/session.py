@@ -0,0 +1,345 @@
+# session.py
+# 常驻内存的编译会话：类型检查器和评估器的状态在多次运行之间保持，
+# 每条声明按内容哈希缓存其处理后的符号表，未改变的声明不会重新检查和评估。
+import hashlib
+from lexer import Lexer, LexicalError
+from parser import SLRParser, ParseError
+from type_checker import TypeChecker, TYPE_ERROR
+from evaluator import Evaluator, DecisionError
+from backend import numpy_module
+from simplify import Simplifier
+from syntax_tree import program_declarations, program_shows
+
+
+def node_digest(node):
+    """
+    计算语法树节点的内容哈希（按叶子节点的 lexeme 顺序）。
+
+    参数：
+        node (dict): 语法树节点。
+
+    返回：
+        str: 十六进制摘要。
+    """
+    digest = hashlib.sha256()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if "token" in current:
+            digest.update(current["lexeme"].encode("utf-8"))
+            digest.update(b"\0")
+        else:
+            stack.extend(reversed(current.get("children", [])))
+    return digest.hexdigest()
+
+
+# 只有声明的输入在语法上不是完整的程序，补上一个占位的 show 语句后再进行语法分析
+SHOW_STUB_TOKENS = [
+    {"token": "show", "lexeme": "show"},
+    {"token": "num", "lexeme": "0"},
+    {"token": ".", "lexeme": "."},
+]
+
+
+class SessionError(Exception):
+    """会话中某个阶段失败（词法、语法或类型错误）。"""
+
+
+def scan(source_code):
+    """对源代码进行词法分析，不打印也不写出文件；词法错误时抛出 SessionError。"""
+    try:
+        return Lexer(source_code).scan()
+    except LexicalError as e:
+        raise SessionError("Lexical Error!") from e
+
+
+class Session:
+    def __init__(self, action_table, goto_table, table_digest=""):
+        """
+        初始化编译会话。
+
+        参数：
+            action_table (dict): SLR ACTION 表。
+            goto_table (dict): SLR GOTO 表。
+            table_digest (str): 解析表内容的哈希，解析表改变时所有缓存的声明都会失效。
+        """
+        self.action_table = action_table
+        self.goto_table = goto_table
+        self.table_digest = table_digest
+        self.type_checker = TypeChecker(None, None)
+        self.evaluator = Evaluator()
+        # 每条已处理声明一项：(链式哈希, 类型检查符号表, 评估符号表)
+        self.snapshots = []
+        self.stats = {"declarations_reused": 0, "declarations_evaluated": 0}
+
+    def parse(self, source_code):
+        """
+        对源代码进行词法和语法分析，返回语法树（不打印，也不写出中间文件）。
+
+        异常：
+            SessionError: 词法或语法错误。
+        """
+        return self.derive(scan(source_code))
+
+    def derive(self, tokens):
+        """对词法单元序列进行语法分析，返回语法树；语法错误时抛出 SessionError。"""
+        try:
+            return SLRParser(tokens, self.action_table, self.goto_table).derive()
+        except ParseError as e:
+            raise SessionError("Syntax Error!") from e
+
+    def restore(self, index):
+        """将类型检查器和评估器的符号表恢复到第 index 条声明之后的状态。"""
+        if index == 0:
+            self.type_checker.symbol_table = {}
+            self.evaluator.symbol_table = {}
+        else:
+            _, checker_table, evaluator_table = self.snapshots[index - 1]
+            self.type_checker.symbol_table = dict(checker_table)
+            self.evaluator.symbol_table = dict(evaluator_table)
+
+    def declare(self, d_node):
+        """
+        对一条声明进行类型检查和评估，更新会话的符号表。
+
+        参数：
+            d_node (dict): 声明节点 D。
+
+        异常：
+            SessionError: 声明存在类型错误。
+        """
+        self.type_checker.type_error_flag = False
+        if self.type_checker.type_check_node(d_node) == TYPE_ERROR:
+            raise SessionError("Type Error!")
+        self.evaluator.evaluate_node(d_node)
+        self.stats["declarations_evaluated"] += 1
+
+    def show_all(self, c_nodes):
+        """
+        按顺序评估多条 show 语句。
+
+        返回：
+            只有一条 show 语句时返回它的结果，否则返回各结果组成的列表。
+        """
+        results = [self.show(c_node) for c_node in c_nodes]
+        return results[0] if len(results) == 1 else results
+
+    def show(self, c_node):
+        """
+        在当前符号表下对 show 语句进行类型检查和评估。
+
+        参数：
+            c_node (dict): 计算节点 C。
+
+        返回：
+            show 语句的结果。
+        """
+        self.type_checker.type_error_flag = False
+        if self.type_checker.type_check_node(c_node) == TYPE_ERROR:
+            raise SessionError("Type Error!")
+        return self.evaluator.evaluate_node(c_node)
+
+    def run(self, source_code):
+        """
+        运行整个程序，复用内容和前缀都未改变的声明的结果。
+
+        声明 i 的链式哈希由声明 i-1 的链式哈希与声明 i 的内容哈希组成，
+        因此某条声明改变时，它和之后的声明都会重新处理。
+
+        参数：
+            source_code (str): 程序源代码。
+
+        返回：
+            show 语句的结果；有多条 show 语句时为各结果组成的列表。
+        """
+        tree = self.parse(source_code)
+        declarations, c_nodes = program_declarations(tree), program_shows(tree)
+
+        chain = self.table_digest
+        for index, d_node in enumerate(declarations):
+            chain = hashlib.sha256((chain + node_digest(d_node)).encode("utf-8")).hexdigest()
+            if index < len(self.snapshots) and self.snapshots[index][0] == chain:
+                self.stats["declarations_reused"] += 1
+                continue
+            del self.snapshots[index:]
+            self.restore(index)
+            self.declare(d_node)
+            self.snapshots.append(
+                (chain, dict(self.type_checker.symbol_table), dict(self.evaluator.symbol_table))
+            )
+        del self.snapshots[len(declarations):]
+
+        self.restore(len(declarations))
+        return self.show_all(c_nodes)
+
+    def execute(self, source_code):
+        """
+        交互式地执行一段输入。
+
+        声明只处理一次，结果保存在会话的符号表中；show 语句直接在已保存的符号表上评估，
+        因此响应时间与会话中已有声明的数量无关。
+
+        参数：
+            source_code (str): 一条或多条声明，可以以一条或多条 show 语句结尾。
+
+        返回：
+            show 语句的结果（多条时为列表）；输入只包含声明时返回 None。
+        """
+        tokens = scan(source_code)
+        has_show = any(token["token"] == "show" for token in tokens)
+        if not has_show:
+            tokens = tokens + SHOW_STUB_TOKENS
+        tree = self.derive(tokens)
+        declarations, c_nodes = program_declarations(tree), program_shows(tree)
+        for d_node in declarations:
+            self.declare(d_node)
+        if not has_show:
+            return None
+        return self.show_all(c_nodes)
+
+    def compile_sweep(self, source_code, parameters):
+        """
+        编译一个独立的程序用于参数扫描（见 sweep.ParameterSweep）。
+
+        程序只做一次词法、语法分析和类型检查，不使用也不修改会话中的声明。
+
+        参数：
+            source_code (str): 完整的程序源代码。
+            parameters (iterable): 作为参数的 int 变量名。
+
+        返回：
+            ParameterSweep: 调用 run(name=数组, ...) 在整批参数值上求值。
+
+        异常：
+            SessionError: 程序存在词法、语法或类型错误。
+        """
+        from sweep import ParameterSweep
+
+        tree = self.parse(source_code)
+        type_checker = TypeChecker(None, None)
+        if type_checker.type_check_node(tree) == TYPE_ERROR:
+            raise SessionError("Type Error!")
+        return ParameterSweep(tree, parameters)
+
+    def compile_set_expression(self, expression):
+        """
+        在当前符号表下编译一个集合表达式。
+
+        参数：
+            expression (str): 已声明的集合变量名或集合表达式，例如 "y" 或 "{ x : x > 3 } U y"，
+                              可以引用会话中已声明的变量。
+
+        返回：
+            SetValue: 编译后的集合。
+
+        异常：
+            SessionError: 表达式存在词法、语法或类型错误，或不是集合。
+        """
+        tree = self.parse(f"show {expression} .")
+        c_nodes = program_shows(tree)
+        if len(c_nodes) != 1:
+            raise SessionError(f"Not a single set expression: {expression}")
+        c_node = c_nodes[0]
+        self.type_checker.type_error_flag = False
+        if self.type_checker.type_check_node(c_node) == TYPE_ERROR:
+            raise SessionError("Type Error!")
+        a_node = c_node["children"][1]
+        if a_node["children"][0].get("type") != "set":
+            raise SessionError(f"Not a set expression: {expression}")
+        Simplifier(self.evaluator).expand(a_node)
+        return self.evaluator.compile_set(a_node["children"][0], frozenset())({})
+
+    def members(self, expression, low, high, limit=None, offset=0):
+        """
+        按升序惰性地枚举集合表达式在 [low, high] 内的元素（见 Evaluator.enumerate_set）。
+
+        参数：
+            expression (str): 集合变量名或集合表达式。
+            low (int): 下界。
+            high (int): 上界（包含）。
+            limit (int): 最多产生的元素个数，None 表示不限。
+            offset (int): 跳过的前若干个元素个数。
+
+        返回：
+            generator: 元素的生成器。
+        """
+        set_value = self.compile_set_expression(expression)
+        return self.evaluator.enumerate_set(set_value, low, high, limit, offset)
+
+    def definition(self, expression, low=None, high=None):
+        """
+        将集合表达式在有限范围内展开为 Python 集合（见 Evaluator.set_definition）。
+
+        参数：
+            expression (str): 集合变量名或集合表达式。
+            low (int): 下界，None 表示由集合推断范围（见 Evaluator.infer_window）。
+            high (int): 上界（包含）。
+
+        返回：
+            set: 范围内的全部元素。
+        """
+        return self.evaluator.set_definition(self.compile_set_expression(expression), low, high)
+
+    def decide(self, decision, *args):
+        """调用评估器的判定过程，把无法判定的情况转换为 SessionError。"""
+        try:
+            return decision(*args)
+        except DecisionError as e:
+            raise SessionError(str(e)) from e
+
+    def is_empty(self, expression, low=None, high=None):
+        """判断集合表达式在 [low, high] 内是否为空（见 Evaluator.decision_intervals）。"""
+        return self.decide(self.evaluator.set_is_empty, self.compile_set_expression(expression), low, high)
+
+    def is_subset(self, left, right, low=None, high=None):
+        """判断在 [low, high] 内集合表达式 left 是否包含于 right。"""
+        return self.decide(self.evaluator.set_is_subset, self.compile_set_expression(left),
+                           self.compile_set_expression(right), low, high)
+
+    def equal(self, left, right, low=None, high=None):
+        """判断两个集合表达式在 [low, high] 内是否相等。"""
+        return self.decide(self.evaluator.sets_equal, self.compile_set_expression(left),
+                           self.compile_set_expression(right), low, high)
+
+    def cardinality(self, expression, low=None, high=None):
+        """返回集合表达式在 [low, high] 内的元素个数，无界时返回 inf。"""
+        return self.decide(self.evaluator.set_cardinality, self.compile_set_expression(expression), low, high)
+
+    def set_query(self, expression):
+        """
+        编译一个批量成员测试：集合只编译一次，之后每次调用对整个数组求值。
+
+        参数：
+            expression (str): 集合变量名或集合表达式（见 compile_set_expression）。
+
+        返回：
+            callable: 接收一维整数数组（或任意整数序列），返回等长的布尔数组；
+                      未安装 NumPy 时返回 bool 列表。
+                      值超出 int64 范围时，这一批逐个调用 contains()。
+        """
+        set_value = self.compile_set_expression(expression)
+        np = numpy_module()
+        if np is None:
+            return lambda values: [set_value.contains(int(n)) for n in values]
+
+        def query(values):
+            try:
+                array = np.asarray(values, dtype=np.int64)
+            except OverflowError:
+                return np.array([set_value.contains(int(n)) for n in values], dtype=bool)
+            return set_value.mask(array)
+
+        return query
+
+    def contains_batch(self, values, expression):
+        """
+        批量成员测试：values 中的每个整数是否属于 expression 表示的集合。
+
+        参数：
+            values: 整数数组或序列。
+            expression (str): 集合变量名或集合表达式。
+
+        返回：
+            布尔数组（未安装 NumPy 时为 bool 列表）。
+        """
+        return self.set_query(expression)(values)
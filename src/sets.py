@@ -0,0 +1,354 @@
+# sets.py
+# 集合值类型：集合构造式 { x : P } 保存为其约束变量上的已编译谓词，
+# 并集、交集和成员测试都是一等操作，不再通过字符串拼接和 eval 实现。
+# 能规范化为整数区间列表的集合同时保存其 Intervals，成员测试走二分查找。
+import heapq
+from collections import OrderedDict
+from backend import numpy_module
+from ropes import Rope
+
+DEFAULT_MEMBERSHIP_ENTRIES = 65536  # 成员测试缓存默认最多保存的 (集合, 值) 结果个数
+SCAN_BLOCK = 4096  # 逐段扫描枚举元素时每段的整数个数
+
+
+class SetValue:
+    """
+    集合值的基类。
+
+    子类需要实现 contains(n) 和 rope()（或 __str__）；它们给出写入 evaluation_out.json 的显示文本。
+    """
+
+    # 显示时的运算优先级，数值越小结合越松（用于决定是否需要加括号）
+    precedence = 3
+    # 集合的区间列表表示（intervals.Intervals），无法表示为区间并时为 None
+    intervals = None
+    # 成员关系半径：|n| > radius 时 n 是否属于集合在两侧分别不变，未知时为 None
+    radius = None
+
+    def contains(self, n):
+        """判断整数 n 是否属于该集合。"""
+        raise NotImplementedError
+
+    def mask(self, values):
+        """
+        向量化成员测试（需要 NumPy）。
+
+        参数：
+            values (numpy.ndarray): int64 数组。
+
+        返回：
+            numpy.ndarray: 布尔数组，values[i] 属于集合时为 True。
+        """
+        np = numpy_module()
+        if self.intervals is not None:
+            return self.intervals.mask(values)
+        return np.fromiter((self.contains(int(v)) for v in values), dtype=bool, count=len(values))
+
+    def members(self, low, high):
+        """
+        按升序逐个产生 [low, high] 内的元素，内存占用与元素个数无关。
+
+        有区间列表时直接按区间产生并跳过空隙；否则按 SCAN_BLOCK 分段，
+        每段做一次（向量化的）成员测试。
+
+        参数：
+            low (int): 下界。
+            high (int): 上界（包含）。
+
+        返回：
+            generator: 元素的生成器。
+        """
+        if self.intervals is not None:
+            yield from self.intervals.members(low, high)
+            return
+        np = numpy_module()
+        start = low
+        while start <= high:
+            end = min(start + SCAN_BLOCK - 1, high)
+            if np is None:
+                for n in range(start, end + 1):
+                    if self.contains(n):
+                        yield n
+            else:
+                values = np.arange(start, end + 1, dtype=np.int64)
+                yield from values[self.mask(values)].tolist()
+            start = end + 1
+
+    def membership_radius(self):
+        """返回成员关系半径（见 radius），有区间列表时由端点得出。"""
+        if self.intervals is not None:
+            return self.intervals.radius()
+        return self.radius
+
+    def union(self, other):
+        """返回 self U other。"""
+        return UnionSet(self, other)
+
+    def intersection(self, other):
+        """返回 self I other。"""
+        return IntersectionSet(self, other)
+
+    def __contains__(self, n):
+        return self.contains(n)
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def rope(self):
+        """返回显示文本的 Rope，子集合的显示文本按引用拼接。"""
+        return Rope(str(self))
+
+    def render_operand(self, operand):
+        """子集合的显示文本，优先级低于自身时加括号。"""
+        if operand.precedence < self.precedence:
+            return Rope("(", operand, ")")
+        return operand
+
+
+class BuilderSet(SetValue):
+    def __init__(self, variable, predicate, text=None, intervals=None, vector_predicate=None, radius=None):
+        """
+        集合构造式 { variable : P }。
+
+        参数：
+            variable (str): 约束变量名。
+            predicate (callable): 已编译的谓词，接收约束变量的值，返回 bool。
+            text (str): 谓词的显示文本。
+            intervals (Intervals): 谓词规范化得到的区间列表，无法规范化时为 None。
+            vector_predicate (callable): 向量化谓词，接收 NumPy 整数数组，返回布尔数组。
+            radius (int): 谓词的成员关系半径（见 Evaluator.predicate_radius），未知时为 None。
+        """
+        self.variable = variable
+        self.predicate = predicate
+        self.text = text
+        self.intervals = intervals
+        self.vector_predicate = vector_predicate
+        self.radius = radius
+        self.tails = None  # (n < -radius 时的结果, n > radius 时的结果)，首次使用时计算
+
+    def contains(self, n):
+        if self.intervals is not None:
+            return self.intervals.contains(n)
+        if self.radius is not None and abs(n) > self.radius:
+            # 半径以外成员关系不变，用边界外的一个值代表整侧
+            if self.tails is None:
+                self.tails = (bool(self.predicate(-self.radius - 1)), bool(self.predicate(self.radius + 1)))
+            return self.tails[n > 0]
+        return bool(self.predicate(n))
+
+    def mask(self, values):
+        if self.intervals is None and self.vector_predicate is not None:
+            return self.vector_predicate(values)
+        return super().mask(values)
+
+    def rope(self):
+        return Rope("{ ", self.variable, ": ", self.text, " }")
+
+    def __str__(self):
+        return self.rope().render()
+
+
+def combined_radius(left, right):
+    """两个集合的并、交的成员关系半径：两侧半径都已知时取较大者。"""
+    left_radius, right_radius = left.membership_radius(), right.membership_radius()
+    if left_radius is None or right_radius is None:
+        return None
+    return max(left_radius, right_radius)
+
+
+class UnionSet(SetValue):
+    precedence = 1
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+        if left.intervals is not None and right.intervals is not None:
+            self.intervals = left.intervals.union(right.intervals)
+        self.radius = combined_radius(left, right)
+
+    def contains(self, n):
+        if self.intervals is not None:
+            return self.intervals.contains(n)
+        return self.left.contains(n) or self.right.contains(n)
+
+    def mask(self, values):
+        if self.intervals is not None:
+            return self.intervals.mask(values)
+        return self.left.mask(values) | self.right.mask(values)
+
+    def members(self, low, high):
+        if self.intervals is not None:
+            yield from super().members(low, high)
+            return
+        # 合并两个有序的元素流，去掉重复的元素
+        previous = None
+        for n in heapq.merge(self.left.members(low, high), self.right.members(low, high)):
+            if n != previous:
+                yield n
+                previous = n
+
+    def rope(self):
+        return Rope(self.render_operand(self.left), " U ", self.render_operand(self.right))
+
+    def __str__(self):
+        return self.rope().render()
+
+
+class IntersectionSet(SetValue):
+    precedence = 2
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+        if left.intervals is not None and right.intervals is not None:
+            self.intervals = left.intervals.intersection(right.intervals)
+        self.radius = combined_radius(left, right)
+
+    def contains(self, n):
+        if self.intervals is not None:
+            return self.intervals.contains(n)
+        return self.left.contains(n) and self.right.contains(n)
+
+    def mask(self, values):
+        if self.intervals is not None:
+            return self.intervals.mask(values)
+        return self.left.mask(values) & self.right.mask(values)
+
+    def members(self, low, high):
+        if self.intervals is None and (self.left.intervals is not None or self.right.intervals is not None):
+            # 由有区间列表的一侧产生候选元素（跳过空隙），再用另一侧过滤
+            driver, other = self.left, self.right
+            if driver.intervals is None:
+                driver, other = other, driver
+            for n in driver.members(low, high):
+                if other.contains(n):
+                    yield n
+            return
+        yield from super().members(low, high)
+
+    def rope(self):
+        return Rope(self.render_operand(self.left), " I ", self.render_operand(self.right))
+
+    def __str__(self):
+        return self.rope().render()
+
+
+class MembershipCache:
+    def __init__(self, max_entries=DEFAULT_MEMBERSHIP_ENTRIES):
+        """
+        有界的成员测试结果缓存，键为 (集合绑定, 值)，超出上限时按最近最少使用（LRU）淘汰。
+
+        参数：
+            max_entries (int): 最多保存的结果个数。
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (绑定, 值) -> bool
+        self.values = {}  # 绑定 -> 该绑定已缓存的值的集合，用于失效
+        self.counters = {}  # 绑定 -> [命中数, 未命中数]
+        self.evictions = 0
+        self.invalidations = 0
+
+    def lookup(self, binding, n, compute):
+        """
+        查询 n 是否属于 binding 对应的集合，未缓存时调用 compute(n) 计算并保存。
+
+        参数：
+            binding (tuple): 集合绑定的标识 (变量名, 序号)。
+            n (int): 被测试的整数。
+            compute (callable): 实际的成员测试。
+
+        返回：
+            bool: 成员测试结果。
+        """
+        key = (binding, n)
+        counter = self.counters.setdefault(binding, [0, 0])
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            counter[0] += 1
+            return self.entries[key]
+        counter[1] += 1
+        result = bool(compute(n))
+        self.entries[key] = result
+        self.values.setdefault(binding, set()).add(n)
+        if len(self.entries) > self.max_entries:
+            (old_binding, old_n), _ = self.entries.popitem(last=False)
+            self.values[old_binding].discard(old_n)
+            self.evictions += 1
+        return result
+
+    def invalidate(self, binding):
+        """删除某个集合绑定的全部缓存结果（变量被重新声明时调用）。"""
+        for n in self.values.pop(binding, ()):
+            del self.entries[(binding, n)]
+        if self.counters.pop(binding, None) is not None:
+            self.invalidations += 1
+
+    def stats(self):
+        """
+        获取缓存统计信息。
+
+        返回：
+            dict: 总命中数、未命中数、命中率、淘汰数、失效数、条目数，
+                  以及每个仍有效的集合绑定的命中率（键为变量名）。
+        """
+        hits = sum(counter[0] for counter in self.counters.values())
+        misses = sum(counter[1] for counter in self.counters.values())
+        per_set = {}
+        for (name, _), (set_hits, set_misses) in self.counters.items():
+            entry = per_set.setdefault(name, {"hits": 0, "misses": 0})
+            entry["hits"] += set_hits
+            entry["misses"] += set_misses
+        for entry in per_set.values():
+            total = entry["hits"] + entry["misses"]
+            entry["hit_rate"] = entry["hits"] / total if total else 0.0
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self.entries),
+            "sets": per_set,
+        }
+
+
+class MemoizedSet(SetValue):
+    def __init__(self, inner, cache, binding):
+        """
+        已声明集合的成员测试缓存包装：contains 的结果保存在 MembershipCache 中，
+        其余操作（显示、向量化测试、属性）都转发给原集合。
+
+        参数：
+            inner (SetValue): 原集合。
+            cache (MembershipCache): 共享的成员测试缓存。
+            binding (tuple): 集合绑定的标识 (变量名, 序号)，每次声明都不同。
+        """
+        self.inner = inner
+        self.cache = cache
+        self.binding = binding
+        self.precedence = inner.precedence
+        self.intervals = inner.intervals
+        self.radius = inner.radius
+
+    def contains(self, n):
+        return self.cache.lookup(self.binding, n, self.inner.contains)
+
+    def mask(self, values):
+        return self.inner.mask(values)
+
+    def members(self, low, high):
+        return self.inner.members(low, high)
+
+    def __getattr__(self, name):
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def rope(self):
+        return self.inner.rope()
+
+    def __str__(self):
+        return str(self.inner)
@@ -0,0 +1,104 @@
+# shortcircuit.py
+# 谓词的短路求值顺序：把同一运算符（& 或 |）连接的操作数收集为一组，
+# 按静态代价估计排序；运行时统计每个操作数“决定结果”的比例（& 中为假、| 中为真），
+# 定期按 代价 / 决定概率 重新排序，使代价高的成员测试排在后面，只在需要时才执行。
+
+DECLARED_SET_COST = 4  # 对已声明集合做成员测试的估计代价（区间、位集合或缓存，都很快）
+REORDER_INTERVAL = 64  # 每求值多少次按观察到的选择率重新排序一次
+
+
+def integer_cost(node):
+    """整数表达式的估计代价：终结符个数。"""
+    if 'token' in node:
+        return 1
+    return sum(integer_cost(child) for child in node.get('children', []))
+
+
+def set_cost(node):
+    """对集合表达式做一次成员测试的估计代价。"""
+    if 'token' in node:
+        return DECLARED_SET_COST
+    children = node.get('children', [])
+    if len(children) == 1:
+        return set_cost(children[0])
+    if len(children) == 4:
+        # E'' -> { Z P }：成员测试要求值整个内层谓词
+        return 1 + predicate_cost(children[2])
+    if children[0].get('token') == '(':
+        return set_cost(children[1])
+    return set_cost(children[0]) + set_cost(children[2])
+
+
+def predicate_cost(node):
+    """谓词（P、P'、P''、R）求值一次的估计代价（最坏情况）。"""
+    children = node.get('children', [])
+    if node.get('name') == 'R':
+        if children[1]['lexeme'] == '@':
+            return integer_cost(children[0]) + set_cost(children[2])
+        return integer_cost(children[0]) + integer_cost(children[2]) + 1
+    return sum(predicate_cost(child) for child in children if 'token' not in child)
+
+
+def group_operands(node, operator):
+    """
+    收集由同一运算符连接的操作数（跨过单子节点和括号），按源码顺序排列。
+
+    参数：
+        node (dict): 谓词节点。
+        operator (str): '&' 或 '|'。
+
+    返回：
+        list: 操作数节点。
+    """
+    children = node.get('children', [])
+    if node.get('name') == 'R' or len(children) == 2:
+        return [node]
+    if len(children) == 1:
+        return group_operands(children[0], operator)
+    if children[0].get('token') == '(':
+        return group_operands(children[1], operator)
+    if children[1]['lexeme'] != operator:
+        return [node]
+    return group_operands(children[0], operator) + group_operands(children[2], operator)
+
+
+class ShortCircuitGroup:
+    """
+    & 或 | 连接的一组已编译谓词，按自适应的顺序短路求值。
+
+    各操作数都是纯函数，任意顺序求值的结果相同，只是代价不同。
+    """
+
+    __slots__ = ("operands", "costs", "conjunction", "order", "evaluated", "decided", "calls")
+
+    def __init__(self, operands, costs, conjunction):
+        """
+        参数：
+            operands (list): 已编译的谓词，接收约束变量环境 env，返回 bool。
+            costs (list): 各谓词的静态代价估计。
+            conjunction (bool): True 表示 &，False 表示 |。
+        """
+        self.operands = list(operands)
+        self.costs = list(costs)
+        self.conjunction = conjunction
+        self.order = sorted(range(len(self.operands)), key=lambda i: self.costs[i])
+        self.evaluated = [0] * len(self.operands)  # 每个操作数被求值的次数
+        self.decided = [0] * len(self.operands)  # 每个操作数决定了整组结果的次数
+        self.calls = 0
+
+    def reorder(self):
+        """按 代价 / 决定结果的概率 升序重新排列（概率用加一平滑估计）。"""
+        self.order.sort(key=lambda i: self.costs[i] * (self.evaluated[i] + 2) / (self.decided[i] + 1))
+
+    def __call__(self, env):
+        self.calls += 1
+        if self.calls % REORDER_INTERVAL == 0:
+            self.reorder()
+        # & 遇到假、| 遇到真即可确定结果
+        decisive = not self.conjunction
+        for i in self.order:
+            self.evaluated[i] += 1
+            if bool(self.operands[i](env)) == decisive:
+                self.decided[i] += 1
+                return decisive
+        return not decisive
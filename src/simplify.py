@@ -0,0 +1,461 @@
+# simplify.py
+# simplify 关键字：对集合表达式和谓词做代数化简，并把化简结果写回语法树。
+# 谓词先转换为由 and / or / not、常量和区间约束组成的中间表示，
+# 化简后再生成符合文法结构（E/E'/E''、P/P'/P''）且带类型的语法树节点，
+# 因此后续的评估、显示和编译都直接作用于化简后的表达式。
+from intervals import Intervals, NEG_INF, POS_INF
+from syntax_tree import leaf_lexemes
+
+TRUE = ('const', True)
+FALSE = ('const', False)
+
+
+def terminal(token, lexeme=None, node_type='void'):
+    return {'token': token, 'lexeme': token if lexeme is None else lexeme, 'type': node_type}
+
+
+def nonterminal(name, node_type, children):
+    return {'name': name, 'type': node_type, 'children': children}
+
+
+def is_simplify(node):
+    """判断节点是否为 E'' -> simplify E''。"""
+    children = node.get('children', [])
+    return node.get('name') == "E''" and len(children) == 2 and children[0].get('token') == 'simplify'
+
+
+###############################################################################
+# 语法树节点的生成
+###############################################################################
+
+def integer_node(value):
+    """生成整数常量的表达式节点 E（负数写成 0 - n）。"""
+    if value >= 0:
+        return nonterminal('E', 'integer', [primary_integer(terminal('num', str(value), 'integer'))])
+    return nonterminal('E', 'integer', [
+        nonterminal('E', 'integer', [primary_integer(terminal('num', '0', 'integer'))]),
+        terminal('-'),
+        primary_integer(terminal('num', str(-value), 'integer')),
+    ])
+
+
+def variable_node(variable):
+    """生成约束变量的表达式节点 E。"""
+    return nonterminal('E', 'integer', [primary_integer(terminal('id', variable))])
+
+
+def primary_integer(leaf):
+    return nonterminal("E'", 'integer', [nonterminal("E''", 'integer', [leaf])])
+
+
+def relation_node(left, operator, right):
+    return nonterminal('R', 'relation', [left, terminal(operator), right])
+
+
+def interval_relations(variable, lo, hi):
+    """区间 [lo, hi] 对应的关系列表（它们的合取）。"""
+    if lo == hi:
+        return [relation_node(variable_node(variable), '=', integer_node(lo))]
+    relations = []
+    if lo != NEG_INF:
+        relations.append(relation_node(variable_node(variable), '>', integer_node(lo - 1)))
+    if hi != POS_INF:
+        relations.append(relation_node(variable_node(variable), '<', integer_node(hi + 1)))
+    return relations
+
+
+def constant_relation(value):
+    """恒真谓词写作 0 = 0，恒假谓词写作 0 = 1。"""
+    return relation_node(integer_node(0), '=', integer_node(0 if value else 1))
+
+
+###############################################################################
+# 化简器
+###############################################################################
+
+class Simplifier:
+    def __init__(self, evaluator):
+        """
+        参数：
+            evaluator (Evaluator): 提供已声明变量的值以及谓词的编译和区间规范化。
+        """
+        self.evaluator = evaluator
+
+    def expand(self, node, bound=frozenset()):
+        """
+        化简子树中所有的 simplify 表达式（由内向外），并用化简结果原地替换 simplify 节点。
+
+        参数：
+            node (dict): 语法树节点。
+            bound (frozenset): 当前作用域内的约束变量名。
+
+        返回：
+            int: 被替换的 simplify 节点个数。
+        """
+        if 'token' in node:
+            return 0
+        children = node.get('children', [])
+        inner_bound = bound
+        if node.get('name') == "E''" and len(children) == 4:
+            inner_bound = bound | {children[1]['children'][0]['lexeme']}
+        count = 0
+        for child in children:
+            count += self.expand(child, inner_bound)
+        if is_simplify(node):
+            replacement = self.simplify_expression(children[1], bound)
+            node.clear()
+            node.update(replacement)
+            count += 1
+        return count
+
+    def simplify_expression(self, node, bound):
+        """
+        化简一个 E'' 节点，返回化简后的 E'' 节点。
+
+        参数：
+            node (dict): 被 simplify 作用的 E'' 节点。
+            bound (frozenset): 当前作用域内的约束变量名。
+        """
+        if node.get('type') == 'integer':
+            if bound & set(leaf_lexemes(node)):
+                return node
+            value = self.evaluator.compile_integer(node, frozenset())({})
+            return self.wrap_primary(integer_node(value), 'integer')
+        ir = self.simplify_set(self.set_ir(node, bound), bound)
+        return self.wrap_primary(self.emit_set(ir), 'set')
+
+    def wrap_primary(self, e_node, node_type):
+        """把 E 节点转换为 E'' 节点：单个初等式直接取出，否则加括号。"""
+        e_prime = e_node['children'][0]
+        if len(e_node['children']) == 1 and len(e_prime['children']) == 1:
+            return e_prime['children'][0]
+        return nonterminal("E''", node_type, [terminal('('), e_node, terminal(')')])
+
+    # ---------------------------------------------------------------- 谓词
+
+    def predicate_ir(self, node):
+        """将谓词子树转换为中间表示（不做化简）。"""
+        name = node.get('name')
+        children = node.get('children', [])
+        if name == 'R':
+            return ('rel', node)
+        if len(children) == 1:
+            return self.predicate_ir(children[0])
+        if len(children) == 2:
+            return ('not', self.predicate_ir(children[1]))
+        if children[0].get('token') == '(':
+            return self.predicate_ir(children[1])
+        kind = 'or' if children[1]['lexeme'] == '|' else 'and'
+        return (kind, [self.predicate_ir(children[0]), self.predicate_ir(children[2])])
+
+    def simplify_predicate(self, ir, variable, bound):
+        """
+        化简谓词的中间表示。
+
+        关系两侧都不含约束变量时直接求值；能规范化为 variable 的区间约束的关系
+        转换为 ('set', Intervals)，同一合取或析取中的区间约束合并为一个；
+        否定下推到关系上，重复项和互补项被消去。
+
+        参数：
+            ir (tuple): 谓词的中间表示。
+            variable (str): 集合构造式的约束变量。
+            bound (frozenset): 当前作用域内的约束变量名（包括 variable）。
+
+        返回：
+            tuple: 化简后的中间表示。
+        """
+        kind = ir[0]
+        if kind == 'rel':
+            node = ir[1]
+            if not bound & set(leaf_lexemes(node)):
+                return ('const', bool(self.evaluator.compile_predicate(node, frozenset())({})))
+            intervals = self.evaluator.normalize_predicate(node, variable, bound)
+            if intervals is not None:
+                return self.interval_ir(intervals)
+            return ir
+        if kind == 'not':
+            return self.negate(self.simplify_predicate(ir[1], variable, bound))
+        if kind in ('and', 'or'):
+            return self.combine(kind, [self.simplify_predicate(child, variable, bound) for child in ir[1]])
+        return ir
+
+    def interval_ir(self, intervals):
+        if intervals.is_empty():
+            return FALSE
+        if intervals == Intervals.everything():
+            return TRUE
+        return ('set', intervals)
+
+    def negate(self, ir):
+        """否定一个已化简的中间表示（德摩根律下推到关系上）。"""
+        kind = ir[0]
+        if kind == 'const':
+            return ('const', not ir[1])
+        if kind == 'set':
+            return self.interval_ir(ir[1].complement())
+        if kind == 'rel':
+            return ('not', ir)
+        if kind == 'not':
+            return ir[1]
+        dual = 'or' if kind == 'and' else 'and'
+        return self.combine(dual, [self.negate(child) for child in ir[1]])
+
+    def combine(self, kind, operands):
+        """
+        化简合取（and）或析取（or）。
+
+        参数：
+            kind (str): 'and' 或 'or'。
+            operands (list): 已化简的运算对象。
+        """
+        absorbing, neutral = (FALSE, TRUE) if kind == 'and' else (TRUE, FALSE)
+        flat = []
+        for operand in operands:
+            flat.extend(operand[1] if operand[0] == kind else [operand])
+
+        intervals = None
+        rest = []
+        keys = set()
+        for operand in flat:
+            if operand == absorbing:
+                return absorbing
+            if operand == neutral:
+                continue
+            if operand[0] == 'set':
+                if intervals is None:
+                    intervals = operand[1]
+                elif kind == 'and':
+                    intervals = intervals.intersection(operand[1])
+                else:
+                    intervals = intervals.union(operand[1])
+                continue
+            key = self.predicate_key(operand)
+            if key in keys:
+                continue
+            if self.predicate_key(self.negate(operand)) in keys:
+                # P & !P 恒假，P | !P 恒真
+                return absorbing
+            keys.add(key)
+            rest.append(operand)
+
+        if intervals is not None:
+            merged = self.interval_ir(intervals)
+            if merged == absorbing:
+                return absorbing
+            if merged != neutral:
+                rest.insert(0, merged)
+        if not rest:
+            return neutral
+        if len(rest) == 1:
+            return rest[0]
+        return (kind, rest)
+
+    def predicate_key(self, ir):
+        """中间表示的结构键，用于识别重复项。"""
+        kind = ir[0]
+        if kind == 'rel':
+            return ('rel', tuple(leaf_lexemes(ir[1])))
+        if kind == 'not':
+            return ('not', self.predicate_key(ir[1]))
+        if kind in ('and', 'or'):
+            return (kind, tuple(self.predicate_key(child) for child in ir[1]))
+        if kind == 'set':
+            return ('set', ir[1].bounds)
+        return ir
+
+    def emit_predicate(self, ir, variable):
+        """由化简后的中间表示生成谓词节点 P。"""
+        disjuncts = ir[1] if ir[0] == 'or' else [ir]
+        terms = []
+        for disjunct in disjuncts:
+            if disjunct[0] == 'set':
+                # 区间列表的每个区间是一个析取项
+                terms.extend(self.conjunction(interval_relations(variable, lo, hi)) for lo, hi in disjunct[1])
+            else:
+                terms.append(self.emit_conjunction(disjunct, variable))
+        result = nonterminal('P', 'predicate', [terms[0]])
+        for term in terms[1:]:
+            result = nonterminal('P', 'predicate', [result, terminal('|'), term])
+        return result
+
+    def emit_conjunction(self, ir, variable):
+        """生成合取项 P'。"""
+        relations = []
+        factors = []
+        for conjunct in (ir[1] if ir[0] == 'and' else [ir]):
+            if conjunct[0] == 'set' and len(conjunct[1]) == 1:
+                relations.extend(interval_relations(variable, *conjunct[1].bounds[0]))
+            else:
+                factors.append(self.emit_factor(conjunct, variable))
+        factors = [nonterminal("P''", 'predicate', [relation]) for relation in relations] + factors
+        result = nonterminal("P'", 'predicate', [factors[0]])
+        for factor in factors[1:]:
+            result = nonterminal("P'", 'predicate', [result, terminal('&'), factor])
+        return result
+
+    def emit_factor(self, ir, variable):
+        """生成因子 P''：关系、否定的关系，或加括号的谓词。"""
+        kind = ir[0]
+        if kind == 'rel':
+            return nonterminal("P''", 'predicate', [ir[1]])
+        if kind == 'not':
+            return nonterminal("P''", 'predicate', [terminal('!'), ir[1][1]])
+        if kind == 'const':
+            return nonterminal("P''", 'predicate', [constant_relation(ir[1])])
+        return nonterminal("P''", 'predicate', [terminal('('), self.emit_predicate(ir, variable), terminal(')')])
+
+    def conjunction(self, relations):
+        result = nonterminal("P'", 'predicate', [nonterminal("P''", 'predicate', [relations[0]])])
+        for relation in relations[1:]:
+            result = nonterminal("P'", 'predicate', [
+                result, terminal('&'), nonterminal("P''", 'predicate', [relation])
+            ])
+        return result
+
+    # ---------------------------------------------------------------- 集合
+
+    def set_ir(self, node, bound):
+        """将集合表达式子树转换为中间表示。"""
+        if 'token' in node:
+            return ('ref', node)
+        children = node.get('children', [])
+        if len(children) == 1:
+            return self.set_ir(children[0], bound)
+        if len(children) == 4:
+            variable = children[1]['children'][0]['lexeme']
+            return ('builder', variable, self.predicate_ir(children[2]))
+        if children[0].get('token') == '(':
+            return self.set_ir(children[1], bound)
+        kind = 'union' if children[1]['lexeme'] == 'U' else 'inter'
+        return (kind, [self.set_ir(children[0], bound), self.set_ir(children[2], bound)])
+
+    def simplify_set(self, ir, bound):
+        """
+        化简集合的中间表示。
+
+        集合构造式的谓词被化简；并集（交集）中能表示为区间列表的运算对象合并为一个
+        集合构造式，约束变量相同的集合构造式合并为谓词的析取（合取）。
+        """
+        kind = ir[0]
+        if kind == 'builder':
+            variable = ir[1]
+            return ('builder', variable, self.simplify_predicate(ir[2], variable, bound | {variable}))
+        if kind == 'ref':
+            return ir
+
+        operands = []
+        for operand in (self.simplify_set(child, bound) for child in ir[1]):
+            operands.extend(operand[1] if operand[0] == kind else [operand])
+        predicate_kind = 'or' if kind == 'union' else 'and'
+
+        # 只有一个能表示为区间的已声明集合时保留其名字，不展开
+        mergeable = sum(1 for operand in operands if self.set_intervals(operand) is not None)
+        intervals = None
+        interval_variable = None
+        builders = {}  # 约束变量 -> 在 result 中的位置
+        result = []
+        keys = set()
+        for operand in operands:
+            operand_intervals = self.set_intervals(operand)
+            if operand_intervals is not None and (operand[0] == 'builder' or mergeable > 1):
+                if intervals is None:
+                    intervals = operand_intervals
+                    interval_variable = self.set_variable(operand)
+                elif kind == 'union':
+                    intervals = intervals.union(operand_intervals)
+                else:
+                    intervals = intervals.intersection(operand_intervals)
+                continue
+            if operand[0] == 'builder' and operand[1] in builders:
+                index = builders[operand[1]]
+                merged = self.combine(predicate_kind, [result[index][2], operand[2]])
+                result[index] = ('builder', operand[1], merged)
+                continue
+            key = self.set_key(operand)
+            if key in keys:
+                continue
+            keys.add(key)
+            if operand[0] == 'builder':
+                builders[operand[1]] = len(result)
+            result.append(operand)
+
+        if intervals is not None:
+            variable = interval_variable or 'x'
+            merged = self.interval_ir(intervals)
+            if variable in builders:
+                index = builders[variable]
+                result[index] = ('builder', variable, self.combine(predicate_kind, [result[index][2], merged]))
+            else:
+                result.insert(0, ('builder', variable, merged))
+        # 并集中的空集、交集中的全集可以去掉；并集中有全集、交集中有空集时结果就是它
+        absorbing, neutral = (TRUE, FALSE) if kind == 'union' else (FALSE, TRUE)
+        for operand in result:
+            if operand[0] == 'builder' and operand[2] == absorbing:
+                return operand
+        kept = [operand for operand in result if not (operand[0] == 'builder' and operand[2] == neutral)]
+        if not kept:
+            return result[0]
+        if len(kept) == 1:
+            return kept[0]
+        return (kind, kept)
+
+    def set_intervals(self, ir):
+        """集合的区间列表表示，无法表示时为 None。"""
+        if ir[0] == 'builder':
+            predicate = ir[2]
+            if predicate[0] == 'const':
+                return Intervals.everything() if predicate[1] else Intervals.nothing()
+            if predicate[0] == 'set':
+                return predicate[1]
+            return None
+        if ir[0] == 'ref':
+            value = self.evaluator.lookup_value(ir[1]['lexeme'])
+            return getattr(value, 'intervals', None)
+        return None
+
+    def set_variable(self, ir):
+        """合并为集合构造式时使用的约束变量名。"""
+        if ir[0] == 'builder':
+            return ir[1]
+        return getattr(self.evaluator.lookup_value(ir[1]['lexeme']), 'variable', None)
+
+    def set_key(self, ir):
+        if ir[0] == 'ref':
+            return ('ref', ir[1]['lexeme'])
+        if ir[0] == 'builder':
+            return ('builder', ir[1], self.predicate_key(ir[2]))
+        return (ir[0], tuple(self.set_key(child) for child in ir[1]))
+
+    def emit_set(self, ir):
+        """由化简后的中间表示生成集合表达式节点 E。"""
+        if ir[0] == 'union':
+            terms = [self.emit_set_term(child) for child in ir[1]]
+        else:
+            terms = [self.emit_set_term(ir)]
+        result = nonterminal('E', 'set', [terms[0]])
+        for term in terms[1:]:
+            result = nonterminal('E', 'set', [result, terminal('U'), term])
+        return result
+
+    def emit_set_term(self, ir):
+        if ir[0] == 'inter':
+            factors = [self.emit_set_factor(child) for child in ir[1]]
+        else:
+            factors = [self.emit_set_factor(ir)]
+        result = nonterminal("E'", 'set', [factors[0]])
+        for factor in factors[1:]:
+            result = nonterminal("E'", 'set', [result, terminal('I'), factor])
+        return result
+
+    def emit_set_factor(self, ir):
+        if ir[0] == 'ref':
+            return nonterminal("E''", 'set', [ir[1]])
+        if ir[0] == 'builder':
+            variable = ir[1]
+            return nonterminal("E''", 'set', [
+                terminal('{'),
+                nonterminal('Z', 'void', [terminal('id', variable), terminal(':')]),
+                self.emit_predicate(ir[2], variable),
+                terminal('}'),
+            ])
+        return nonterminal("E''", 'set', [terminal('('), self.emit_set(ir), terminal(')')])
@@ -0,0 +1,176 @@
+# sweep.py
+# 参数扫描：把程序中若干 int 声明标记为参数，程序只做一次词法、语法分析和类型检查，
+# 之后每次传入参数值的 NumPy 数组，整数表达式和关系按元素在整批参数上求值，
+# 一次向量化的遍历得到每个 show 语句在所有参数值下的结果数组。
+from backend import numpy_module
+from syntax_tree import leaf_lexemes, program_declarations, program_shows
+
+
+class SweepSet:
+    """扫描中声明的集合：集合表达式子树及其声明时的变量环境，成员测试按元素求值。"""
+
+    __slots__ = ("sweep", "node", "env")
+
+    def __init__(self, sweep, node, env):
+        self.sweep = sweep
+        self.node = node
+        self.env = env
+
+    def contains(self, element):
+        return self.sweep.membership(self.node, element, self.env, {})
+
+
+class ParameterSweep:
+    """
+    编译一次、可在整批参数值上反复求值的程序。
+
+    整数运算使用 NumPy int64，结果超出 int64 范围时会溢出（逐个运行的程序使用 Python 大整数）。
+    """
+
+    def __init__(self, tree, parameters):
+        """
+        参数：
+            tree (dict): 类型检查后的根节点 S。
+            parameters (iterable): 作为参数的 int 变量名。
+
+        异常：
+            Exception: 参数不是程序中声明的 int 变量，或程序使用了 simplify。
+        """
+        self.declarations = program_declarations(tree)
+        self.shows = program_shows(tree)
+        self.parameters = set(parameters)
+        if 'simplify' in leaf_lexemes(tree):
+            raise Exception("simplify is not supported in parameter sweeps.")
+        declared = {d_node['children'][2]['lexeme'] for d_node in self.declarations
+                    if d_node['children'][1]['children'][0]['lexeme'] == 'int'}
+        unknown = self.parameters - declared
+        if unknown:
+            raise Exception(f"Not an int declaration: {', '.join(sorted(unknown))}")
+
+    def run(self, **values):
+        """
+        在一批参数值上运行程序。
+
+        参数：
+            values: 参数名 -> 参数值数组（各数组按 NumPy 规则广播为同一形状）。
+
+        返回：
+            numpy.ndarray: show 语句的结果数组（整数或布尔）；有多条 show 语句时返回数组的列表。
+        """
+        np = numpy_module()
+        if np is None:
+            raise Exception("NumPy is required for parameter sweeps.")
+        missing = self.parameters - values.keys()
+        if missing:
+            raise Exception(f"Missing parameter values: {', '.join(sorted(missing))}")
+        arrays = {name: np.asarray(values[name], dtype=np.int64) for name in self.parameters}
+        shape = np.broadcast_shapes(*(array.shape for array in arrays.values())) if arrays else ()
+
+        env = {}
+        for d_node in self.declarations:
+            children = d_node['children']
+            name = children[2]['lexeme']
+            if children[1]['children'][0]['lexeme'] == 'int':
+                env[name] = arrays[name] if name in self.parameters else self.integer(children[4], env, {})
+            else:
+                env[name] = SweepSet(self, children[4], dict(env))
+
+        results = []
+        for c_node in self.shows:
+            expression = c_node['children'][1]['children'][0]
+            if expression.get('name') == 'P':
+                result = self.predicate(expression, env, {})
+            elif expression.get('type') == 'set':
+                raise Exception("Set-valued show results cannot be swept.")
+            else:
+                result = self.integer(expression, env, {})
+            results.append(np.broadcast_to(result, shape))
+        return results[0] if len(results) == 1 else results
+
+    def integer(self, node, env, bound):
+        """按元素求值整数表达式，返回整数或 int64 数组。"""
+        if 'token' in node:
+            lexeme = node['lexeme']
+            if node['token'] == 'num':
+                return int(lexeme)
+            if lexeme in bound:
+                return bound[lexeme]
+            if lexeme not in env:
+                raise Exception(f"Undefined identifier: {lexeme}")
+            return env[lexeme]
+
+        children = node.get('children', [])
+        if len(children) == 1:
+            return self.integer(children[0], env, bound)
+        if children[0].get('token') == '(':
+            return self.integer(children[1], env, bound)
+        left = self.integer(children[0], env, bound)
+        right = self.integer(children[2], env, bound)
+        operator = children[1]['lexeme']
+        if operator == '+':
+            return left + right
+        elif operator == '-':
+            return left - right
+        elif operator == '*':
+            return left * right
+        raise Exception(f"Unsupported operator in integer expression: {operator}")
+
+    def membership(self, node, element, env, bound):
+        """按元素求值 element @ node，返回布尔值或布尔数组。"""
+        np = numpy_module()
+        if 'token' in node:
+            return env[node['lexeme']].contains(element)
+
+        children = node.get('children', [])
+        if len(children) == 1:
+            return self.membership(children[0], element, env, bound)
+        if len(children) == 4:
+            # E'' -> { Z P }：把元素值代入约束变量
+            variable = children[1]['children'][0]['lexeme']
+            return self.predicate(children[2], env, {**bound, variable: element})
+        if children[0].get('token') == '(':
+            return self.membership(children[1], element, env, bound)
+        left = self.membership(children[0], element, env, bound)
+        right = self.membership(children[2], element, env, bound)
+        operator = children[1]['lexeme']
+        if operator == 'U':
+            return np.logical_or(left, right)
+        elif operator == 'I':
+            return np.logical_and(left, right)
+        raise Exception(f"Unsupported operator in set expression: {operator}")
+
+    def predicate(self, node, env, bound):
+        """按元素求值谓词（P、P'、P''、R），返回布尔值或布尔数组。"""
+        np = numpy_module()
+        name = node.get('name')
+        children = node.get('children', [])
+
+        if name == 'R':
+            operator = children[1]['lexeme']
+            left = self.integer(children[0], env, bound)
+            if operator == '@':
+                return self.membership(children[2], left, env, bound)
+            right = self.integer(children[2], env, bound)
+            if operator == '<':
+                return np.less(left, right)
+            elif operator == '>':
+                return np.greater(left, right)
+            elif operator == '=':
+                return np.equal(left, right)
+            raise Exception(f"Unsupported relation operator: {operator}")
+
+        if len(children) == 1:
+            return self.predicate(children[0], env, bound)
+        if len(children) == 2:
+            # P'' -> ! R
+            return np.logical_not(self.predicate(children[1], env, bound))
+        if children[0].get('token') == '(':
+            return self.predicate(children[1], env, bound)
+        left = self.predicate(children[0], env, bound)
+        right = self.predicate(children[2], env, bound)
+        operator = children[1]['lexeme']
+        if operator == '|':
+            return np.logical_or(left, right)
+        elif operator == '&':
+            return np.logical_and(left, right)
+        raise Exception(f"Unsupported operator in predicate expression: {operator}")
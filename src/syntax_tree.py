@@ -0,0 +1,82 @@
+# syntax_tree.py
+# 语法树的公共遍历函数：终结符序列、程序的声明和 show 语句、引用的标识符，
+# 以及按 show 语句的依赖找出需要评估的声明。评估器、代码生成、化简、调度和会话共用这些函数。
+
+
+def leaf_lexemes(node):
+    """按顺序返回子树中所有终结符的 lexeme（用显式栈遍历，声明链很长时也不会超出递归深度）。"""
+    lexemes = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if 'token' in current:
+            lexemes.append(current['lexeme'])
+        else:
+            stack.extend(reversed(current.get('children', [])))
+    return lexemes
+
+
+def program_declarations(tree):
+    """按顺序返回程序中的声明节点 D（沿右递归的 D' 链）。"""
+    declarations = []
+    node = tree['children'][0] if tree['children'][0].get('name') == "D'" else None
+    while node is not None:
+        children = node['children']
+        declarations.append(children[0])
+        node = children[1] if len(children) == 2 else None
+    return declarations
+
+
+def program_shows(tree):
+    """按顺序返回程序的全部计算节点 C（第一个 show 语句之后的 show 语句在 C' 链中）。"""
+    shows = []
+    for child in tree['children']:
+        if child.get('name') == 'C':
+            shows.append(child)
+        elif child.get('name') == "C'":
+            node = child
+            while node is not None:
+                shows.append(node['children'][0])
+                node = node['children'][2] if len(node['children']) == 3 else None
+    if not shows:
+        raise Exception("Program has no show statement.")
+    return shows
+
+
+def referenced_identifiers(node):
+    """返回子树中出现的全部标识符（保守地包括约束变量）。"""
+    if 'token' in node:
+        return {node['lexeme']} if node['token'] == 'id' else set()
+    names = set()
+    for child in node.get('children', []):
+        names |= referenced_identifiers(child)
+    return names
+
+
+def live_declarations(tree):
+    """
+    找出 show 语句传递地依赖的声明。
+
+    从计算节点 C 引用的标识符出发逆序扫描声明：一条声明被需要当且仅当它是某个被需要的
+    标识符在该位置之前的最后一次声明，它的表达式引用的标识符随之也被需要。
+
+    参数：
+        tree (dict): 类型检查后的根节点 S。
+
+    返回：
+        tuple: (被需要的声明节点列表, 不需要的声明节点列表)，都按源码顺序排列。
+    """
+    needed = set()
+    for c_node in program_shows(tree):
+        needed |= referenced_identifiers(c_node)
+    live = []
+    unused = []
+    for d_node in reversed(program_declarations(tree)):
+        name = d_node['children'][2]['lexeme']
+        if name in needed:
+            needed.discard(name)
+            needed |= referenced_identifiers(d_node['children'][4])
+            live.append(d_node)
+        else:
+            unused.append(d_node)
+    return live[::-1], unused[::-1]
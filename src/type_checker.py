@@ -12,10 +12,10 @@ import os
 # 是否开启DEBUG日志
 DEBUG = False
 
-def debug_log(msg: str):
-    """打印调试信息，可自行控制是否打印"""
+def debug_log(msg: str, *args):
+    """打印调试信息，可自行控制是否打印；args 只在开启 DEBUG 时才格式化进 msg"""
     if DEBUG:
-        print(f"[DEBUG] {msg}")
+        print(f"[DEBUG] {msg.format(*args) if args else msg}")
 
 # 类型字符串常量
 TYPE_ERROR = "type_error"
@@ -46,6 +46,7 @@ class TypeChecker:
             "S": self.handle_S,
             "D'": self.handle_D_prime,
             "C": self.handle_C,
+            "C'": self.handle_C_prime,
             "A": self.handle_A,
             "E": self.handle_E,
             "E'": self.handle_E_prime,
@@ -65,16 +66,16 @@ class TypeChecker:
     def load_ast(self):
         """加载 parser_out.json 并存储到 self.ast_root"""
         if not os.path.exists(self.parser_out_path):
-            debug_log(f"Error: {self.parser_out_path} not found.")
+            debug_log("Error: {} not found.", self.parser_out_path)
             self.type_error_flag = True
             return
 
         with open(self.parser_out_path, "r", encoding="utf-8") as f:
             try:
                 self.ast_root = json.load(f)
-                debug_log(f"AST loaded successfully from {self.parser_out_path}")
+                debug_log("AST loaded successfully from {}", self.parser_out_path)
             except json.JSONDecodeError:
-                debug_log(f"Error: Failed to parse JSON from {self.parser_out_path}.")
+                debug_log("Error: Failed to parse JSON from {}.", self.parser_out_path)
                 self.type_error_flag = True
 
     def write_typing_json(self):
@@ -109,7 +110,7 @@ class TypeChecker:
 
         with open(self.typing_out_path, "w", encoding="utf-8") as f:
             json.dump(convert_node(self.ast_root), f, indent=2, ensure_ascii=False)
-        debug_log(f"typing_out.json written successfully to {self.typing_out_path}")
+        debug_log("typing_out.json written successfully to {}", self.typing_out_path)
 
     def type_check(self):
         """执行类型检查"""
@@ -136,7 +137,7 @@ class TypeChecker:
             if token == "num":
                 # 规则15: E'' -> num => E''.type = integer
                 node["type"] = TYPE_INTEGER
-                debug_log(f"Token num '{lexeme}' => type = {TYPE_INTEGER}")
+                debug_log("Token num '{}' => type = {}", lexeme, TYPE_INTEGER)
                 return TYPE_INTEGER
 
             elif token == "id":
@@ -144,7 +145,7 @@ class TypeChecker:
                 if lexeme not in self.symbol_table:
                     # 使用未声明变量
                     node["type"] = TYPE_ERROR
-                    debug_log(f"Identifier '{lexeme}' not declared => type_error")
+                    debug_log("Identifier '{}' not declared => type_error", lexeme)
                     self.type_error_flag = True
                     return TYPE_ERROR
                 declared_type = self.symbol_table[lexeme]["type"]  # "int" 或 "set"
@@ -154,10 +155,10 @@ class TypeChecker:
                     node["type"] = TYPE_SET
                 else:
                     node["type"] = TYPE_ERROR
-                    debug_log(f"Identifier '{lexeme}' has unknown type '{declared_type}' => type_error")
+                    debug_log("Identifier '{}' has unknown type '{}' => type_error", lexeme, declared_type)
                     self.type_error_flag = True
                     return TYPE_ERROR
-                debug_log(f"Identifier '{lexeme}' => type = {node['type']}")
+                debug_log("Identifier '{}' => type = {}", lexeme, node['type'])
                 return node["type"]
 
             elif token in {
@@ -165,17 +166,17 @@ class TypeChecker:
                 "<", ">", "=", "@",
                 "&", "|", "!",
                 "(", ")", "{", "}", ":",
-                ".", "be", "let", "show", "int", "set"
+                ".", "be", "let", "show", "int", "set", "simplify"
             }:
                 # 运算符、关键字等，类型为 void
                 node["type"] = TYPE_VOID
-                debug_log(f"Token '{lexeme}' ({token}) => type = {TYPE_VOID}")
+                debug_log("Token '{}' ({}) => type = {}", lexeme, token, TYPE_VOID)
                 return TYPE_VOID
 
             else:
                 # 未知 token
                 node["type"] = TYPE_ERROR
-                debug_log(f"Unknown token '{token}' => type_error")
+                debug_log("Unknown token '{}' => type_error", token)
                 self.type_error_flag = True
                 return TYPE_ERROR
 
@@ -184,14 +185,14 @@ class TypeChecker:
             name = node.get("name", "")
             children = node.get("children", [])
 
-            debug_log(f"Processing Non-terminal: {name}, Children count: {len(children)}")
+            debug_log("Processing Non-terminal: {}, Children count: {}", name, len(children))
 
             # 打印每个子节点的名称或 token 以便调试
             for idx, child in enumerate(children):
                 if "name" in child:
-                    debug_log(f"  Child {idx}: name={child['name']}")
+                    debug_log("  Child {}: name={}", idx, child['name'])
                 elif "token" in child:
-                    debug_log(f"  Child {idx}: token={child['token']}")
+                    debug_log("  Child {}: token={}", idx, child['token'])
 
             # 根据非终结符名称调用相应的处理函数
             handler = self.handler_dict.get(name, None)
@@ -200,7 +201,7 @@ class TypeChecker:
             else:
                 # 未处理的非终结符
                 node["type"] = TYPE_ERROR
-                debug_log(f"No handler for non-terminal '{name}' => type_error")
+                debug_log("No handler for non-terminal '{}' => type_error", name)
                 self.type_error_flag = True
                 return TYPE_ERROR
 
@@ -211,13 +212,15 @@ class TypeChecker:
         """
         规则1: S -> D' C .
         规则2: S -> C .
+        规则35: S -> D' C . C'
+        规则36: S -> C . C'
         """
         debug_log("handle_S called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 3 and \
             children[0].get("name", "") == "D'" and \
@@ -239,7 +242,32 @@ class TypeChecker:
             # 规则2: S -> C .
             c_type = self.type_check_node(children[0])
             node["type"] = c_type
-            debug_log(f"S -> C . => type = {c_type}")
+            debug_log("S -> C . => type = {}", c_type)
+        elif len(children) == 4 and \
+                children[0].get("name", "") == "D'" and \
+                children[1].get("name", "") == "C" and \
+                children[3].get("name", "") == "C'":
+            # 规则35: S -> D' C . C'
+            d_prime_type = self.type_check_node(children[0])
+            c_type = self.type_check_node(children[1])
+            c_prime_type = self.type_check_node(children[3])
+            if TYPE_ERROR not in (d_prime_type, c_type, c_prime_type):
+                node["type"] = TYPE_PROGRAM
+                debug_log("S -> D' C . C' => type = program")
+            else:
+                node["type"] = TYPE_ERROR
+                debug_log("S -> D' C . C' type mismatch => type_error")
+                self.type_error_flag = True
+        elif len(children) == 3 and \
+                children[0].get("name", "") == "C" and \
+                children[2].get("name", "") == "C'":
+            # 规则36: S -> C . C'
+            c_type = self.type_check_node(children[0])
+            c_prime_type = self.type_check_node(children[2])
+            node["type"] = c_type if c_prime_type != TYPE_ERROR else TYPE_ERROR
+            debug_log("S -> C . C' => type = {}", node['type'])
+            if node["type"] == TYPE_ERROR:
+                self.type_error_flag = True
         else:
             node["type"] = TYPE_ERROR
             debug_log("S production does not match any rule => type_error")
@@ -255,9 +283,9 @@ class TypeChecker:
         debug_log("handle_D_prime called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 2:
             # 规则3: D'1 -> D D'2
@@ -294,9 +322,9 @@ class TypeChecker:
         debug_log("handle_D called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 6:
             # children[0]: 'let', children[1]: T, children[2]: id, children[3]: 'be', children[4]: E, children[5]: '.'
@@ -311,17 +339,17 @@ class TypeChecker:
                 var_name = id_node["lexeme"]
                 if t_type == TYPE_INTEGER:
                     self.symbol_table[var_name] = {"type": "int", "value": None}
-                    debug_log(f"Declared variable '{var_name}' of type 'int'")
+                    debug_log("Declared variable '{}' of type 'int'", var_name)
                 elif t_type == TYPE_SET:
                     self.symbol_table[var_name] = {"type": "set", "value": None}
-                    debug_log(f"Declared variable '{var_name}' of type 'set'")
+                    debug_log("Declared variable '{}' of type 'set'", var_name)
                 else:
                     node["type"] = TYPE_ERROR
-                    debug_log(f"T type '{t_type}' is invalid => type_error")
+                    debug_log("T type '{}' is invalid => type_error", t_type)
                     self.type_error_flag = True
                     return TYPE_ERROR
                 node["type"] = TYPE_DECLARATION
-                debug_log(f"Declared variable '{var_name}' of type '{t_type}'")
+                debug_log("Declared variable '{}' of type '{}'", var_name, t_type)
             else:
                 node["type"] = TYPE_ERROR
                 debug_log("E type_error in D production => type_error")
@@ -341,21 +369,21 @@ class TypeChecker:
         debug_log("handle_T called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 1 and "token" in children[0]:
             token = children[0]["token"]
             if token == "int":
                 node["type"] = TYPE_INTEGER
-                debug_log(f"T -> int => type = {TYPE_INTEGER}")
+                debug_log("T -> int => type = {}", TYPE_INTEGER)
             elif token == "set":
                 node["type"] = TYPE_SET
-                debug_log(f"T -> set => type = {TYPE_SET}")
+                debug_log("T -> set => type = {}", TYPE_SET)
             else:
                 node["type"] = TYPE_ERROR
-                debug_log(f"T -> unknown token '{token}' => type_error")
+                debug_log("T -> unknown token '{}' => type_error", token)
                 self.type_error_flag = True
         else:
             node["type"] = TYPE_ERROR
@@ -371,21 +399,50 @@ class TypeChecker:
         debug_log("handle_C called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 2 and children[0].get("token", "") == "show":
             a_node = children[1]
             a_type = self.type_check_node(a_node)
             node["type"] = a_type  # "calculation" 或 "type_error"
-            debug_log(f"C -> show A => A.type = {a_type}")
+            debug_log("C -> show A => A.type = {}", a_type)
         else:
             node["type"] = TYPE_ERROR
             debug_log("C production does not match rule31 => type_error")
             self.type_error_flag = True
         return node["type"]
 
+    # 处理 C_prime 非终结符
+    def handle_C_prime(self, node: dict, children: list) -> str:
+        """
+        规则37: C'1 -> C . C'2
+        规则38: C' -> C .
+        """
+        debug_log("handle_C_prime called with children:")
+        for idx, child in enumerate(children):
+            if "name" in child:
+                debug_log("  Child {}: name={}", idx, child['name'])
+            elif "token" in child:
+                debug_log("  Child {}: token={}", idx, child['token'])
+
+        if len(children) in (2, 3) and children[0].get("name", "") == "C":
+            c_type = self.type_check_node(children[0])
+            rest_type = self.type_check_node(children[2]) if len(children) == 3 else TYPE_CALCULATION
+            if c_type != TYPE_ERROR and rest_type != TYPE_ERROR:
+                node["type"] = TYPE_CALCULATION
+                debug_log("C' -> C . [C'] => type = {}", TYPE_CALCULATION)
+            else:
+                node["type"] = TYPE_ERROR
+                debug_log("C' -> C . [C'] type mismatch => type_error")
+                self.type_error_flag = True
+        else:
+            node["type"] = TYPE_ERROR
+            debug_log("C' production does not match rule37/38 => type_error")
+            self.type_error_flag = True
+        return node["type"]
+
     # 处理 A 非终结符
     def handle_A(self, node: dict, children: list) -> str:
         """
@@ -395,16 +452,16 @@ class TypeChecker:
         debug_log("handle_A called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 1:
             child = children[0]
             child_type = self.type_check_node(child)
             if child_type != TYPE_ERROR:
                 node["type"] = TYPE_CALCULATION
-                debug_log(f"A -> {child['name'] if 'name' in child else child['token']} => type = {TYPE_CALCULATION}")
+                debug_log("A -> {} => type = {}", child['name'] if 'name' in child else child['token'], TYPE_CALCULATION)
             else:
                 node["type"] = TYPE_ERROR
                 debug_log("A -> child type_error => type_error")
@@ -426,15 +483,15 @@ class TypeChecker:
         debug_log("handle_E called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 1:
             # 规则8: E -> E'
             child_type = self.type_check_node(children[0])
             node["type"] = child_type
-            debug_log(f"E -> E' => type = {child_type}")
+            debug_log("E -> E' => type = {}", child_type)
             return node["type"]
         elif len(children) == 3:
             # 规则9,10,11: E -> E2 op E'
@@ -450,7 +507,7 @@ class TypeChecker:
                 # 规则9: E1 -> E2 U E'
                 if e2_type == TYPE_SET and e_prime_type == TYPE_SET:
                     node["type"] = TYPE_SET
-                    debug_log(f"E -> E2 U E' => type = {TYPE_SET}")
+                    debug_log("E -> E2 U E' => type = {}", TYPE_SET)
                 else:
                     node["type"] = TYPE_ERROR
                     debug_log("E -> E2 U E' type mismatch => type_error")
@@ -459,7 +516,7 @@ class TypeChecker:
                 # 规则10: E1 -> E2 + E'
                 if e2_type == TYPE_INTEGER and e_prime_type == TYPE_INTEGER:
                     node["type"] = TYPE_INTEGER
-                    debug_log(f"E -> E2 + E' => type = {TYPE_INTEGER}")
+                    debug_log("E -> E2 + E' => type = {}", TYPE_INTEGER)
                 else:
                     node["type"] = TYPE_ERROR
                     debug_log("E -> E2 + E' type mismatch => type_error")
@@ -468,7 +525,7 @@ class TypeChecker:
                 # 规则11: E1 -> E2 - E'
                 if e2_type == TYPE_INTEGER and e_prime_type == TYPE_INTEGER:
                     node["type"] = TYPE_INTEGER
-                    debug_log(f"E -> E2 - E' => type = {TYPE_INTEGER}")
+                    debug_log("E -> E2 - E' => type = {}", TYPE_INTEGER)
                 else:
                     node["type"] = TYPE_ERROR
                     debug_log("E -> E2 - E' type mismatch => type_error")
@@ -476,7 +533,7 @@ class TypeChecker:
             else:
                 # 未知操作符
                 node["type"] = TYPE_ERROR
-                debug_log(f"E -> unknown operator '{op}' => type_error")
+                debug_log("E -> unknown operator '{}' => type_error", op)
                 self.type_error_flag = True
         else:
             # 不匹配的产生式
@@ -495,15 +552,15 @@ class TypeChecker:
         debug_log("handle_E_prime called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 1:
             # 规则12: E' -> E''
             child_type = self.type_check_node(children[0])
             node["type"] = child_type
-            debug_log(f"E' -> E'' => type = {child_type}")
+            debug_log("E' -> E'' => type = {}", child_type)
             return node["type"]
         elif len(children) == 3:
             # 规则13,14: E'1 -> E'2 op E''
@@ -536,7 +593,7 @@ class TypeChecker:
             else:
                 # 未知操作符
                 node["type"] = TYPE_ERROR
-                debug_log(f"E'1 -> unknown operator '{op}' => type_error")
+                debug_log("E'1 -> unknown operator '{}' => type_error", op)
                 self.type_error_flag = True
         else:
             # 不匹配的产生式
@@ -552,28 +609,37 @@ class TypeChecker:
         规则16: E'' -> id
         规则17: E'' -> ( E )
         规则18: E'' -> { Z P }
+        规则34: E'' -> simplify E''
         """
         debug_log("handle_E_double_prime called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 1:
             # 规则15: E'' -> num
             # 规则16: E'' -> id
             child_type = self.type_check_node(children[0])
             node["type"] = child_type
-            debug_log(f"E'' -> {children[0].get('name', children[0].get('token'))} => type = {child_type}")
+            debug_log("E'' -> {} => type = {}", children[0].get('name', children[0].get('token')), child_type)
             return node["type"]
+        elif len(children) == 2:
+            # 规则34: E'' -> simplify E''，类型与被化简的表达式相同
+            if children[0].get("token", "") == "simplify":
+                self.type_check_node(children[0])
+                child_type = self.type_check_node(children[1])
+                node["type"] = child_type
+                debug_log("E'' -> simplify E'' => type = {}", child_type)
+                return node["type"]
         elif len(children) == 3:
             # 规则17: E'' -> ( E )
             if children[0].get("token", "") == "(" and children[2].get("token", "") == ")":
                 e_node = children[1]
                 e_type = self.type_check_node(e_node)
                 node["type"] = e_type
-                debug_log(f"E'' -> ( E ) => type = {e_type}")
+                debug_log("E'' -> ( E ) => type = {}", e_type)
                 return node["type"]
             else:
                 # 不是规则17
@@ -611,9 +677,9 @@ class TypeChecker:
         debug_log("handle_Z called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 2 and \
             children[0].get("token", "") == "id" and \
@@ -623,7 +689,7 @@ class TypeChecker:
             # 规则19: add_type(id.entry, integer)
             self.symbol_table[var_name] = {"type": "int", "value": None}
             node["type"] = TYPE_VOID
-            debug_log(f"Z -> {var_name} : => added to symbol_table as int")
+            debug_log("Z -> {} : => added to symbol_table as int", var_name)
         else:
             node["type"] = TYPE_ERROR
             debug_log("Z production does not match rule19 => type_error")
@@ -639,14 +705,14 @@ class TypeChecker:
         debug_log("handle_P called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 1:
             child_type = self.type_check_node(children[0])
             node["type"] = child_type
-            debug_log(f"P -> P' => type = {child_type}")
+            debug_log("P -> P' => type = {}", child_type)
         elif len(children) == 3:
             # P1 -> P2 | P'
             p2_node = children[0]
@@ -668,7 +734,7 @@ class TypeChecker:
             else:
                 # 未知操作符
                 node["type"] = TYPE_ERROR
-                debug_log(f"P1 -> unknown operator '{op}' => type_error")
+                debug_log("P1 -> unknown operator '{}' => type_error", op)
                 self.type_error_flag = True
         else:
             node["type"] = TYPE_ERROR
@@ -685,15 +751,15 @@ class TypeChecker:
         debug_log("handle_P_prime called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 1:
             # 规则23: P' -> P''
             child_type = self.type_check_node(children[0])
             node["type"] = child_type
-            debug_log(f"P' -> P'' => type = {child_type}")
+            debug_log("P' -> P'' => type = {}", child_type)
             return node["type"]
         elif len(children) == 3:
             # 规则22: P'1 -> P'2 & P''
@@ -716,7 +782,7 @@ class TypeChecker:
             else:
                 # 未知操作符
                 node["type"] = TYPE_ERROR
-                debug_log(f"P'1 -> unknown operator '{op}' => type_error")
+                debug_log("P'1 -> unknown operator '{}' => type_error", op)
                 self.type_error_flag = True
         else:
             # 不匹配的产生式
@@ -735,9 +801,9 @@ class TypeChecker:
         debug_log("handle_P_double_prime called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 1:
             # 规则24: P'' -> R
@@ -755,7 +821,7 @@ class TypeChecker:
                 p_node = children[1]
                 p_type = self.type_check_node(p_node)
                 node["type"] = p_type
-                debug_log(f"P'' -> ( P ) => type = {p_type}")
+                debug_log("P'' -> ( P ) => type = {}", p_type)
             else:
                 node["type"] = TYPE_ERROR
                 debug_log("P'' -> ( P ) does not match rule25 => type_error")
@@ -789,9 +855,9 @@ class TypeChecker:
         debug_log("handle_P1 called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 3:
             # P1 -> P2 | P'
@@ -814,7 +880,7 @@ class TypeChecker:
             else:
                 # 未知操作符
                 node["type"] = TYPE_ERROR
-                debug_log(f"P1 -> unknown operator '{op}' => type_error")
+                debug_log("P1 -> unknown operator '{}' => type_error", op)
                 self.type_error_flag = True
         else:
             # 不匹配的产生式
@@ -832,14 +898,14 @@ class TypeChecker:
         debug_log("handle_P2 called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 1:
             child_type = self.type_check_node(children[0])
             node["type"] = child_type
-            debug_log(f"P2 -> P => type = {child_type}")
+            debug_log("P2 -> P => type = {}", child_type)
         else:
             node["type"] = TYPE_ERROR
             debug_log("P2 production does not match any rule => type_error")
@@ -857,9 +923,9 @@ class TypeChecker:
         debug_log("handle_R called with children:")
         for idx, child in enumerate(children):
             if "name" in child:
-                debug_log(f"  Child {idx}: name={child['name']}")
+                debug_log("  Child {}: name={}", idx, child['name'])
             elif "token" in child:
-                debug_log(f"  Child {idx}: token={child['token']}")
+                debug_log("  Child {}: token={}", idx, child['token'])
 
         if len(children) == 3:
             e1_node = children[0]
@@ -874,10 +940,10 @@ class TypeChecker:
                 # 规则27,28,29
                 if e1_type == TYPE_INTEGER and e2_type == TYPE_INTEGER:
                     node["type"] = TYPE_RELATION
-                    debug_log(f"R -> E1 {op} E2 => type = {TYPE_RELATION}")
+                    debug_log("R -> E1 {} E2 => type = {}", op, TYPE_RELATION)
                 else:
                     node["type"] = TYPE_ERROR
-                    debug_log(f"R -> E1 {op} E2 type mismatch => type_error")
+                    debug_log("R -> E1 {} E2 type mismatch => type_error", op)
                     self.type_error_flag = True
             elif op == "@":
                 # 规则30
@@ -891,7 +957,7 @@ class TypeChecker:
             else:
                 # 未知操作符
                 node["type"] = TYPE_ERROR
-                debug_log(f"R -> unknown operator '{op}' => type_error")
+                debug_log("R -> unknown operator '{}' => type_error", op)
                 self.type_error_flag = True
         else:
             # 不匹配的产生式
@@ -926,7 +992,7 @@ def main():
                 print("Semantic Analysis Complete!")
     except Exception as e:
         # 捕获任何未预见的异常
-        debug_log(f"Unexpected error: {e}")
+        debug_log("Unexpected error: {}", e)
         type_checker.type_error_flag = True
         print("Type Error! (3)")
     finally:
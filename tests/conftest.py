@@ -0,0 +1,55 @@
+# conftest.py
+# 测试共用的夹具：把 src 加入模块搜索路径，提供执行过示例声明的 Session，
+# 以及在临时目录中运行 main.py 的函数。
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TABLE_FILE = os.path.join(ROOT_DIR, "lib", "SLR Parsing Table.csv")
+MAIN_FILE = os.path.join(ROOT_DIR, "src", "main.py")
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+
+import pytest  # noqa: E402
+
+from parser import load_parsing_table  # noqa: E402
+from session import Session  # noqa: E402
+
+PROGRAM = """
+let int k be 3.
+let set small be { x : x > 0 & x < 10 }.
+let set big be { x : x > k }.
+"""
+
+
+@pytest.fixture(scope="session")
+def tables():
+    return load_parsing_table(TABLE_FILE)
+
+
+@pytest.fixture
+def session(tables):
+    session = Session(*tables)
+    session.execute(PROGRAM)
+    return session
+
+
+@pytest.fixture
+def run_main(tmp_path):
+    """
+    返回在临时目录中运行 main.py 的函数 run(source, *options)，
+    结果为 (去掉 [DEBUG] 行的标准输出, evaluation_out.json 的内容)。
+    """
+    shutil.copy(TABLE_FILE, tmp_path)
+
+    def run(source, *options):
+        (tmp_path / "program.txt").write_text(source)
+        completed = subprocess.run([sys.executable, MAIN_FILE, "program.txt", *options], cwd=tmp_path,
+                                   capture_output=True, text=True, check=True)
+        output = "\n".join(line for line in completed.stdout.splitlines() if not line.startswith("[DEBUG]"))
+        with open(tmp_path / "evaluation_out.json") as f:
+            return output, json.load(f)
+
+    return run
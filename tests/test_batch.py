@@ -0,0 +1,35 @@
+# test_batch.py
+# Session 的批量成员测试：编译一次的集合查询、越界的值和格式错误的表达式。
+import pytest
+
+from session import SessionError
+
+
+def test_contains_batch(session):
+    assert [bool(b) for b in session.contains_batch([0, 1, 9, 10], "small")] == [False, True, True, False]
+    assert [bool(b) for b in session.contains_batch([3, 4], "big U small")] == [True, True]
+
+
+def test_batch_matches_scalar_contains(session):
+    values = list(range(-20, 21))
+    expression = "{ x : x * x > 10 } I (small U { y : y < 0 - 5 })"
+    set_value = session.compile_set_expression(expression)
+    assert [bool(b) for b in session.contains_batch(values, expression)] == \
+        [set_value.contains(n) for n in values]
+
+
+def test_values_outside_int64(session):
+    assert [bool(b) for b in session.contains_batch([2 ** 70, 5, -(2 ** 70)], "big")] == [True, True, False]
+
+
+@pytest.mark.parametrize("expression", ["small U", "small $", "", "( small"])
+def test_malformed_expression(session, tmp_path, monkeypatch, expression):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SessionError):
+        session.contains_batch([1], expression)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_rejects_non_set_expression(session):
+    with pytest.raises(SessionError):
+        session.compile_set_expression("k + 1")
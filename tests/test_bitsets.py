@@ -0,0 +1,61 @@
+# test_bitsets.py
+# 论域上的位集合：物化、按位并交、popcount 和元素列表与符号集合的成员测试一致。
+import pytest
+
+from backend import numpy_module
+from bitsets import BitSet
+from sets import BuilderSet
+
+LOW, HIGH = -70, 70
+
+
+def builder(predicate, text):
+    return BuilderSet("x", predicate, text)
+
+
+SQUARES = builder(lambda n: n * n < 400, "x * x < 400")
+ODD_CUBES = builder(lambda n: n * n * n % 3 == 1, "x * x * x % 3 = 1")
+
+
+@pytest.fixture(params=[False, True], ids=["int", "words"])
+def words(request):
+    if request.param and numpy_module() is None:
+        pytest.skip("NumPy is required for word-array bitsets")
+    return request.param
+
+
+def expected(set_value):
+    return [n for n in range(LOW, HIGH + 1) if set_value.contains(n)]
+
+
+def test_cardinality_and_elements(words):
+    for set_value in (SQUARES, ODD_CUBES):
+        bitset = BitSet.from_set(set_value, LOW, HIGH, words=words)
+        assert bitset.elements() == expected(set_value)
+        assert bitset.cardinality() == len(expected(set_value))
+        assert list(bitset.members(LOW - 5, HIGH + 5)) == [n for n in range(LOW - 5, HIGH + 6)
+                                                           if set_value.contains(n)]
+
+
+def test_union_and_intersection_match_symbolic_sets(words):
+    left = BitSet.from_set(SQUARES, LOW, HIGH, words=words)
+    right = BitSet.from_set(ODD_CUBES, LOW, HIGH, words=words)
+    union, intersection = left.union(right), left.intersection(right)
+    assert isinstance(union, BitSet) and isinstance(intersection, BitSet)
+    assert union.elements() == expected(SQUARES.union(ODD_CUBES))
+    assert intersection.elements() == expected(SQUARES.intersection(ODD_CUBES))
+    assert str(union) == str(SQUARES.union(ODD_CUBES))
+
+
+def test_mixed_representations():
+    if numpy_module() is None:
+        pytest.skip("NumPy is required for word-array bitsets")
+    packed = BitSet.from_set(SQUARES, LOW, HIGH)
+    array = BitSet.from_set(ODD_CUBES, LOW, HIGH, words=True)
+    assert packed.intersection(array).elements() == expected(SQUARES.intersection(ODD_CUBES))
+
+
+def test_contains_outside_domain():
+    bitset = BitSet.from_set(SQUARES, -5, 5)
+    assert bitset.contains(19) and not bitset.contains(20)
+    assert bitset.cardinality() == 11
@@ -0,0 +1,63 @@
+# test_codegen.py
+# 整个程序的代码生成（--codegen）：编译后的程序函数与语法树遍历给出相同的结果。
+import copy
+import os
+import sys
+
+import pytest
+
+from codegen import compile_program
+from conftest import ROOT_DIR
+from evaluator import Evaluator
+from ropes import format_result
+from type_checker import TypeChecker, TYPE_ERROR
+
+sys.path.insert(0, os.path.join(ROOT_DIR, "bench"))
+
+from program_generator import generate_program  # noqa: E402
+
+PROGRAMS = [
+    "let int x be 1. let set y be { a : a > 1 }. show x @ y.",
+    "let set s be { x : x > 3 }. let set t be { y : y @ s & y < 10 }. show 5 @ t.",
+    "show (1 > 2 | 3 > 2) & 4 > 3.",
+    "let set s be { x : x > 3 & x < 10 } I { x : x > 5 }. show 6 @ s & ! 2 > 3.",
+    "let int a be 2 + 3 * 4. show a.",
+    "let set s be { x : x > 3 }. show s U { y : y < 0 }.",
+    "let int n be 7. let set s be { x : x = 7 | x < 0 }. show n @ s | n > 100.",
+    "let int k be 4. let set s be { x : x @ { y : y * y > x + k } }. show 3 @ s. show s. show k * k - 1.",
+    "let int a be 1. let int a be a + 1. let set s be { x : x > a }. let int a be 10. show 2 @ s. show a.",
+]
+
+
+def typed_tree(session, source):
+    tree = session.parse(source)
+    assert TypeChecker(None, None).type_check_node(tree) != TYPE_ERROR
+    return tree
+
+
+def walked(tree):
+    evaluator = Evaluator()
+    evaluator.parse_tree = tree
+    evaluator.evaluate_node(tree)
+    return str(tree["value"])
+
+
+def compiled(tree, demand=False):
+    return str(format_result(compile_program(tree, demand)()))
+
+
+def generated_programs():
+    return [generate_program(8, 2, 2, 1, 3, seed, shows) for seed in range(6) for shows in (1, 3)]
+
+
+@pytest.mark.parametrize("source", PROGRAMS + generated_programs())
+def test_codegen_matches_tree_walker(session, source):
+    tree = typed_tree(session, source)
+    expected = walked(copy.deepcopy(tree))
+    assert compiled(tree) == expected
+    assert compiled(tree, demand=True) == expected
+
+
+def test_compiled_program_is_cached(session):
+    tree = typed_tree(session, PROGRAMS[-1])
+    assert compile_program(tree) is compile_program(typed_tree(session, PROGRAMS[-1]))
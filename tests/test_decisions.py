@@ -0,0 +1,53 @@
+# test_decisions.py
+# 判定过程：区间集合与论域上的位集合的是否为空、包含、相等和元素个数。
+import pytest
+
+from session import Session, SessionError
+
+BITSET_PROGRAM = """
+let set a be { x : x * x < 50 }.
+let set b be { x : x * x * x > 0 - 10 }.
+let set c be { x : x * x > 30 }.
+"""
+
+
+@pytest.fixture
+def bitsets(tables):
+    session = Session(*tables)
+    session.evaluator.set_domain(-20, 20)
+    session.execute(BITSET_PROGRAM)
+    return session
+
+
+def test_interval_decisions(session):
+    assert session.cardinality("small") == 9
+    assert session.cardinality("big") == float("inf")
+    assert session.cardinality("big", 0, 10) == 7
+    assert session.is_subset("small I big", "big")
+    assert not session.is_subset("big", "small")
+    assert session.is_empty("small I { x : x > 20 }")
+    assert not session.is_empty("big", 0, 100)
+    assert session.equal("small", "{ y : y > 0 & y < 10 }")
+
+
+def test_bitset_cardinality_uses_domain(bitsets):
+    # a 和 a I b 在论域两侧都没有元素，无界的判定就是论域上的判定
+    assert bitsets.cardinality("a") == 15
+    assert bitsets.cardinality("a I b") == len([n for n in range(-7, 8) if n ** 3 > -10])
+    assert bitsets.cardinality("a I b", 0, 5) == 6
+    assert not bitsets.is_empty("a I b")
+    assert bitsets.is_subset("a I b", "a")
+    assert bitsets.equal("a I b", "b I a")
+
+
+def test_bitset_with_explicit_bounds(bitsets):
+    # c 在论域以外仍有元素：给出界时越过论域的部分逐个枚举
+    assert bitsets.cardinality("c", -30, 30) == len([n for n in range(-30, 31) if n * n > 30])
+    assert bitsets.is_subset("a", "a U c", -30, 30)
+
+
+def test_unbounded_decision_is_rejected(bitsets):
+    with pytest.raises(SessionError, match="give both bounds"):
+        bitsets.cardinality("c")
+    with pytest.raises(SessionError):
+        bitsets.is_empty("a U c")
@@ -0,0 +1,39 @@
+# test_definition.py
+# 有限范围展开：由区间端点或成员关系半径推断范围，无界的一侧从有限端点向外延伸，
+# 推断出的范围之外的元素与范围边缘的成员关系一致。
+import pytest
+
+from evaluator import DEFAULT_DEFINITION_WINDOW
+
+
+def test_definition_window(session):
+    # 有界集合按推断出的范围展开，不受默认范围限制
+    assert session.definition("{ x : x > 150 & x < 160 }") == set(range(151, 160))
+    # 无界的一侧从有限端点向外延伸默认范围的宽度 200，端点在默认范围以外时也不会截断
+    assert session.definition("big") == set(range(4, 205))
+    assert session.definition("{ x : x > 150 }") == set(range(151, 352))
+    assert session.definition("{ x : x < 0 - 150 }") == set(range(-351, -150))
+    assert session.definition("{ x : x * x > 10 }") == {n for n in range(-206, 207) if n * n > 10}
+    assert session.definition("big", 0, 5) == {4, 5}
+
+
+@pytest.mark.parametrize("expression", [
+    "{ x : x * x < 1000 }",
+    "{ x : x * x * x > 500 & x * x < 4000 }",
+    "{ x : x = 1000 | x = 0 - 1000 }",
+    "small I { y : y * y < 30 }",
+])
+def test_bounded_sets_are_complete(session, expression):
+    # 有界集合的推断范围包含它的全部元素
+    set_value = session.compile_set_expression(expression)
+    low, high = session.evaluator.infer_window(set_value)
+    assert not set_value.contains(low - 1) and not set_value.contains(high + 1)
+    members = session.definition(expression)
+    assert members == {n for n in range(-5000, 5001) if set_value.contains(n)}
+
+
+def test_default_window(session):
+    # 全体整数没有有限端点，使用默认范围；空集不需要展开
+    assert session.evaluator.infer_window(session.compile_set_expression("{ x : x = x }")) == \
+        DEFAULT_DEFINITION_WINDOW
+    assert session.definition("{ x : x > 5 & x < 3 }") == set()
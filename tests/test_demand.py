@@ -0,0 +1,33 @@
+# test_demand.py
+# 按需评估：只评估 show 语句传递地依赖的声明，跳过的声明在评估结束时报告，结果不变。
+from syntax_tree import live_declarations
+
+PROGRAM = """
+let int a be 1.
+let set u be { x : x > a }.
+let int b be 2.
+let set v be { x : x < b }.
+let int b be b * 5.
+let set w be v U { x : x = 100 }.
+show 1 @ w.
+show b.
+"""
+
+
+def names(declarations):
+    return [d_node["children"][2]["lexeme"] for d_node in declarations]
+
+
+def test_live_declarations(session):
+    live, unused = live_declarations(session.parse(PROGRAM))
+    # v 引用的是第一个 b；w 依赖 v；show b 引用的是重新声明的 b
+    assert names(live) == ["b", "v", "b", "w"]
+    assert names(unused) == ["a", "u"]
+
+
+def test_demand_skips_unused_declarations(run_main):
+    output, evaluation = run_main(PROGRAM, "--demand")
+    assert "Skipped 2 unused declaration(s): a, u" in output
+    full_output, full_evaluation = run_main(PROGRAM)
+    assert "Skipped" not in full_output
+    assert evaluation["value"] == full_evaluation["value"] == "[true, 10]"
@@ -0,0 +1,38 @@
+# test_enumeration.py
+# 惰性枚举：members 按升序产生 [low, high] 内的元素，limit 和 offset 与切片一致，
+# 无界集合在很大的范围上也只产生需要的元素。
+import itertools
+
+from syntax_tree import leaf_lexemes, program_declarations, program_shows
+
+
+def brute_force(session, expression, low, high):
+    set_value = session.compile_set_expression(expression)
+    return [n for n in range(low, high + 1) if set_value.contains(n)]
+
+
+def test_members_in_order(session):
+    assert list(session.members("small I big", 0, 100)) == [4, 5, 6, 7, 8, 9]
+    for expression in ("small U { y : y * y > 200 }", "{ x : x * x * x < 0 - 30 | x = 7 } I big"):
+        assert list(session.members(expression, -50, 50)) == brute_force(session, expression, -50, 50)
+
+
+def test_limit_and_offset(session):
+    expression = "{ x : x * x > 20 } U small"
+    everything = brute_force(session, expression, -40, 40)
+    for offset, limit in [(0, 5), (3, 4), (10, None), (len(everything), 3)]:
+        stop = None if limit is None else offset + limit
+        assert list(session.members(expression, -40, 40, limit, offset)) == everything[offset:stop]
+
+
+def test_unbounded_range_is_lazy(session):
+    members = session.members("big", 0, 10 ** 18)
+    assert list(itertools.islice(members, 3)) == [4, 5, 6]
+    # 没有区间列表的集合按段扫描，同样只扫描到取够元素为止
+    assert list(session.members("{ x : x * x > 100 }", 0, 10 ** 12, 2, 5)) == [16, 17]
+
+
+def test_tree_helpers(session):
+    tree = session.parse("let int a be 1. let set b be { x : x > a }. show 2 @ b. show a + 1.")
+    assert [d['children'][2]['lexeme'] for d in program_declarations(tree)] == ['a', 'b']
+    assert [' '.join(leaf_lexemes(c)) for c in program_shows(tree)] == ['show 2 @ b', 'show a + 1']
@@ -0,0 +1,66 @@
+# test_intervals.py
+# 区间列表：随机的线性谓词规范化得到的区间与逐个整数计算谓词的结果一致，
+# 区间的并、交、补与 Python 集合在有限窗口上的运算一致。
+import random
+
+import pytest
+
+from intervals import Intervals, NEG_INF, POS_INF
+
+WINDOW = range(-60, 61)
+FAR = [-10 ** 12, -10 ** 6, 10 ** 6, 10 ** 12]
+
+
+def random_relation(rng):
+    """x 的线性关系，例如 3 * x - 7 < x + 2，同时给出对应的 Python 表达式。"""
+    coefficient, offset, bound = rng.randint(1, 4), rng.randint(0, 30), rng.randint(0, 40)
+    operator = rng.choice("<>=")
+    left = f"{coefficient} * x - {offset}" if rng.random() < 0.5 else f"x * {coefficient} + {offset}"
+    text = f"{left} {operator} {bound}"
+    python = f"{left} {'==' if operator == '=' else operator} {bound}"
+    if rng.random() < 0.2:
+        text, python = f"! {text}", f"not ({python})"
+    return text, f"({python})"
+
+
+def random_predicate(rng, size):
+    text, python = random_relation(rng)
+    for _ in range(size - 1):
+        relation, python_relation = random_relation(rng)
+        connective = rng.choice("&|")
+        if rng.random() < 0.3:
+            text, python = f"({text})", f"({python})"
+        text += f" {connective} {relation}"
+        python += f" {'and' if connective == '&' else 'or'} {python_relation}"
+    return text, python
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_normalization_matches_brute_force(session, seed):
+    rng = random.Random(seed)
+    text, python = random_predicate(rng, rng.randint(1, 5))
+    set_value = session.compile_set_expression(f"{{ x : {text} }}")
+    assert set_value.intervals is not None, text
+    for n in list(WINDOW) + FAR:
+        assert set_value.intervals.contains(n) == eval(python, {"x": n}), (text, n)
+
+
+def test_interval_algebra():
+    rng = random.Random(7)
+    for _ in range(50):
+        parts = [Intervals.from_ranges((lo, lo + rng.randint(0, 8)) for lo in rng.sample(range(-40, 40), 4))
+                 for _ in range(2)]
+        left, right = (set(n for n in WINDOW if part.contains(n)) for part in parts)
+        union, intersection = parts[0].union(parts[1]), parts[0].intersection(parts[1])
+        assert {n for n in WINDOW if union.contains(n)} == left | right
+        assert {n for n in WINDOW if intersection.contains(n)} == left & right
+        assert {n for n in WINDOW if parts[0].complement().contains(n)} == set(WINDOW) - left
+        assert union.count() == len(left | right)
+        assert parts[0].intersection(parts[1]).issubset(parts[0])
+
+
+def test_unbounded_ends():
+    assert Intervals.at_least(5).union(Intervals.at_most(-5)).complement() == Intervals.from_ranges([(-4, 4)])
+    assert Intervals.at_least(5).count() == POS_INF
+    assert Intervals.everything().complement().is_empty()
+    assert Intervals.from_ranges([(NEG_INF, 3), (1, 9), (11, 12)]).bounds == ((NEG_INF, 9), (11, 12))
@@ -0,0 +1,35 @@
+# test_main.py
+# 命令行参数和 REPL：快速启动路径的参数对象与 argparse 的默认值一致，多行输入按行去掉注释。
+from main import FastArguments, parse_arguments, run_repl, statement_complete
+
+
+def test_fast_arguments_match_argparse_defaults():
+    fast = parse_arguments(["--fast", "in.txt"])
+    assert isinstance(fast, FastArguments)
+    parsed = parse_arguments(["in.txt", "--fast", "--demand"])
+    assert vars(fast) == {**vars(parsed), "demand": False}
+    assert vars(parse_arguments(["in.txt"])) == {**vars(fast), "fast": False}
+
+
+
+def test_statement_complete_strips_comments_per_line():
+    assert statement_complete("show 1.  # done\n")
+    assert statement_complete("# a comment\nlet int a be 1. # first\nlet int b be a.\n")
+    assert statement_complete("let set s be { x : x > 1 } # open\n.\n# trailing comment\n")
+    assert not statement_complete("let int a be 1.\n# comment.\nlet int b be\n")
+    assert not statement_complete("# only a comment.\n")
+    assert not statement_complete("")
+
+
+def test_repl_runs_multi_line_input(monkeypatch, capsys):
+    lines = iter([
+        "# declarations",
+        "let int a be 2. # the first",
+        "let int b be",
+        "a * 3. # the second",
+        "show b + 1.",
+        ":quit",
+    ])
+    monkeypatch.setattr("builtins.input", lambda prompt: next(lines))
+    run_repl(fast=True)
+    assert "Result: 7" in capsys.readouterr().out
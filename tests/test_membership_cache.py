@@ -0,0 +1,54 @@
+# test_membership_cache.py
+# 成员测试缓存：命中时不再调用谓词，超出上限时按 LRU 淘汰，重新声明的集合的旧结果失效。
+from sets import MembershipCache, MemoizedSet
+
+
+class CountingPredicate:
+    def __init__(self, predicate):
+        self.predicate = predicate
+        self.calls = 0
+
+    def __call__(self, n):
+        self.calls += 1
+        return self.predicate(n)
+
+
+def test_hits_do_not_recompute():
+    cache = MembershipCache()
+    predicate = CountingPredicate(lambda n: n % 3 == 0)
+    assert [cache.lookup(("s", 1), n, predicate) for n in (3, 4, 3, 3, 4)] == [True, False, True, True, False]
+    assert predicate.calls == 2
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (3, 2, 2)
+    assert stats["sets"]["s"]["hit_rate"] == 3 / 5
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = MembershipCache(max_entries=2)
+    predicate = CountingPredicate(lambda n: n > 0)
+    for n in (1, 2, 1, 3):  # 3 进入时淘汰最久未使用的 2
+        cache.lookup(("s", 1), n, predicate)
+    assert cache.evictions == 1 and predicate.calls == 3
+    cache.lookup(("s", 1), 1, predicate)
+    assert predicate.calls == 3
+    cache.lookup(("s", 1), 2, predicate)
+    assert predicate.calls == 4
+
+
+def test_redeclaration_invalidates(session):
+    session.execute("let set cube be { x : x * x * x > 30 }.")
+    value = session.evaluator.symbol_table["cube"]["value"]
+    assert isinstance(value, MemoizedSet)
+    assert session.execute("show 4 @ cube.") == "true"
+    assert session.execute("show 4 @ cube.") == "true"
+    cache = session.evaluator.membership_cache
+    assert cache.stats()["sets"]["cube"]["hits"] >= 1
+
+    session.execute("let set cube be { x : x * x * x > 100 }.")
+    assert cache.invalidations == 1
+    assert session.execute("show 4 @ cube.") == "false"
+
+
+def test_interval_sets_are_not_wrapped(session):
+    # 区间集合的成员测试本身就是二分查找，不经过缓存
+    assert not isinstance(session.evaluator.symbol_table["small"]["value"], MemoizedSet)
@@ -0,0 +1,59 @@
+# test_parallel.py
+# 并行物化：进程池中按依赖顺序计算的位图与顺序评估得到的位图相同；--jobs 必须与 --domain 一起使用。
+import pytest
+
+from evaluator import Evaluator
+from main import parse_arguments
+from scheduler import precompute_declarations
+from syntax_tree import program_declarations
+from type_checker import TypeChecker, TYPE_ERROR
+
+DOMAIN = (-64, 64)
+PROGRAM = """
+let int k be 3.
+let set a be { x : x * x < 50 }.
+let set b be { x : x > k | x * x * x < 0 - 20 }.
+let int k be k * 4.
+let set c be a I b U { x : x = k }.
+let set d be { x : x @ c & ! x @ { y : y * y = 4 } }.
+let set unused be { x : x * x > 9 }.
+show 5 @ d.
+"""
+
+
+def sequential_bits(tree, words):
+    evaluator = Evaluator()
+    evaluator.set_domain(*DOMAIN, words=words)
+    bits = {}
+    for d_node in program_declarations(tree):
+        evaluator.evaluate_node(d_node)
+        value = evaluator.symbol_table[d_node["children"][2]["lexeme"]]["value"]
+        if d_node["children"][1]["children"][0]["lexeme"] == "set":
+            bits[id(d_node)] = value.bits
+    return bits
+
+
+@pytest.mark.parametrize("words", [False, True], ids=["int", "words"])
+def test_precompute_matches_sequential(session, words):
+    tree = session.parse(PROGRAM)
+    assert TypeChecker(None, None).type_check_node(tree) != TYPE_ERROR
+    parallel = precompute_declarations(tree, DOMAIN, words, workers=2)
+    sequential = sequential_bits(tree, words)
+    assert parallel.keys() == sequential.keys()
+    for key, bits in sequential.items():
+        if words:
+            assert bits.tolist() == parallel[key].tolist()
+        else:
+            assert bits == parallel[key]
+
+
+def test_jobs_give_the_same_result(run_main):
+    output, evaluation = run_main(PROGRAM, "--domain=-64:64", "--jobs", "2")
+    _, sequential = run_main(PROGRAM, "--domain=-64:64")
+    assert evaluation == sequential and evaluation["value"] == "true"
+
+
+def test_jobs_requires_domain():
+    with pytest.raises(SystemExit):
+        parse_arguments(["in.txt", "--jobs", "2"])
+    assert parse_arguments(["in.txt", "--jobs", "2", "--domain=-5:5"]).domain == (-5, 5)
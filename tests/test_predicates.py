@@ -0,0 +1,47 @@
+# test_predicates.py
+# show 谓词：由语法树编译为闭包，& 比 | 结合得紧，括号和 ! 按语法树求值，
+# 编译结果按谓词和变量的当前值缓存，重新声明变量后不会用到旧值。
+import itertools
+
+import pytest
+
+CASES = [
+    ("1 < 2 | 3 < 2 & 1 > 5", (1 < 2) or ((3 < 2) and (1 > 5))),
+    ("(1 < 2 | 3 < 2) & 1 > 5", ((1 < 2) or (3 < 2)) and (1 > 5)),
+    ("! 1 < 2 | 2 = 2", (not (1 < 2)) or (2 == 2)),
+    ("! 2 @ small & 12 @ big", (not (0 < 2 < 10)) and (12 > 3)),
+    ("k * 2 + 1 = 7 & 3 - k * 2 < 0", (3 * 2 + 1 == 7) and (3 - 3 * 2 < 0)),
+    ("5 @ { x : x @ small & ! x = k }", True),
+    ("3 @ { x : x @ small & ! x = k }", False),
+]
+
+
+@pytest.mark.parametrize("predicate, expected", CASES)
+def test_precedence_follows_the_tree(session, predicate, expected):
+    assert session.execute(f"show {predicate}.") == ("true" if expected else "false")
+
+
+def test_all_connective_shapes(session):
+    # 三个关系、两个连接符的所有组合与 Python 的 and/or 优先级一致
+    relations = {"a": ("1 < 2", True), "b": ("2 < 1", False), "c": ("k = 3", True), "d": ("k > 3", False)}
+    for (x, y, z), (first, second) in itertools.product(
+            itertools.product(relations, repeat=3), itertools.product("&|", repeat=2)):
+        text = f"{relations[x][0]} {first} {relations[y][0]} {second} {relations[z][0]}"
+        python = f"{relations[x][1]} {'and' if first == '&' else 'or'} {relations[y][1]} " \
+                 f"{'and' if second == '&' else 'or'} {relations[z][1]}"
+        assert session.execute(f"show {text}.") == str(eval(python)).lower(), text
+
+
+def test_redeclaration_is_not_served_from_the_cache(session):
+    assert session.execute("show 5 @ big.") == "true"
+    session.execute("let int k be 10.")
+    session.execute("let set big be { x : x > k }.")
+    assert session.execute("show 5 @ big.") == "false"
+    assert session.execute("show k = 10.") == "true"
+
+
+def test_compiled_predicate_is_reused(session):
+    session.execute("show 2 @ small | 20 @ big.")
+    compiled = dict(session.evaluator.predicate_cache)
+    assert session.execute("show 2 @ small | 20 @ big.") == "true"
+    assert session.evaluator.predicate_cache == compiled and len(compiled) == 1
@@ -0,0 +1,50 @@
+# test_program_generator.py
+# 合成程序生成器：生成的程序都能通过整个流水线，几种形状合起来用到全部产生式 1–38。
+import os
+import sys
+
+import pytest
+
+from conftest import ROOT_DIR
+from parser import PRODUCTIONS
+
+sys.path.insert(0, os.path.join(ROOT_DIR, "bench"))
+
+from bench_pipeline import run_pipeline  # noqa: E402
+from program_generator import generate_program  # noqa: E402
+
+RULES = {(lhs, tuple(rhs)): number for number, (lhs, rhs) in PRODUCTIONS.items()}
+
+# (declarations, shows)：有无声明、一条或多条 show 语句的四种程序
+SHAPES = [(12, 1), (12, 4), (0, 1), (0, 4)]
+
+
+def used_rules(node, rules):
+    """收集语法树中用到的产生式编号。"""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        children = current.get("children")
+        if children is None:
+            continue
+        symbols = tuple(child.get("name", child.get("token")) for child in children)
+        rules.add(RULES[(current["name"], symbols)])
+        stack.extend(children)
+    return rules
+
+
+@pytest.mark.parametrize("declarations, shows", SHAPES)
+def test_generated_programs_run(tables, declarations, shows):
+    for seed in range(3):
+        source = generate_program(declarations, 2, 2, 1, 3, seed, shows, 0.3)
+        timings, token_count, result = run_pipeline(source, *tables)
+        assert token_count > 0 and result
+
+
+def test_every_production_is_used(session):
+    rules = set()
+    for declarations, shows in SHAPES:
+        for seed in range(10):
+            source = generate_program(declarations, 2, 2, 1, 3, seed, shows, 0.3)
+            used_rules(session.parse(source), rules)
+    assert rules == set(PRODUCTIONS) - {0}
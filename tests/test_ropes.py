@@ -0,0 +1,42 @@
+# test_ropes.py
+# Rope：惰性拼接的显示文本渲染结果与直接拼接字符串一致，很深的链也不会超过递归深度。
+import sys
+
+from ropes import Rope, format_result
+
+
+class Shown:
+    """提供 rope() 的值（与集合值一样）。"""
+
+    def __init__(self, text):
+        self.text = text
+
+    def rope(self):
+        return Rope("{ ", self.text, " }")
+
+
+def test_render_matches_concatenation():
+    inner = Rope("x", " > ", 3)
+    rope = Rope("(", inner, " & ", Rope("x", " < ", 10), ")", " | ", Shown("y"))
+    assert str(rope) == "(x > 3 & x < 10) | { y }"
+    assert repr(Rope("a", 1)) == "Rope('a1')"
+
+
+def test_lowercase_is_lazy_and_scoped():
+    rope = Rope("Result: ", Rope("TRUE", " & ", Shown("ABC")).lower())
+    assert rope.render() == "Result: true & { abc }"
+
+
+def test_deep_chain_renders_iteratively():
+    rope = Rope("x")
+    depth = sys.getrecursionlimit() * 5
+    for index in range(depth):
+        rope = Rope(rope, " | ", index)
+    text = rope.render()
+    assert text.startswith("x | 0 | 1") and text.endswith(f" | {depth - 1}")
+
+
+def test_format_result():
+    assert format_result(7) == 7
+    assert str(format_result([1, "true", Shown("z")])) == "[1, true, { z }]"
+    assert str(format_result([])) == "[]"
@@ -0,0 +1,44 @@
+# test_scaling.py
+# 复杂度回归检查：在 CI 能承受的规模上（每种形状 4 个规模，逐次翻倍，共几秒）拟合各阶段的增长指数，
+# 任何阶段超过声明的上界（加容差）即失败，用于发现二次方回退。计时报告见 bench/bench_scaling.py。
+import os
+import sys
+
+import pytest
+
+from conftest import ROOT_DIR
+
+sys.path.insert(0, os.path.join(ROOT_DIR, "bench"))
+
+from bench_pipeline import STAGES  # noqa: E402
+from bench_scaling import WORKLOADS, growth_exponent, measure_workload  # noqa: E402
+
+# 各阶段声明的复杂度上界（相对于词法单元个数的增长指数）
+STAGE_BOUNDS = {
+    "lexer": 1.0,
+    "parser": 1.0,
+    "type_checker": 1.0,
+    "evaluator": 1.0,
+}
+# 线性阶段在这些规模上拟合出的指数不超过 1.15 左右；解析栈每次归约都复制一遍这样的
+# 二次方回退在这些规模上拟合出约 1.4（规模更大时趋近 2）
+TOLERANCE = 0.25
+STEPS = 4
+REPEAT = 3
+SCALE = 2  # 起始规模为基准的 1/SCALE
+
+
+@pytest.mark.parametrize("name, start, make_program", WORKLOADS, ids=[workload[0] for workload in WORKLOADS])
+def test_stages_scale_linearly(tables, name, start, make_program):
+    exponents = {}
+    # 计时偶尔受干扰，超出上界的工作负载再测一次，各阶段取两次中较小的指数
+    for _ in range(2):
+        token_counts, timings = measure_workload(make_program, max(start // SCALE, 50), STEPS, REPEAT, *tables)
+        for stage in STAGES:
+            exponent = growth_exponent(token_counts, timings[stage])
+            exponents[stage] = min(exponents.get(stage, exponent), exponent)
+        if all(exponents[stage] <= STAGE_BOUNDS[stage] + TOLERANCE for stage in STAGES):
+            break
+    for stage in STAGES:
+        assert exponents[stage] <= STAGE_BOUNDS[stage] + TOLERANCE, \
+            f"{name}/{stage} grows as n^{exponents[stage]:.2f}"
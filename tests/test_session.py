@@ -0,0 +1,42 @@
+# test_session.py
+# 多条 show 语句：一次运行按顺序得到每条 show 语句的结果，只有一条时结果不变；
+# 会话的 run、execute 和命令行输出都使用同一结果格式。
+import pytest
+
+from ropes import format_result
+from session import SessionError
+
+PROGRAM = """
+let int a be 2.
+let set s be { x : x > a }.
+show a * 3.
+show 5 @ s.
+show s.
+"""
+
+
+def test_run_returns_every_show_in_order(session):
+    results = session.run(PROGRAM)
+    assert [str(result) for result in results] == ["6", "true", "{ x: x > 2 }"]
+    assert str(format_result(results)) == "[6, true, { x: x > 2 }]"
+
+
+def test_single_show_is_not_a_list(session):
+    assert session.execute("show k.") == 3
+    assert session.run("let int a be 2. show a + 1.") == 3
+
+
+def test_execute_evaluates_each_show_against_the_declarations_so_far(session):
+    results = session.execute("let int m be 4. show m. show m @ big. show m @ small.")
+    assert results == [4, "true", "true"]
+
+
+def test_set_expression_must_be_a_single_show(session):
+    with pytest.raises(SessionError):
+        session.compile_set_expression("small . show big")
+
+
+def test_main_writes_the_list_once(run_main):
+    output, evaluation = run_main(PROGRAM)
+    assert evaluation["value"] == "[6, true, { x: x > 2 }]"
+    assert "Result:" not in output
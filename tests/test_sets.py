@@ -0,0 +1,31 @@
+# test_sets.py
+# 符号集合：并、交和嵌套的集合构造式的成员测试与直接计算谓词一致，显示文本由集合结构生成。
+import pytest
+
+CASES = [
+    ("small U big", lambda n: 0 < n < 10 or n > 3),
+    ("small I big", lambda n: 0 < n < 10 and n > 3),
+    ("(small U { y : y < 0 - 4 }) I { z : z * z > 8 }", lambda n: (0 < n < 10 or n < -4) and n * n > 8),
+    ("{ x : x @ { y : y * y > x } }", lambda n: n * n > n),
+    ("{ x : x @ small | x @ { y : y = x * 2 } }", lambda n: 0 < n < 10 or n == n * 2),
+    ("{ x : x * k > 20 & ! x @ big } U small I big", lambda n: (n * 3 > 20 and not n > 3) or (0 < n < 10 and n > 3)),
+]
+
+
+@pytest.mark.parametrize("expression, predicate", CASES)
+def test_membership_matches_predicate(session, expression, predicate):
+    set_value = session.compile_set_expression(expression)
+    assert [set_value.contains(n) for n in range(-30, 31)] == [predicate(n) for n in range(-30, 31)]
+
+
+def test_show_displays_the_set_structure(session):
+    assert str(session.execute("show small U big.")) == "{ x: (x > 0 & x < 10) } U { x: x > 3 }"
+    assert str(session.execute("show { x : x > k & x < 2 * k }.")) == "{ x: (x > 3 & x < 6) }"
+
+
+def test_declared_sets_are_values(session):
+    # 重新声明 small 不影响已经用旧的 small 构造的集合
+    session.execute("let set both be small I big.")
+    session.execute("let set small be { x : x < 0 }.")
+    assert session.execute("show 5 @ both.") == "true"
+    assert session.execute("show 5 @ small.") == "false"
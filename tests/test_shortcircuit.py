@@ -0,0 +1,52 @@
+# test_shortcircuit.py
+# 短路求值：无论操作数按什么顺序排列、运行中怎样重新排序，结果都与按源码顺序求值相同；
+# 代价高的操作数排在后面，能决定结果的操作数被提前。
+import itertools
+import random
+
+from shortcircuit import REORDER_INTERVAL, ShortCircuitGroup
+
+
+class Operand:
+    def __init__(self, predicate):
+        self.predicate = predicate
+        self.calls = 0
+
+    def __call__(self, env):
+        self.calls += 1
+        return self.predicate(env["x"])
+
+
+def test_results_match_in_order_evaluation():
+    rng = random.Random(3)
+    predicates = [lambda n, m=m: n % m == 0 for m in (2, 3, 5, 7)]
+    for conjunction in (True, False):
+        for chosen in itertools.permutations(predicates, 3):
+            group = ShortCircuitGroup([Operand(p) for p in chosen], [rng.randint(1, 9) for _ in chosen], conjunction)
+            combine = all if conjunction else any
+            for n in range(REORDER_INTERVAL * 4):
+                assert group({"x": n}) == combine(p(n) for p in chosen)
+
+
+def test_cheap_operands_run_first():
+    expensive, cheap = Operand(lambda n: True), Operand(lambda n: False)
+    group = ShortCircuitGroup([expensive, cheap], [50, 1], conjunction=True)
+    assert not group({"x": 0})
+    assert (expensive.calls, cheap.calls) == (0, 1)
+
+
+def test_reordering_follows_selectivity():
+    # 两个代价相同的操作数：第一个几乎总为真，第二个几乎总为假；& 中第二个更能决定结果
+    rarely_false, mostly_false = Operand(lambda n: n % 50 != 0), Operand(lambda n: n % 50 == 0)
+    group = ShortCircuitGroup([rarely_false, mostly_false], [3, 3], conjunction=True)
+    for n in range(REORDER_INTERVAL * 8):
+        group({"x": n})
+    assert group.order == [1, 0]
+
+
+def test_program_predicates_keep_their_meaning(session):
+    # 成员测试（代价高）写在前面，关系写在后面，结果与源码顺序一致
+    expression = "{ x : x @ { y : y * y > 40 & y * y < 900 } & x > 0 | x @ small & ! x = 5 }"
+    set_value = session.compile_set_expression(expression)
+    expected = [(40 < n * n < 900 and n > 0) or (0 < n < 10 and n != 5) for n in range(-40, 41)]
+    assert [set_value.contains(n) for n in range(-40, 41)] == expected
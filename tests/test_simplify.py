@@ -0,0 +1,41 @@
+# test_simplify.py
+# simplify：化简后的集合与原集合的元素相同，化简结果写回语法树，显示的是化简后的表达式。
+import pytest
+
+WINDOW = range(-50, 51)
+
+EXPRESSIONS = [
+    "{ x : x > 3 & x > 5 }",
+    "small U big",
+    "{ x : x > 3 | ! x > 3 }",
+    "{ x : x < 2 & x > 8 }",
+    "small I { y : y * y > 10 }",
+    "{ x : x @ small & x @ big }",
+    "{ x : (x > k | x < 0 - k) & ! x = 7 | x = 0 }",
+    "{ x : x * 2 + 1 > k * 3 & x - 4 < 2 * k }",
+]
+
+
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_simplify_preserves_members(session, expression):
+    original = session.compile_set_expression(expression)
+    simplified = session.compile_set_expression(f"simplify ({expression})")
+    assert [simplified.contains(n) for n in WINDOW] == [original.contains(n) for n in WINDOW]
+
+
+@pytest.mark.parametrize("expression, text", [
+    ("simplify { x : x > 3 & x > 5 }", "{ x: x > 5 }"),
+    ("simplify (small U big)", "{ x: x > 0 }"),
+    ("simplify { x : x > 3 | ! x > 3 }", "{ x: 0 = 0 }"),
+    ("simplify { x : x < 2 & x > 8 }", "{ x: 0 = 1 }"),
+    ("simplify { x : x @ small & x @ big }", "{ x: (x > 3 & x < 10) }"),
+])
+def test_simplified_display(session, expression, text):
+    assert str(session.execute(f"show {expression}.")) == text
+
+
+def test_simplified_declaration_is_used_later(session):
+    session.execute("let set s be simplify (small I big).")
+    assert session.execute("show 9 @ s.") == "true"
+    assert session.execute("show 10 @ s.") == "false"
+    assert str(session.execute("show s.")) == "{ x: (x > 3 & x < 10) }"
@@ -0,0 +1,31 @@
+# test_vectorized.py
+# 向量化谓词：没有区间列表的集合构造式在整个数组上求值的布尔掩码与逐个调用 contains 一致。
+import pytest
+
+from backend import numpy_module
+
+np = numpy_module()
+pytestmark = pytest.mark.skipif(np is None, reason="NumPy is not installed")
+
+EXPRESSIONS = [
+    "{ x : x * x > 30 }",
+    "{ x : x * x * x - x * 4 < 10 & ! x = 2 }",
+    "{ x : (x * x > k * 5 | x @ small) & x * 2 < 30 }",
+    "{ x : x @ big & x * x < 200 | x * x = 49 }",
+    "{ x : x @ { y : y * y > 10 } }",
+    "{ x : x * x > 16 } U small",
+    "{ x : x * x > 16 } I { y : y * y < 400 }",
+]
+
+
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_mask_matches_scalar_contains(session, expression):
+    set_value = session.compile_set_expression(expression)
+    values = np.arange(-500, 501, dtype=np.int64)
+    assert set_value.mask(values).tolist() == [set_value.contains(int(n)) for n in values]
+
+
+def test_builder_without_intervals_is_vectorized(session):
+    set_value = session.compile_set_expression("{ x : x * x > 30 & x * x < 900 }")
+    assert set_value.intervals is None and set_value.vector_predicate is not None
+    assert list(set_value.members(-40, 40)) == [n for n in range(-40, 41) if 30 < n * n < 900]